@@ -1,5 +1,6 @@
 import streamlit as st
 
+from olimpiadas.aquecimento import iniciar_aquecimento, painel_aquecimento
 
 st.set_page_config(
     page_title="Hello",
@@ -9,6 +10,8 @@ st.set_page_config(
 st.write("# Dados dos Jogos Olímpicos👋")
 
 st.sidebar.success("Escolha uma das visualizações na barra ao lado.")
+iniciar_aquecimento()
+painel_aquecimento()
 
 st.markdown(
     """
@@ -0,0 +1 @@
+# Camada de dados compartilhada entre as páginas do app
@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from olimpiadas import dados
+
+# Aquecimento do processo: em threads de fundo, carrega os dados, monta as estruturas
+# compartilhadas e deixa nos caches as figuras e tabelas das seleções padrão de todas as páginas.
+# Começa no boot (python -m olimpiadas.servidor) ou na primeira página aberta; quem pede um
+# resultado que o aquecimento está calculando espera por ele (veja cache.CacheLRU.obter).
+# OLIMPIADAS_AQUECER=0 desliga; OLIMPIADAS_AQUECER_THREADS muda o número de threads das páginas.
+ATIVO = os.environ.get('OLIMPIADAS_AQUECER', '1') not in ('', '0')
+THREADS = int(os.environ.get('OLIMPIADAS_AQUECER_THREADS', 4))
+
+_lock = threading.Lock()
+_threads = {}
+_estado = {}
+
+
+# Etapa atual, tarefas feitas e total, erros e duração do aquecimento do CSV
+def progresso(caminho=None):
+    caminho = caminho or dados.CSV_PATH
+    with _lock:
+        estado = _estado.get(caminho)
+        return None if estado is None else dict(estado, erros=list(estado['erros']))
+
+
+def _atualizar(caminho, **mudancas):
+    with _lock:
+        _estado[caminho].update(mudancas)
+
+
+# Filtros padrão das páginas: temporada "Ambas", gênero "Ambos", esporte "Todos" e nada escolhido
+def _padrao(filtros):
+    return (filtros.get('season', 'Ambas') == 'Ambas' and filtros.get('gender', 'Ambos') == 'Ambos'
+            and filtros.get('yaxis', 'Altura') == 'Altura' and filtros.get('facet_page', 0) == 0
+            and filtros.get('medals', 'Por atleta') == 'Por atleta')
+
+
+def _aquecer(caminho):
+    inicio = time.perf_counter()
+    try:
+        if not dados.BLOCOS:
+            dados.carregar_dados(caminho)
+        _atualizar(caminho, etapa='estruturas')
+        # os módulos das páginas (e o plotly) também são importados aqui, fora da primeira sessão
+        from olimpiadas import faixas, lote, medias
+        from olimpiadas.cubo import cubo_eventos, cubo_medalhas
+        from olimpiadas.dimensoes import dimensoes
+        from olimpiadas.historico import historico_medalhas
+        cubo_medalhas()
+        cubo_eventos()
+        dimensoes()
+        faixas.faixas_etarias()
+        historico_medalhas()
+        medias.somas_por_esporte()
+
+        tarefas = [t for t in lote.tarefas([], []) if _padrao(t[3])]
+        _atualizar(caminho, etapa='páginas', total=len(tarefas))
+        with ThreadPoolExecutor(THREADS, thread_name_prefix='aquecimento') as executor:
+            for (pagina, _, nome, filtros), _, erro in executor.map(lote.renderizar, tarefas):
+                with _lock:
+                    _estado[caminho]['feitas'] += 1
+                    if erro is not None:
+                        _estado[caminho]['erros'].append(f'{pagina}/{nome}: {erro}')
+        _atualizar(caminho, etapa='pronto')
+    except Exception as erro:
+        with _lock:
+            _estado[caminho]['erros'].append(repr(erro))
+        _atualizar(caminho, etapa='falhou')
+    _atualizar(caminho, segundos=time.perf_counter() - inicio)
+
+
+# Começa o aquecimento do CSV em uma thread de fundo: monta os caches das seleções padrão de todas
+# as páginas, uma vez por processo (chamadas seguintes não fazem nada; as páginas chamam no início)
+def iniciar_aquecimento(caminho=None):
+    caminho = caminho or dados.CSV_PATH
+    if not ATIVO:
+        return
+    with _lock:
+        if caminho in _threads:
+            return
+        _estado[caminho] = {'etapa': 'dados', 'feitas': 0, 'total': 0, 'erros': [], 'segundos': None}
+        _threads[caminho] = threading.Thread(target=_aquecer, args=(caminho,), name='aquecimento', daemon=True)
+    _threads[caminho].start()
+
+
+# Espera o fim do aquecimento (testes, benchmarks); devolve o progresso final
+def esperar_aquecimento(caminho=None, timeout=None):
+    caminho = caminho or dados.CSV_PATH
+    thread = _threads.get(caminho)
+    if thread is not None:
+        thread.join(timeout)
+    return progresso(caminho)
+
+
+# Progresso do aquecimento na barra lateral enquanto ele não termina
+def painel_aquecimento(caminho=None):
+    estado = progresso(caminho)
+    if estado is None or estado['etapa'] == 'pronto':
+        return
+    if estado['etapa'] == 'falhou':
+        st.sidebar.warning(f'Aquecimento dos caches falhou: {estado["erros"][-1]}')
+        return
+    feitas = estado['feitas'] / estado['total'] if estado['total'] else 0.0
+    st.sidebar.progress(feitas, text=f'Preparando os dados ({estado["etapa"]}, {estado["feitas"]}/{estado["total"]})')
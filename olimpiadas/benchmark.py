@@ -0,0 +1,270 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+import plotly.io
+
+from olimpiadas import dados, faixas, medias
+from olimpiadas.cache import resultados
+from olimpiadas.codificacao import codificar
+from olimpiadas.cubo import cubo_eventos, cubo_medalhas
+from olimpiadas.figuras import figuras
+from olimpiadas.historico import historico_medalhas
+from olimpiadas.paginas import historico, medalhas, participacao, perfil
+from olimpiadas.participacao import participacoes_por_pais
+from olimpiadas.proporcoes import proporcoes_medalhas
+
+# Benchmark das etapas de cada página sem servidor do Streamlit:
+#   python -m olimpiadas.benchmark --escalas 1 10 100
+#   python -m olimpiadas.benchmark --salvar-baseline
+# Mede tempo (mínimo entre repetições, com os caches de resultados e figuras vazios),
+# pico de memória (tracemalloc, em uma rodada separada) e tamanho do JSON das figuras.
+
+BASELINE = 'benchmark_baseline.json'
+PASTA_ESCALAS = os.path.join(dados.CACHE_DIR, 'benchmark')
+
+# Abaixo desse tempo as diferenças são ruído e não contam como regressão
+RUIDO_SEGUNDOS = 0.001
+
+# Etapas de cada página: (página, etapa, função que recebe a combinação de filtros).
+# As etapas build_* devolvem figuras; das outras só se mede o tempo e a memória.
+ETAPAS = [
+    ('medalhas', 'filter_data', lambda c: medalhas.filter_data(c['season'], c['gender'], c['sport'])),
+    ('medalhas', 'get_medal_count', lambda c: medalhas.get_medal_count(c['season'], c['gender'], c['sport'])),
+    ('medalhas', 'get_detailed_medal_info', lambda c: medalhas.get_detailed_medal_info(c['season'], c['gender'], c['sport'])),
+    ('medalhas', 'get_medal_count_all', lambda c: medalhas.get_medal_count_all(c['season'], c['gender'], c['sport'])),
+    ('medalhas', 'build_medal_map', lambda c: medalhas.build_medal_map(c['season'], c['gender'], c['sport'])),
+    ('medalhas', 'build_medal_map_eventos', lambda c: medalhas.build_medal_map(c['season'], c['gender'], c['sport'], 'Por evento')),
+    ('medalhas', 'proporcoes_medalhas', lambda c: proporcoes_medalhas(c['season'], c['gender'], c['sport'])),
+    ('medalhas', 'build_marimekko', lambda c: medalhas.build_marimekko(c['season'], c['gender'], c['sport'], c['pais'])),
+    ('participacao', 'create_part_df', lambda c: participacao.create_part_df(c['season'], c['gender'], c['sport'])),
+    ('participacao', 'participacoes_por_pais', lambda c: participacoes_por_pais(c['season'], c['gender'], c['sport'])),
+    ('participacao', 'filter_part_df', lambda c: participacao.filter_part_df(c['season'], c['gender'], c['sport'], c['country'])),
+    ('participacao', 'build_participation_map', lambda c: participacao.build_participation_map(c['season'], c['gender'], c['sport'])),
+    ('participacao', 'build_participation_bar', lambda c: participacao.build_participation_bar(c['season'], c['gender'], c['sport'], c['country'])),
+    ('historico', 'load_data_grouped', lambda c: historico.load_data_grouped()),
+    ('historico', 'filter_data', lambda c: historico.filter_data(c['season'], c['gender'], c['sports'], c['country'])),
+    ('historico', 'line_chart_prep', lambda c: historico.line_chart_prep(c['season'], c['gender'], c['sports'], c['country'])),
+    ('historico', 'bar_chart_prep', lambda c: historico.bar_chart_prep(c['season'], c['gender'], c['sports'], c['country'])),
+    ('historico', 'build_line_chart', lambda c: historico.build_line_chart(c['season'], c['gender'], c['sports'], c['country'])),
+    ('historico', 'build_bar_chart', lambda c: historico.build_bar_chart(c['season'], c['gender'], c['sports'], c['country'])),
+    ('perfil', 'filter_data', lambda c: perfil.filter_data(c['season'], c['gender'], c['sport'])),
+    ('perfil', 'medalhas_por_faixa', lambda c: faixas.medalhas_por_faixa(c['season'], c['gender'], c['sport'])),
+    ('perfil', 'mean_by_sport', lambda c: perfil.mean_by_sport(c['sports'], c['country'], c['year'], c['yaxis'])),
+    ('perfil', 'sport_quartiles', lambda c: perfil.sport_quartiles(c['sports'], c['country'], c['year'], c['yaxis'])),
+    ('perfil', 'build_histogram', lambda c: perfil.build_histogram(c['season'], c['gender'], c['sport'])),
+    ('perfil', 'build_small_multiples', lambda c: perfil.build_small_multiples(c['sports'], c['country'], c['year'], c['yaxis'])),
+    ('perfil', 'build_boxplot', lambda c: perfil.build_boxplot(c['sports'], c['country'], c['year'], c['yaxis'])),
+]
+
+
+# CSV com os dados repetidos `escala` vezes; cada cópia ganha IDs novos para não juntar atletas
+def csv_escalado(caminho, escala, pasta=PASTA_ESCALAS):
+    if escala == 1:
+        return caminho
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    destino = os.path.join(pasta, f'{nome}_x{escala}.csv')
+    if os.path.exists(destino) and os.path.getmtime(destino) >= os.path.getmtime(caminho):
+        return destino
+    os.makedirs(pasta, exist_ok=True)
+    original = pd.read_csv(caminho)
+    passo = int(original['ID'].max())
+    temp = destino + '.tmp'
+    for k in range(escala):
+        copia = original.assign(ID=original['ID'] + k * passo)
+        copia.to_csv(temp, index=False, mode='w' if k == 0 else 'a', header=k == 0)
+    os.replace(temp, destino)
+    return destino
+
+
+# Combinações de filtros: a visão padrão, um recorte estreito e seleções múltiplas,
+# com o esporte, os países e os anos mais frequentes nos dados
+def combinacoes(df):
+    esportes = df['Esporte'].value_counts().index.tolist()
+    paises = df['País'].value_counts().index.tolist()
+    anos = sorted(df['Ano'].unique().tolist())
+    return {
+        'padrao': dict(season='Ambas', gender='Ambos', sport='Todos', sports=[],
+                       country=[], year=[], pais=paises[0], yaxis='Altura'),
+        'recorte': dict(season='Verão', gender='Feminino', sport=esportes[0], sports=[esportes[0]],
+                        country=[paises[0]], year=[anos[-1]], pais=paises[0], yaxis='Idade'),
+        'multiselecao': dict(season='Ambas', gender='Ambos', sport=esportes[0], sports=esportes[:5],
+                             country=paises[:5], year=anos[-3:], pais=paises[1 % len(paises)], yaxis='Altura'),
+    }
+
+
+def limpar_caches():
+    resultados.limpar()
+    figuras.limpar()
+
+
+def cronometrar(funcao, repeticoes):
+    melhor = None
+    valor = None
+    for _ in range(repeticoes):
+        limpar_caches()
+        inicio = time.perf_counter()
+        valor = funcao()
+        duracao = time.perf_counter() - inicio
+        melhor = duracao if melhor is None else min(melhor, duracao)
+    return melhor, valor
+
+
+def pico_memoria(funcao):
+    limpar_caches()
+    tracemalloc.start()
+    try:
+        funcao()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def medir(funcao, repeticoes):
+    segundos, valor = cronometrar(funcao, repeticoes)
+    medida = {'segundos': segundos, 'pico_bytes': pico_memoria(funcao)}
+    if hasattr(valor, 'to_plotly_json'):
+        # o JSON enviado (codificacao.codificar), o JSON comum do plotly para comparação e o tempo
+        # de leitura do enviado, que acompanha o JSON.parse do navegador
+        spec = codificar(valor)
+        inicio = time.perf_counter()
+        json.loads(spec)
+        medida['parse_segundos'] = time.perf_counter() - inicio
+        medida['payload_bytes'] = len(spec)
+        medida['plotly_bytes'] = len(plotly.io.to_json(valor, validate=False))
+    return medida
+
+
+# Carga do CSV escalado e construção das estruturas compartilhadas (cubo, faixas etárias, histórico,
+# somas por esporte), refeitas e lidas do disco; com blocos > 0 mede também a construção lendo o CSV
+# em blocos dessas linhas
+def medir_carga(caminho, repeticoes, blocos=0):
+    dados.construir_colunar(caminho)
+
+    def carregar():
+        dados._cache.pop(caminho, None)
+        dados.limpar_derivados()
+        return dados.carregar_dados(caminho)
+
+    def estruturas(em_disco=True):
+        dados.limpar_derivados(caminho, em_disco)
+        cubo_medalhas()
+        cubo_eventos()
+        faixas.faixas_etarias()
+        historico_medalhas()
+        medias.somas_por_esporte()
+
+    def estruturas_em_blocos():
+        dados.usar_blocos(blocos)
+        try:
+            estruturas()
+        finally:
+            dados.usar_blocos(0)
+
+    medidas = {'dados/carregar_dados': medir(carregar, repeticoes)}
+    carregar()
+    medidas['dados/estruturas'] = medir(estruturas, repeticoes)
+    # gravadas pela última medida: é o que um processo novo do app encontra
+    medidas['dados/estruturas_mapeadas'] = medir(lambda: estruturas(em_disco=False), repeticoes)
+    if blocos:
+        medidas['dados/estruturas_em_blocos'] = medir(estruturas_em_blocos, repeticoes)
+        dados.limpar_derivados()
+    return medidas
+
+
+def rodar(caminho, escalas, repeticoes, etapas=None, blocos=0):
+    relatorio = {}
+    for escala in escalas:
+        arquivo = csv_escalado(caminho, escala)
+        dados.usar_csv(arquivo)
+        medidas = medir_carga(arquivo, repeticoes, blocos)
+        df = dados.carregar_dados()
+        # estruturas prontas antes das etapas, como acontece depois da primeira visita ao app
+        cubo_medalhas()
+        cubo_eventos()
+        faixas.faixas_etarias()
+        historico_medalhas()
+        medias.somas_por_esporte()
+        for nome_combinacao, combinacao in combinacoes(df).items():
+            for pagina, etapa, funcao in ETAPAS:
+                if etapas and etapa not in etapas:
+                    continue
+                chave = f'{pagina}/{etapa}/{nome_combinacao}'
+                medidas[chave] = medir(lambda: funcao(combinacao), repeticoes)
+        relatorio[str(escala)] = {'linhas': len(df), 'etapas': medidas}
+    dados.usar_csv(caminho)
+    limpar_caches()
+    return relatorio
+
+
+# Etapas mais lentas ou com mais memória que a baseline por um fator maior que `limiar`
+def comparar(relatorio, baseline, limiar):
+    regressoes = []
+    for escala, atual in relatorio.items():
+        anterior = baseline.get(escala, {}).get('etapas', {})
+        for chave, medida in atual['etapas'].items():
+            base = anterior.get(chave)
+            if base is None:
+                continue
+            if medida['segundos'] > max(base['segundos'], RUIDO_SEGUNDOS) * limiar:
+                regressoes.append((escala, chave, 'segundos', base['segundos'], medida['segundos']))
+            if medida['pico_bytes'] > base['pico_bytes'] * limiar:
+                regressoes.append((escala, chave, 'pico_bytes', base['pico_bytes'], medida['pico_bytes']))
+            if 'payload_bytes' in base and medida.get('payload_bytes', 0) > base['payload_bytes'] * limiar:
+                regressoes.append((escala, chave, 'payload_bytes', base['payload_bytes'], medida['payload_bytes']))
+    return regressoes
+
+
+def imprimir(relatorio):
+    for escala, atual in relatorio.items():
+        print(f'\nescala {escala}x ({atual["linhas"]} linhas)')
+        print(f'{"etapa":<60} {"ms":>10} {"pico MB":>10} {"payload KB":>11} {"plotly KB":>10} {"parse ms":>9}')
+        for chave, medida in atual['etapas'].items():
+            figura = ''
+            if 'payload_bytes' in medida:
+                figura = (f' {medida["payload_bytes"] / 1024:11.1f} {medida["plotly_bytes"] / 1024:10.1f}'
+                          f' {medida["parse_segundos"] * 1000:9.2f}')
+            print(f'{chave:<60} {medida["segundos"] * 1000:10.1f} {medida["pico_bytes"] / 2 ** 20:10.1f}{figura}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark das páginas sem servidor do Streamlit')
+    parser.add_argument('--csv', default=dados.CSV_PATH)
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--etapas', nargs='*', help='só as etapas com esses nomes (ex.: build_marimekko)')
+    parser.add_argument('--saida', help='grava o relatório em JSON nesse arquivo')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--salvar-baseline', action='store_true')
+    parser.add_argument('--limiar', type=float, default=1.5)
+    parser.add_argument('--blocos', type=int, default=0, help='mede também as estruturas montadas em blocos dessas linhas')
+    args = parser.parse_args(argv)
+
+    relatorio = rodar(args.csv, args.escalas, args.repeticoes, args.etapas, args.blocos)
+    imprimir(relatorio)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=1)
+    if args.salvar_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=1)
+        print(f'\nbaseline salva em {args.baseline}')
+        return 0
+    if not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        regressoes = comparar(relatorio, json.load(f), args.limiar)
+    for escala, chave, medida, antes, depois in regressoes:
+        print(f'REGRESSÃO {escala}x {chave} {medida}: {antes:.4g} -> {depois:.4g}')
+    if not regressoes:
+        print(f'\nsem regressões em relação a {args.baseline}')
+    return 1 if regressoes else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from olimpiadas import dados
+from olimpiadas.tempos import etapa
+
+# Modo em blocos (OLIMPIADAS_BLOCOS=linhas por bloco): as estruturas derivadas são montadas a partir
+# de tabelas agregadas, lidas do CSV em blocos de tamanho fixo, sem carregar os dados inteiros.
+# A tabela agregada tem uma linha por combinação das colunas-chave e a coluna "linhas" com quantas
+# linhas dos dados caíram nela; as funções de construção usam essa coluna como peso.
+
+
+# Peso de cada linha: 1 nos dados carregados, "linhas" numa tabela agregada
+def pesos(df):
+    return df['linhas'].to_numpy() if 'linhas' in df.columns else None
+
+
+# Contagem de linhas (e soma e quantidade de valores das colunas em `somas`) por combinação
+# das colunas-chave; valores ausentes nas chaves também formam grupos
+def _agrupar(df, chaves, somas=()):
+    grupos = df.groupby(chaves, dropna=False, observed=True, sort=False)
+    partes = {'linhas': grupos.size()}
+    for coluna in somas:
+        partes[f'{coluna}_soma'] = grupos[coluna].sum().astype(np.float64)
+        partes[f'{coluna}_n'] = grupos[coluna].count()
+    return pd.DataFrame(partes)
+
+
+# Índice de grupos vira colunas: texto fica como categoria (ordenada, só com os valores presentes)
+# e números voltam aos tipos dos dados
+def _tabela(agregado):
+    tabela = agregado.reset_index()
+    for coluna in agregado.index.names:
+        serie = tabela[coluna]
+        if coluna in dados.TIPOS:
+            tabela[coluna] = serie.astype(dados.TIPOS[coluna] if serie.notna().all() else np.float32)
+        elif isinstance(serie.dtype, pd.CategoricalDtype):
+            tabela[coluna] = serie.cat.remove_unused_categories()
+        else:
+            tabela[coluna] = pd.Categorical(serie.to_numpy(dtype=object))
+    return tabela
+
+
+# Tabela agregada dos dados já carregados
+def agregar_df(df, chaves, somas=(), filtrar=None):
+    if filtrar is not None:
+        df = df[filtrar(df)]
+    return _tabela(_agrupar(df, chaves, somas))
+
+
+# Junta tabelas agregadas (de blocos diferentes ou de linhas anexadas) somando as combinações repetidas.
+# As colunas de texto ficam como categorias com a união (ordenada) das categorias de cada tabela.
+def juntar(tabelas, chaves):
+    colunas = {}
+    for coluna in tabelas[0].columns:
+        series = [t[coluna] for t in tabelas]
+        if coluna in chaves and coluna not in dados.TIPOS:
+            # coluna de texto vazia em um bloco chega como número
+            colunas[coluna] = union_categoricals(
+                [s.array if isinstance(s.dtype, pd.CategoricalDtype) else pd.Categorical(s.to_numpy(dtype=object))
+                 for s in series], sort_categories=True)
+        else:
+            colunas[coluna] = np.concatenate([s.to_numpy() for s in series])
+    juntas = pd.DataFrame(colunas, copy=False)
+    return _tabela(juntas.groupby(chaves, dropna=False, observed=True, sort=False).sum())
+
+
+# Tabelas agregadas usadas no modo em blocos: nome -> (chaves, somas, filtrar). Todas são montadas na
+# mesma leitura do CSV; cada estrutura derivada retira a sua (veja tabela_em_blocos).
+_tabelas = {}
+_lidas = {}
+
+
+def tabela_agregada(nome, chaves, somas=(), filtrar=None):
+    _tabelas[nome] = (list(chaves), list(somas), filtrar)
+
+
+# Tabelas agregadas lendo o CSV (só as colunas usadas) em blocos de `linhas` linhas. As parciais dos
+# blocos são somadas às acumuladas quando passam do tamanho delas (ou de um bloco), então a memória
+# depende do tamanho do bloco e do número de combinações, não do arquivo.
+def agregar_csv(nomes, caminho=None, linhas=None):
+    caminho = caminho or dados.CSV_PATH
+    linhas = linhas or dados.BLOCOS
+    originais = {novo: antigo for antigo, novo in dados.COLUNAS.items()}
+    usadas = {originais.get(c, c) for nome in nomes for c in _tabelas[nome][0] + _tabelas[nome][1]}
+    totais = dict.fromkeys(nomes)
+    parciais = {nome: [] for nome in nomes}
+    with etapa('agregar_csv') as e:
+        for bloco in pd.read_csv(caminho, chunksize=linhas, usecols=lambda c: c in usadas):
+            bloco = dados.tipar_colunas(bloco)
+            for nome in nomes:
+                chaves, somas, filtrar = _tabelas[nome]
+                parciais[nome].append(agregar_df(bloco, chaves, somas, filtrar))
+                total = totais[nome]
+                if sum(len(p) for p in parciais[nome]) > max(linhas, 0 if total is None else len(total)):
+                    totais[nome] = juntar(parciais[nome] if total is None else [total] + parciais[nome], chaves)
+                    parciais[nome] = []
+        for nome in nomes:
+            if parciais[nome] or totais[nome] is None:
+                total = totais[nome]
+                totais[nome] = juntar(parciais[nome] if total is None else [total] + parciais[nome], _tabelas[nome][0])
+        e.anotar(linhas=sum(len(t) for t in totais.values()))
+    return totais
+
+
+# Tabela agregada de uma estrutura derivada no modo em blocos. A primeira estrutura pedida lê o CSV
+# uma vez para todas as tabelas registradas; as outras só retiram a sua (chamada dentro de
+# dados.derivado, que segura o lock dos dados).
+def tabela_em_blocos(nome, caminho=None):
+    caminho = caminho or dados.CSV_PATH
+    versao = dados.versao_dados(caminho)
+    if _lidas.get(caminho, (None,))[0] != versao or nome not in _lidas[caminho][1]:
+        _lidas[caminho] = (versao, agregar_csv(list(_tabelas), caminho))
+    return _lidas[caminho][1].pop(nome)
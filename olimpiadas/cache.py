@@ -0,0 +1,139 @@
+import functools
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from olimpiadas.dados import versao_dados
+from olimpiadas.tempos import etapa
+
+# Orçamento de memória do cache de resultados, em MB (variável de ambiente OLIMPIADAS_CACHE_MB)
+LIMITE_MB = float(os.environ.get('OLIMPIADAS_CACHE_MB', 256))
+
+
+# tamanho aproximado de um resultado em bytes
+def tamanho(valor):
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(index=True, deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(index=True, deep=True))
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, (tuple, list)):
+        return sys.getsizeof(valor) + sum(tamanho(v) for v in valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanho(v) for v in valor.values())
+    return sys.getsizeof(valor)
+
+
+# Cache LRU compartilhado entre sessões, limitado por bytes e com contadores de uso.
+# Os valores guardados são compartilhados e não devem ser alterados por quem os lê.
+# Um valor sendo calculado fica em _calculando: quem pede a mesma chave nesse meio-tempo
+# (outra sessão, o aquecimento) espera por ele em vez de calcular de novo.
+class CacheLRU:
+    def __init__(self, limite_bytes):
+        self.limite_bytes = limite_bytes
+        self._itens = OrderedDict()
+        self._calculando = {}
+        self._lock = threading.Lock()
+        self._versao = None
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.esperas = 0
+        self.evictions = 0
+
+    def _descartar_versao_antiga(self, versao):
+        if versao != self._versao:
+            self._itens.clear()
+            self.bytes = 0
+            self._versao = versao
+
+    def obter(self, chave, calcular, versao=None):
+        with self._lock:
+            self._descartar_versao_antiga(versao)
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.hits += 1
+                return self._itens[chave][0]
+            futuro = self._calculando.get((versao, chave))
+            dono = futuro is None
+            if dono:
+                futuro = self._calculando[(versao, chave)] = Future()
+                self.misses += 1
+            else:
+                self.esperas += 1
+        if not dono:
+            return futuro.result()
+        try:
+            valor = calcular()
+        except BaseException as erro:
+            futuro.set_exception(erro)
+            raise
+        else:
+            self.guardar(chave, valor, versao)
+            futuro.set_result(valor)
+            return valor
+        finally:
+            with self._lock:
+                self._calculando.pop((versao, chave), None)
+
+    def guardar(self, chave, valor, versao=None):
+        peso = tamanho(valor)
+        with self._lock:
+            self._descartar_versao_antiga(versao)
+            if peso > self.limite_bytes:
+                return
+            if chave in self._itens:
+                self.bytes -= self._itens.pop(chave)[1]
+            self._itens[chave] = (valor, peso)
+            self.bytes += peso
+            while self.bytes > self.limite_bytes:
+                _, (_, peso_antigo) = self._itens.popitem(last=False)
+                self.bytes -= peso_antigo
+                self.evictions += 1
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self.bytes = 0
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                'itens': len(self._itens),
+                'bytes': self.bytes,
+                'limite_bytes': self.limite_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'esperas': self.esperas,
+                'evictions': self.evictions,
+            }
+
+
+resultados = CacheLRU(int(LIMITE_MB * 1024 * 1024))
+
+
+# listas de filtros viram tuplas ordenadas, para que a ordem da seleção não mude a chave
+def normalizar(valor):
+    if isinstance(valor, (list, tuple, set)):
+        return tuple(sorted((normalizar(v) for v in valor), key=str))
+    return valor
+
+
+# Memoiza uma função de agregação pelos seus filtros no cache de resultados.
+# A chave inclui o arquivo da função (as páginas rodam todas como __main__) e a versão dos dados.
+def memoizar(funcao):
+    nome = (funcao.__code__.co_filename, funcao.__qualname__)
+
+    @functools.wraps(funcao)
+    def memoizada(*args, **kwargs):
+        versao = versao_dados()
+        chave = (nome, normalizar(args), tuple(sorted((k, normalizar(v)) for k, v in kwargs.items())))
+        with etapa(funcao.__name__) as e:
+            return e.anotar(resultados.obter(chave, lambda: funcao(*args, **kwargs), versao))
+    return memoizada
@@ -0,0 +1,140 @@
+import base64
+
+import numpy as np
+import plotly.io.json
+from _plotly_utils.utils import plotlyjsShortTypes, to_typed_array_spec
+
+# Codificação compacta das figuras enviadas ao navegador e guardadas na loja:
+# - vetores numéricos viram buffers binários tipados ({"dtype", "bdata"}) no menor tipo exato;
+# - nos mapas animados, todos os quadros passam a usar os mesmos locais (a união dos anos; o local
+#   ausente num ano fica com z NaN, que o plotly.js não desenha) e o que é igual em todos os quadros
+#   e no traço base (locais, nomes, escalas de cor...) sai dos quadros: o Plotly.animate só troca
+#   os atributos presentes no quadro;
+# - o resto sai pelo orjson quando instalado.
+
+# Versão da codificação; a loja em disco separa as figuras gravadas em cada uma (loja.pasta_loja)
+FORMATO = 2
+# Listas numéricas menores que isso ficam em JSON (o base64 não compensa)
+MINIMO_TIPADO = 8
+# Atributos com um valor por local nos mapas (choropleth)
+POR_LOCAL = {'z': np.nan, 'hovertext': '', 'text': '', 'customdata': np.nan}
+
+_TIPOS = {curto: np.dtype(tipo) for tipo, curto in plotlyjsShortTypes.items()}
+
+
+# Vetor numpy de uma lista, de um array ou de um buffer tipado do plotly
+def _arranjo(valor):
+    if isinstance(valor, dict) and 'bdata' in valor:
+        arranjo = np.frombuffer(base64.b64decode(valor['bdata']), dtype=_TIPOS[valor['dtype']])
+        if 'shape' in valor:
+            arranjo = arranjo.reshape([int(n) for n in valor['shape'].split(',')])
+        return arranjo
+    return np.asarray(valor)
+
+
+def _vetor(valor):
+    return isinstance(valor, (list, tuple, np.ndarray)) or (isinstance(valor, dict) and 'bdata' in valor)
+
+
+# Buffer tipado no menor tipo que guarda os valores sem perda (floats inteiros com NaN viram float32);
+# vetores de texto voltam a ser listas
+def _tipado(valor):
+    arranjo = _arranjo(valor)
+    if arranjo.dtype.kind in 'iu':
+        return to_typed_array_spec(arranjo.astype(np.int64))
+    if arranjo.dtype.kind != 'f':
+        return arranjo.tolist() if isinstance(valor, np.ndarray) else valor
+    finitos = arranjo[np.isfinite(arranjo)]
+    inteiros = (finitos == np.round(finitos)).all() and (np.abs(finitos) < 2 ** 24).all()
+    if inteiros and len(finitos) == arranjo.size:
+        return to_typed_array_spec(arranjo.astype(np.int64))
+    return to_typed_array_spec(arranjo.astype(np.float32) if inteiros else arranjo)
+
+
+# Troca os vetores numéricos de um traço (e dos dicts dentro dele) por buffers tipados
+def _tipar(objeto):
+    for chave, valor in objeto.items():
+        if isinstance(valor, dict) and 'bdata' not in valor:
+            _tipar(valor)
+        elif _vetor(valor) and (isinstance(valor, (dict, np.ndarray)) or len(valor) >= MINIMO_TIPADO):
+            if isinstance(valor, list) and any(isinstance(v, (bool, str, list, dict)) or v is None for v in valor):
+                continue
+            objeto[chave] = _tipado(valor)
+
+
+# Traços de cada posição: o do base e o de cada quadro, se todos os quadros têm os mesmos traços
+def _por_posicao(figura):
+    quadros = figura.get('frames') or []
+    base = figura.get('data') or []
+    nomes = [t.get('name') for t in base]
+    if not quadros or any([t.get('name') for t in q.get('data', [])] != nomes for q in quadros):
+        return []
+    return [[base[i]] + [q['data'][i] for q in quadros] for i in range(len(base))]
+
+
+# Põe todos os quadros de um mapa nos mesmos locais, na ordem em que aparecem. Nos textos, o local
+# ausente repete o texto que tem nos outros quadros (não aparece, e o vetor fica igual entre quadros)
+def _alinhar(tracos):
+    if any(t.get('type') != 'choropleth' or not _vetor(t.get('locations')) for t in tracos):
+        return
+    locais = {}
+    for t in tracos:
+        for local in _arranjo(t['locations']).tolist():
+            locais.setdefault(local, len(locais))
+    todos = np.array(list(locais), dtype=object)
+    posicoes = [np.array([locais[local] for local in _arranjo(t['locations']).tolist()], dtype=np.int64) for t in tracos]
+    for chave, vazio in POR_LOCAL.items():
+        presentes = [(t, p, _arranjo(t[chave])) for t, p in zip(tracos, posicoes) if _vetor(t.get(chave))]
+        presentes = [(t, p, v) for t, p, v in presentes if len(v) == len(p)]
+        if not presentes:
+            continue
+        forma = (len(todos),) + presentes[0][2].shape[1:]
+        if isinstance(vazio, str):
+            padrao = np.full(forma, vazio, dtype=object)
+            for _, p, valores in reversed(presentes):
+                padrao[p] = valores
+        for t, p, valores in presentes:
+            alinhado = padrao.copy() if isinstance(vazio, str) else np.full(forma, vazio)
+            alinhado[p] = valores
+            t[chave] = alinhado
+    for t in tracos:
+        t['locations'] = todos
+
+
+def _igual(a, b):
+    if isinstance(a, dict) and isinstance(b, dict) and not (_vetor(a) or _vetor(b)):
+        return a.keys() == b.keys() and all(_igual(a[k], b[k]) for k in a)
+    if not (_vetor(a) and _vetor(b)):
+        return not (_vetor(a) or _vetor(b)) and a == b
+    a, b = _arranjo(a), _arranjo(b)
+    nan = a.dtype.kind == 'f' and b.dtype.kind == 'f'
+    return (a.dtype.kind == 'O') == (b.dtype.kind == 'O') and np.array_equal(a, b, equal_nan=nan)
+
+
+# Tira dos quadros os atributos iguais em todos eles e no traço base; o tipo fica (sem ele o
+# plotly lê o traço do quadro como scatter)
+def _tirar_constantes(tracos):
+    base, quadros = tracos[0], tracos[1:]
+    for chave in list(quadros[0]):
+        if chave != 'type' and chave in base and all(chave in q and _igual(q[chave], base[chave]) for q in quadros):
+            for q in quadros:
+                del q[chave]
+
+
+# Dict da figura já compactado (veja o início do módulo)
+def compactar(figura):
+    figura = figura.to_plotly_json() if hasattr(figura, 'to_plotly_json') else figura
+    for tracos in _por_posicao(figura):
+        _alinhar(tracos)
+        _tirar_constantes(tracos)
+    for traco in figura.get('data') or []:
+        _tipar(traco)
+    for quadro in figura.get('frames') or []:
+        for traco in quadro.get('data') or []:
+            _tipar(traco)
+    return figura
+
+
+# JSON compacto da figura (a figura já foi validada pelo plotly ao ser criada)
+def codificar(figura):
+    return plotly.io.json.to_json_plotly(compactar(figura), engine='auto')
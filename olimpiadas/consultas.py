@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from olimpiadas import dados
+from olimpiadas.cache import CacheLRU
+from olimpiadas.cubo import CONTAGENS, cubo_medalhas
+from olimpiadas.dimensoes import opcoes
+from olimpiadas.filtros import filtros_pagina
+from olimpiadas.historico import historico_medalhas
+from olimpiadas.medalhas import contagem_medalhas
+from olimpiadas.medias import MEDIDAS, media_por_esporte, somas_por_esporte
+from olimpiadas.participacao import participacao_df, participacoes_por_pais
+from olimpiadas.ranking import maiores_medalhistas
+
+# Os agregados das páginas sem o Streamlit, para outras ferramentas: como API Python (as funções
+# abaixo devolvem DataFrames) e como serviço HTTP local que responde JSON:
+#   python -m olimpiadas.consultas --porta 8600
+#   curl 'localhost:8600/medalhas?season=Verão&sport=Judo&country=Brasil'
+#   curl 'localhost:8600/medalhistas?sport=Judo&sport=Swimming&top=5'
+# Os filtros têm os nomes e valores dos seletores das páginas. Tudo sai das estruturas
+# pré-calculadas (cubo, histórico, somas por esporte) e as respostas ficam no cache de respostas;
+# pedidos iguais ao mesmo tempo esperam pelo mesmo cálculo.
+
+# Orçamento de memória do cache de respostas JSON, em MB (variável de ambiente OLIMPIADAS_RESPOSTAS_MB)
+LIMITE_MB = float(os.environ.get('OLIMPIADAS_RESPOSTAS_MB', 64))
+
+respostas = CacheLRU(int(LIMITE_MB * 1024 * 1024))
+
+
+# só as linhas dos países escolhidos (None ou lista vazia não filtra)
+def _dos_paises(df, country):
+    if not country:
+        return df
+    return df[df['País'].isin([country] if isinstance(country, str) else country)].reset_index(drop=True)
+
+
+# Medalhas por país e ano (total, ouro, prata e bronze), por atleta ou por medalha oficial (medals)
+def medalhas(season='Ambas', gender='Ambos', sport='Todos', country=None, medals='Por atleta'):
+    return _dos_paises(contagem_medalhas(season, gender, sport, medals), country)
+
+
+# Países (NOC e País) presentes em cada ano no recorte
+def participacao(season='Ambas', gender='Ambos', sport='Todos', country=None):
+    return _dos_paises(participacao_df(season, gender, sport), country)
+
+
+# Número de Jogos com participação de cada país no recorte, do maior para o menor
+def participacoes(season='Ambas', gender='Ambos', sport='Todos', country=None):
+    return _dos_paises(participacoes_por_pais(season, gender, sport), country)
+
+
+# Os `top` maiores medalhistas (medalhas acumuladas na participação mais recente no recorte);
+# sport e country aceitam listas
+def medalhistas(season='Ambas', gender='Ambos', sport=None, country=None, top=10):
+    historico = historico_medalhas()
+    linhas = maiores_medalhistas(top, **filtros_pagina(season, gender, sport or [], country))
+    colunas = ['ID', 'Nome', 'País', 'Esporte', 'Ano', 'Bronze', 'Silver', 'Gold', 'Total Medal']
+    return historico.take(linhas)[colunas].reset_index(drop=True)
+
+
+# Média de altura ou idade (medida) por esporte e ano; sport, country e year aceitam listas
+def medias(sport=None, country=None, year=None, medida='Altura'):
+    return media_por_esporte(sport or [], country or [], year or [], medida)
+
+
+# Consultas e os tipos dos seus parâmetros: str (um valor), list (um ou mais) ou int
+CONSULTAS = {
+    'medalhas': (medalhas, {'season': str, 'gender': str, 'sport': str, 'country': list, 'medals': str}),
+    'participacao': (participacao, {'season': str, 'gender': str, 'sport': str, 'country': list}),
+    'participacoes': (participacoes, {'season': str, 'gender': str, 'sport': str, 'country': list}),
+    'medalhistas': (medalhistas, {'season': str, 'gender': str, 'sport': list, 'country': list, 'top': int}),
+    'medias': (medias, {'sport': list, 'country': list, 'year': list, 'medida': str}),
+}
+
+
+# Valores aceitos nos filtros de um valor só (os rótulos dos seletores das páginas)
+VALORES = {
+    'season': ('Ambas',) + tuple(dados.TEMPORADAS),
+    'gender': ('Ambos',) + tuple(dados.GENEROS),
+    'medals': CONTAGENS,
+    'medida': tuple(MEDIDAS),
+}
+
+# Filtros cujos valores vêm dos dados (as opções dos seletores); o esporte de um valor só aceita
+# também 'Todos'
+DIMENSOES = {'sport': 'esportes', 'country': 'paises'}
+
+
+# Converte os parâmetros de uma URL ({nome: [valores]}) nos tipos da consulta
+def ler_parametros(nome, parametros):
+    tipos = CONSULTAS[nome][1]
+    filtros = {}
+    for parametro, valores in parametros.items():
+        tipo = tipos.get(parametro)
+        if tipo is None:
+            raise ValueError(f'parâmetro desconhecido em {nome}: {parametro!r}')
+        if tipo is list:
+            filtros[parametro] = [int(v) if parametro == 'year' else v for v in valores]
+        elif len(valores) > 1:
+            raise ValueError(f'{parametro} aceita um valor só')
+        else:
+            filtros[parametro] = tipo(valores[0])
+        if parametro in VALORES and filtros[parametro] not in VALORES[parametro]:
+            raise ValueError(f'{parametro} deve ser um de: {", ".join(VALORES[parametro])}')
+        if parametro in DIMENSOES:
+            aceitos = set(opcoes(DIMENSOES[parametro]))
+            if tipo is str:
+                aceitos.add('Todos')
+            desconhecidos = [v for v in valores if v not in aceitos]
+            if desconhecidos:
+                raise ValueError(f'{parametro} desconhecido: {", ".join(map(repr, desconhecidos))}')
+    return filtros
+
+
+# Resposta JSON (bytes) de uma consulta: {"consulta", "filtros", "linhas": [{coluna: valor}, ...]}.
+# Guardada no cache de respostas pela consulta e filtros, na versão atual dos dados.
+def consultar(nome, **filtros):
+    funcao = CONSULTAS[nome][0]
+    chave = (nome, tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in filtros.items())))
+
+    def calcular():
+        linhas = funcao(**filtros).to_json(orient='records', force_ascii=False)
+        cabecalho = json.dumps({'consulta': nome, 'filtros': filtros}, ensure_ascii=False)
+        return (cabecalho[:-1] + ', "linhas": ' + linhas + '}').encode('utf-8')
+
+    return respostas.obter(chave, calcular, dados.versao_dados())
+
+
+class Tratador(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        nome = url.path.strip('/')
+        if nome == '':
+            corpo = {n: sorted(tipos) for n, (_, tipos) in CONSULTAS.items()}
+            return self._responder(200, json.dumps({'consultas': corpo}, ensure_ascii=False).encode('utf-8'))
+        if nome == 'estatisticas':
+            return self._responder(200, json.dumps(respostas.estatisticas()).encode('utf-8'))
+        if nome not in CONSULTAS:
+            return self._erro(404, f'consulta desconhecida: {nome!r}')
+        try:
+            filtros = ler_parametros(nome, parse_qs(url.query))
+        except ValueError as erro:
+            return self._erro(400, str(erro))
+        try:
+            corpo = consultar(nome, **filtros)
+        except Exception as erro:
+            # o detalhe fica no stderr do servidor, não na resposta
+            print(f'consulta {nome} falhou: {erro!r}', file=sys.stderr)
+            return self._erro(500, 'erro interno ao calcular a consulta')
+        self._responder(200, corpo)
+
+    def _erro(self, status, mensagem):
+        self._responder(status, json.dumps({'erro': mensagem}, ensure_ascii=False).encode('utf-8'))
+
+    def _responder(self, status, corpo):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    # sem uma linha no stderr por pedido
+    def log_message(self, formato, *args):
+        pass
+
+
+# Servidor HTTP com uma thread por pedido
+def servidor(host='127.0.0.1', porta=8600):
+    return ThreadingHTTPServer((host, porta), Tratador)
+
+
+# Carrega os dados e monta as estruturas usadas pelas consultas antes do primeiro pedido
+def preparar():
+    if not dados.BLOCOS:
+        dados.carregar_dados()
+    cubo_medalhas()
+    historico_medalhas()
+    somas_por_esporte()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serviço HTTP local (JSON) com os agregados das páginas')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8600)
+    parser.add_argument('--csv', default=dados.CSV_PATH)
+    args = parser.parse_args(argv)
+    dados.usar_csv(args.csv)
+    preparar()
+    with servidor(args.host, args.porta) as http:
+        print(f'consultas em http://{args.host}:{http.server_address[1]}/', file=sys.stderr)
+        try:
+            http.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
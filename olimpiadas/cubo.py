@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+
+from olimpiadas.cache import memoizar
+from olimpiadas.blocos import pesos, tabela_agregada, tabela_em_blocos
+from olimpiadas.dados import GENEROS, TEMPORADAS, atualizacao_incremental, derivado
+
+# Posição de cada tipo de medalha no último eixo do cubo; linhas sem medalha ficam em SEM_MEDALHA
+MEDALHAS = ['Gold', 'Silver', 'Bronze']
+SEM_MEDALHA = len(MEDALHAS)
+# Colunas da tabela agregada usada no modo em blocos
+CHAVES = ['Season', 'Gênero', 'Esporte', 'NOC', 'País', 'Ano', 'Medalha']
+
+
+# Códigos das linhas válidas: [temporada, gênero, esporte], NOC, País, ano, medalha e peso
+def _codigos_linhas(df):
+    noc = df['NOC'].cat.codes.to_numpy()
+    pais = df['País'].cat.codes.to_numpy()
+    dimensoes = [df[coluna].cat.codes.to_numpy() for coluna in ('Season', 'Gênero', 'Esporte')]
+    validos = (noc >= 0) & (pais >= 0)
+    for d in dimensoes:
+        validos &= d >= 0
+
+    # código da medalha de cada linha; o -1 (sem medalha) cai na última posição da tabela
+    categorias = df['Medalha'].cat.categories
+    tabela = np.array([MEDALHAS.index(c) if c in MEDALHAS else SEM_MEDALHA for c in categorias] + [SEM_MEDALHA])
+    medalha = tabela[df['Medalha'].cat.codes.to_numpy()[validos]]
+    peso = pesos(df)
+    peso = None if peso is None else peso[validos]
+    return [d[validos] for d in dimensoes], noc[validos], pais[validos], df['Ano'].to_numpy()[validos], medalha, peso
+
+
+def _montar(df, contagem, pares, anos):
+    n_paises = len(df['País'].cat.categories)
+    return {
+        'contagem': contagem.astype(np.min_scalar_type(contagem.max() if contagem.size else 0)),
+        'temporadas': df['Season'].cat.categories,
+        'generos': df['Gênero'].cat.categories,
+        'esportes': df['Esporte'].cat.categories,
+        'noc_do_par': (pares // n_paises).astype(np.int32),
+        'pais_do_par': (pares % n_paises).astype(np.int32),
+        'nocs': df['NOC'].cat.categories,
+        'paises': df['País'].cat.categories,
+        'anos': anos,
+    }
+
+
+# Cubo de contagens temporada × gênero × esporte × (NOC, País) × ano × medalha,
+# montado em uma única passada (bincount) sobre os dados carregados ou sobre a tabela agregada.
+def construir_cubo(df):
+    dimensoes, noc, pais, ano, medalha, peso = _codigos_linhas(df)
+
+    # cada par (NOC, País) distinto vira uma posição do eixo de países
+    n_paises = len(df['País'].cat.categories)
+    pares, par = np.unique(noc.astype(np.int64) * n_paises + pais, return_inverse=True)
+    anos, ano = np.unique(ano, return_inverse=True)
+
+    forma = tuple(len(df[c].cat.categories) for c in ('Season', 'Gênero', 'Esporte')) + (len(pares), len(anos), SEM_MEDALHA + 1)
+    indice = np.ravel_multi_index(dimensoes + [par, ano, medalha], forma)
+    contagem = np.bincount(indice, weights=peso, minlength=int(np.prod(forma))).astype(np.int64).reshape(forma)
+    return _montar(df, contagem, pares, anos)
+
+
+# Soma ao cubo as linhas `novas` (tiradas dos dados `novo`). Os eixos crescem com as categorias, pares e
+# anos novos; as contagens antigas são copiadas para as novas posições sem reler as linhas antigas.
+def somar_ao_cubo(cubo, novo, novas):
+    dimensoes, noc, pais, ano, medalha, _ = _codigos_linhas(novas)
+    eixos = [novo[c].cat.categories for c in ('Season', 'Gênero', 'Esporte')]
+    mapas = [e.get_indexer(velho) for e, velho in zip(eixos, (cubo['temporadas'], cubo['generos'], cubo['esportes']))]
+
+    nocs, paises = novo['NOC'].cat.categories, novo['País'].cat.categories
+    n_paises = len(paises)
+    antigos = (nocs.get_indexer(cubo['nocs'][cubo['noc_do_par']]).astype(np.int64) * n_paises
+               + paises.get_indexer(cubo['paises'][cubo['pais_do_par']]))
+    pares_novos = noc.astype(np.int64) * n_paises + pais
+    pares = np.union1d(antigos, pares_novos)
+    anos = np.union1d(cubo['anos'], ano)
+
+    forma = tuple(len(e) for e in eixos) + (len(pares), len(anos), SEM_MEDALHA + 1)
+    limite = int(cubo['contagem'].max() if cubo['contagem'].size else 0) + len(ano)
+    tipo = np.promote_types(cubo['contagem'].dtype, np.min_scalar_type(limite))
+    # cresce um eixo por vez, só os que mudaram (anos novos normalmente só entram no fim)
+    contagem = cubo['contagem'].astype(tipo)
+    posicoes_antigas = mapas + [np.searchsorted(pares, antigos), np.searchsorted(anos, cubo['anos'])]
+    for eixo, (mapa, tamanho) in enumerate(zip(posicoes_antigas, forma)):
+        if len(mapa) == tamanho:
+            continue
+        contiguo = len(mapa) and (np.diff(mapa) == 1).all()
+        maior = np.zeros(contagem.shape[:eixo] + (tamanho,) + contagem.shape[eixo + 1:], dtype=tipo)
+        maior[(slice(None),) * eixo + (slice(mapa[0], mapa[-1] + 1) if contiguo else mapa,)] = contagem
+        contagem = maior
+    indice = np.ravel_multi_index(dimensoes + [np.searchsorted(pares, pares_novos), np.searchsorted(anos, ano), medalha], forma)
+    np.add.at(contagem.reshape(-1), indice, 1)
+    return _montar(novo, contagem, pares, anos)
+
+
+# Soma ao cubo só as linhas anexadas (dados.anexar)
+def atualizar_cubo(chave, cubo, antigo, novo):
+    return somar_ao_cubo(cubo, novo, novo.iloc[len(antigo):])
+
+
+def cubo_medalhas():
+    return derivado('cubo_medalhas', construir_cubo,
+                    em_blocos=lambda caminho: construir_cubo(tabela_em_blocos('cubo_medalhas', caminho)))
+
+
+atualizacao_incremental('cubo_medalhas', atualizar_cubo)
+tabela_agregada('cubo_medalhas', CHAVES)
+
+
+# Medalhas oficiais: uma por Jogos (ano e temporada), evento, NOC e medalha, em vez de uma por atleta
+# medalhista (uma equipe de futebol vira uma medalha, não 15-20). O CSV não tem a coluna Games.
+CHAVES_EVENTO = ['Ano', 'Season', 'Event', 'NOC', 'Medalha']
+
+
+# Linhas sem medalha (a participação continua contando) e a primeira linha de cada medalha oficial;
+# numa tabela agregada cada medalha oficial passa a valer uma linha. Com por_genero, a medalha de um
+# evento misto conta uma vez para cada gênero da equipe (é o que o filtro de gênero deve mostrar).
+def linhas_de_eventos(df, por_genero=False):
+    medalha = df['Medalha'].notna().to_numpy()
+    chaves = CHAVES_EVENTO + ['Gênero'] if por_genero else CHAVES_EVENTO
+    manter = ~medalha | ~df.duplicated(subset=chaves).to_numpy()
+    linhas = df[manter]
+    if 'linhas' in linhas.columns:
+        linhas = linhas.assign(linhas=np.where(medalha[manter], 1, linhas['linhas'].to_numpy()))
+    return linhas
+
+
+# Os Jogos anexados são sempre posteriores aos carregados, então as linhas novas só repetem
+# medalhas oficiais entre si
+def atualizar_cubo_eventos(chave, cubo, antigo, novo):
+    return somar_ao_cubo(cubo, novo, linhas_de_eventos(novo.iloc[len(antigo):], chave[1]))
+
+
+# Cubo das medalhas oficiais, nos mesmos eixos do cubo_medalhas. Um evento misto (ex.: duplas mistas)
+# tem atletas dos dois gêneros: sem filtro de gênero a medalha conta uma vez (por_genero=False);
+# filtrando um gênero, conta se a equipe tem atletas dele (por_genero=True).
+def cubo_eventos(por_genero=False):
+    return derivado(('cubo_eventos', por_genero), lambda df: construir_cubo(linhas_de_eventos(df, por_genero)),
+                    em_blocos=lambda caminho: construir_cubo(linhas_de_eventos(tabela_em_blocos('cubo_eventos', caminho),
+                                                                               por_genero)))
+
+
+atualizacao_incremental('cubo_eventos', atualizar_cubo_eventos)
+tabela_agregada('cubo_eventos', CHAVES + ['Event'])
+
+# Formas de contar as medalhas nas páginas (parâmetro medals)
+CONTAGENS = ('Por atleta', 'Por evento')
+
+
+# Cubo da contagem escolhida: uma medalha por atleta medalhista ou uma por medalha oficial
+def cubo_contagem(medals='Por atleta', gender='Ambos'):
+    if medals not in CONTAGENS:
+        raise ValueError(f'contagem de medalhas desconhecida: {medals!r}')
+    if medals == 'Por atleta':
+        return cubo_medalhas()
+    return cubo_eventos(por_genero=GENEROS.get(gender) is not None)
+
+
+# Seleciona um valor no primeiro eixo ou soma todos ("Ambas", "Ambos", "Todos")
+def reduzir(contagem, categorias, valor):
+    if valor is None:
+        return contagem.sum(axis=0, dtype=np.int64)
+    if valor not in categorias:
+        return np.zeros(contagem.shape[1:], dtype=np.int64)
+    return contagem[categorias.get_loc(valor)]
+
+
+# Posições de um eixo que entram no filtro: todas, uma só ou nenhuma (valor inexistente)
+def posicoes(categorias, valor):
+    if valor is None:
+        return np.arange(len(categorias))
+    if valor not in categorias:
+        return np.arange(0)
+    return np.array([categorias.get_loc(valor)])
+
+
+# Converte os rótulos dos seletores das páginas nos valores usados no cubo
+def valores_filtro(season, gender, sport='Todos'):
+    return TEMPORADAS.get(season), GENEROS.get(gender), None if sport == 'Todos' else sport
+
+
+# Contagens (NOC, País) × ano × medalha para o recorte escolhido, na contagem escolhida (CONTAGENS)
+@memoizar
+def recorte(season, gender, sport='Todos', medals='Por atleta'):
+    cubo = cubo_contagem(medals, gender)
+    temporada, genero, esporte = valores_filtro(season, gender, sport)
+    contagem = reduzir(cubo['contagem'], cubo['temporadas'], temporada)
+    contagem = reduzir(contagem, cubo['generos'], genero)
+    return reduzir(contagem, cubo['esportes'], esporte)
+
+
+# Soma as posições de (NOC, País) que pertencem ao mesmo país (pares do cubo de onde veio a contagem)
+def por_pais(contagem, cubo=None):
+    cubo = cubo_medalhas() if cubo is None else cubo
+    soma = np.zeros((len(cubo['paises']),) + contagem.shape[1:], dtype=np.int64)
+    np.add.at(soma, cubo['pais_do_par'], contagem)
+    return soma
+
+
+def rotulos(codigos, categorias):
+    return pd.Categorical.from_codes(codigos, categories=categorias)
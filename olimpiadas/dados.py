@@ -0,0 +1,566 @@
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+
+from olimpiadas.tempos import etapa
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Arquivo de origem (variável de ambiente OLIMPIADAS_CSV) e diretório onde fica a versão colunar dele
+CSV_PATH = os.environ.get('OLIMPIADAS_CSV', "athlete_events_pt.csv")
+CACHE_DIR = ".cache_dados"
+# Versões anteriores lembradas no meta.json depois de anexar linhas
+MAX_ANTERIORES = 20
+# Alinhamento (bytes) dos vetores no arquivo binário de uma estrutura derivada gravada em disco
+ALINHAMENTO = 64
+# Linhas por bloco no modo em blocos (variável de ambiente OLIMPIADAS_BLOCOS; 0 carrega os dados
+# inteiros). Nesse modo as estruturas derivadas são montadas lendo o CSV em blocos (veja olimpiadas.blocos)
+BLOCOS = int(os.environ.get('OLIMPIADAS_BLOCOS', 0))
+
+# Nomes usados pelas páginas; a renomeação é feita uma única vez, na construção do cache
+COLUNAS = {
+    'Sex': 'Gênero',
+    'Sport': 'Esporte',
+    'Medal': 'Medalha',
+    'Year': 'Ano',
+    'Age': 'Idade',
+    'Name': 'Nome',
+    'Height': 'Altura',
+    'Weight': 'Peso',
+}
+
+# Tipos fixos para as colunas conhecidas; o resto é inferido em tipar_colunas
+TIPOS = {
+    'ID': 'int32',
+    'Ano': 'int16',
+    'Idade': 'float32',
+    'Altura': 'float32',
+    'Peso': 'float32',
+}
+
+# Rótulos dos seletores das páginas para os valores do CSV
+TEMPORADAS = {'Verão': 'Summer', 'Inverno': 'Winter'}
+GENEROS = {'Feminino': 'F', 'Masculino': 'M'}
+
+_lock = threading.RLock()
+_cache = {}
+
+
+# identifica a versão do CSV pelo mtime e tamanho do arquivo
+def versao_origem(caminho=None):
+    caminho = caminho or CSV_PATH
+    info = os.stat(caminho)
+    return [info.st_mtime_ns, info.st_size]
+
+
+def pasta_cache(caminho=None):
+    caminho = caminho or CSV_PATH
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    return os.path.join(CACHE_DIR, nome)
+
+
+# converte as colunas para tipos compactos: texto vira categoria, números encolhem
+def tipar_colunas(df):
+    df = df.rename(columns=COLUNAS)
+    for coluna in df.columns:
+        if coluna in TIPOS:
+            df[coluna] = df[coluna].astype(TIPOS[coluna])
+        elif df[coluna].dtype == object or pd.api.types.is_string_dtype(df[coluna]):
+            df[coluna] = df[coluna].astype('category')
+        elif pd.api.types.is_float_dtype(df[coluna]):
+            df[coluna] = df[coluna].astype('float32')
+        elif pd.api.types.is_integer_dtype(df[coluna]):
+            df[coluna] = pd.to_numeric(df[coluna], downcast='integer')
+    return df
+
+
+# Formato do arquivo colunar: um .bin por coluna (vetor cru, sem cabeçalho) dentro de
+# colunas/<versão>/ e o meta.json na pasta do CSV apontando para eles, com o dtype de cada coluna,
+# as categorias, o número de linhas e os Jogos presentes. anexar só acrescenta ao fim dos .bin e
+# publica um meta.json novo. derivados/ e loja/ ficam ao lado e não são tocados quando um processo
+# publica uma versão nova das colunas.
+FORMATO_COLUNAR = 3
+
+
+def _hash(valor):
+    return hashlib.sha1(repr(valor).encode('utf-8')).hexdigest()[:16]
+
+
+# nome temporário só deste processo e thread (veja _persistir)
+def nome_temporario(caminho):
+    return f'{caminho}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+
+# Trava exclusiva (entre processos) da pasta do CSV: um processo monta ou altera o arquivo colunar
+# de cada vez e os outros esperam e leem o que ele publicou. Sem fcntl (Windows) não trava.
+@contextlib.contextmanager
+def _trava(pasta):
+    os.makedirs(pasta, exist_ok=True)
+    with open(os.path.join(pasta, '.trava'), 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# grava o meta.json de uma vez (arquivo temporário renomeado): quem lê vê o antigo ou o novo
+def _publicar_meta(pasta, meta):
+    temp = nome_temporario(os.path.join(pasta, 'meta.json'))
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(temp, os.path.join(pasta, 'meta.json'))
+
+
+# Publica as colunas gravadas em `temp` como colunas/<nome> e aponta o meta.json para elas.
+# Se outro processo já publicou a mesma versão (a pasta existe), usa a dele. As pastas de
+# colunas de outras versões são apagadas: quem ainda as tem mapeadas continua lendo.
+def publicar_colunar(pasta, temp, nome, meta):
+    destino = os.path.join(pasta, 'colunas', nome)
+    try:
+        os.replace(temp, destino)
+    except OSError:
+        shutil.rmtree(temp, ignore_errors=True)
+        publicado = ler_meta(pasta)
+        if publicado is not None and publicado == meta:
+            return publicado
+    _publicar_meta(pasta, meta)
+    for antiga in os.listdir(os.path.join(pasta, 'colunas')):
+        if antiga != nome and not antiga.endswith('.tmp'):
+            shutil.rmtree(os.path.join(pasta, 'colunas', antiga), ignore_errors=True)
+    return meta
+
+
+# Pasta temporária para os arquivos das colunas de uma versão, e o nome com que será publicada
+def nova_pasta_colunas(pasta, versao):
+    nome = _hash(versao)
+    temp = nome_temporario(os.path.join(pasta, 'colunas', nome))
+    os.makedirs(temp)
+    return temp, nome
+
+
+# Jogos (ano, temporada) presentes nas linhas; ficam no meta.json para validar anexos sem ler os dados
+def jogos_das_linhas(df):
+    pares = df[['Ano', 'Season']].dropna().drop_duplicates()
+    return sorted([int(ano), str(temporada)] for ano, temporada in pares.itertuples(index=False))
+
+
+# grava cada coluna em um .bin; categorias e metadados vão para o meta.json (veja FORMATO_COLUNAR)
+def salvar_colunar(df, pasta, versao):
+    temp, nome = nova_pasta_colunas(pasta, versao)
+    meta = {'formato': FORMATO_COLUNAR, 'versao': versao, 'linhas': len(df), 'jogos': jogos_das_linhas(df),
+            'colunas': []}
+    for i, coluna in enumerate(df.columns):
+        serie = df[coluna]
+        info = {'nome': coluna, 'arquivo': f'colunas/{nome}/{i}.bin'}
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            info['categorias'] = serie.cat.categories.tolist()
+            valores = serie.cat.codes.to_numpy()
+        else:
+            valores = serie.to_numpy()
+        info['dtype'] = valores.dtype.str
+        valores.tofile(os.path.join(temp, f'{i}.bin'))
+        meta['colunas'].append(info)
+    meta = publicar_colunar(pasta, temp, nome, meta)
+    _podar_derivados(pasta, [meta['versao']])
+    return meta
+
+
+def ler_meta(pasta):
+    try:
+        with open(os.path.join(pasta, 'meta.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# Monta o DataFrame mapeando os .bin na memória (somente leitura), sem cópias: as páginas dos
+# arquivos ficam no cache do sistema e são compartilhadas por todos os processos do app.
+# Só as `linhas` do meta.json são mapeadas, mesmo que o arquivo já tenha crescido.
+def ler_colunar(pasta, meta):
+    colunas = {}
+    for info in meta['colunas']:
+        dtype = np.dtype(info['dtype'])
+        if meta['linhas']:
+            valores = np.memmap(os.path.join(pasta, info['arquivo']), dtype=dtype, mode='r',
+                                shape=(meta['linhas'],)).view(np.ndarray)
+        else:
+            valores = np.empty(0, dtype=dtype)
+        if 'categorias' in info:
+            categorias = pd.Index(info['categorias'])
+            # anexar põe as categorias novas no fim; os códigos são traduzidos para a ordem
+            # ordenada (uma cópia só dessas colunas, até o arquivo ser refeito)
+            if not categorias.is_monotonic_increasing:
+                ordem = categorias.argsort()
+                posicao = np.empty(len(ordem) + 1, dtype=valores.dtype)
+                posicao[ordem] = np.arange(len(ordem))
+                posicao[-1] = -1
+                valores, categorias = posicao[valores], categorias[ordem]
+            # sem validação os códigos não são copiados
+            colunas[info['nome']] = pd.Categorical.from_codes(valores, dtype=pd.CategoricalDtype(categorias),
+                                                              validate=False)
+        else:
+            colunas[info['nome']] = valores
+    return pd.DataFrame(colunas, copy=False)
+
+
+def _atual(meta, versao):
+    return meta is not None and meta.get('formato') == FORMATO_COLUNAR and meta['versao'] == versao
+
+
+# reconstrói o arquivo colunar se ele não existe ou se o CSV mudou; com vários processos, um
+# monta e os outros esperam na trava e leem o que ele publicou
+def construir_colunar(caminho=None):
+    caminho = caminho or CSV_PATH
+    pasta = pasta_cache(caminho)
+    meta = ler_meta(pasta)
+    if not _atual(meta, versao_origem(caminho)):
+        with _trava(pasta):
+            meta = _colunar_atual(caminho, pasta)
+    return pasta, meta
+
+
+# com a trava da pasta
+def _colunar_atual(caminho, pasta):
+    versao = versao_origem(caminho)
+    meta = ler_meta(pasta)
+    if not _atual(meta, versao):
+        meta = salvar_colunar(tipar_colunas(pd.read_csv(caminho)), pasta, versao)
+    return meta
+
+
+# DataFrame único do processo; o CSV só é lido de novo quando muda no disco.
+# O resultado é compartilhado entre sessões e não deve ser alterado.
+def carregar_dados(caminho=None):
+    caminho = caminho or CSV_PATH
+    versao = versao_origem(caminho)
+    atual = _cache.get(caminho)
+    if atual is not None and atual[0] == versao:
+        return atual[1]
+    with _lock:
+        atual = _cache.get(caminho)
+        if atual is None or atual[0] != versao:
+            with etapa('carregar_dados') as e:
+                meta, df = _ler_atual(caminho)
+                novo = (meta['versao'], e.anotar(df))
+            # só vieram linhas novas (anexar): as estruturas derivadas são atualizadas, não refeitas
+            if atual is not None and {'versao': atual[0], 'linhas': len(atual[1])} in meta.get('anteriores', []):
+                _migrar_derivados(caminho, atual, novo)
+            atual = _cache[caminho] = novo
+    return atual[1]
+
+
+# meta.json e DataFrame do arquivo colunar atual. Se outro processo publicou uma versão nova entre
+# a leitura do meta.json e a dos arquivos (e apagou os antigos), lê de novo.
+def _ler_atual(caminho, tentativas=3):
+    for tentativa in range(tentativas):
+        pasta, meta = construir_colunar(caminho)
+        try:
+            return meta, ler_colunar(pasta, meta)
+        except FileNotFoundError:
+            if tentativa == tentativas - 1:
+                raise
+
+
+# versão dos dados carregados (arquivo, mtime e tamanho), usada como chave para caches derivados;
+# no modo em blocos é a do próprio CSV, sem carregá-lo
+def versao_dados(caminho=None):
+    caminho = caminho or CSV_PATH
+    if BLOCOS:
+        return (caminho,) + tuple(versao_origem(caminho))
+    carregar_dados(caminho)
+    return (caminho,) + tuple(_cache[caminho][0])
+
+
+# troca o CSV padrão usado pelo app (benchmarks, testes de carga)
+def usar_csv(caminho):
+    global CSV_PATH
+    CSV_PATH = caminho
+
+
+# liga (linhas > 0) ou desliga (0) o modo em blocos
+def usar_blocos(linhas):
+    global BLOCOS
+    BLOCOS = linhas
+
+
+# Estruturas derivadas (matrizes, cubos, índices) ficam em memória por processo,
+# amarradas à versão dos dados: quando o CSV muda, as antigas são descartadas.
+# Também são gravadas ao lado do arquivo colunar (veja _persistir) e mapeadas dali, então
+# outros processos do app usam a mesma cópia em vez de refazê-las.
+# No modo em blocos os dados não são carregados: a estrutura vem de em_blocos(caminho) ou,
+# se ela não depende dos dados carregados (índices de outras estruturas), de construir(None).
+_derivados = {}
+
+
+def derivado(chave, construir, caminho=None, em_blocos=None):
+    caminho = caminho or CSV_PATH
+    versao = versao_dados(caminho)
+    completa = (caminho, versao, chave)
+    if completa in _derivados:
+        return _derivados[completa]
+    with _lock:
+        if completa not in _derivados:
+            for antiga in [k for k in _derivados if k[0] == caminho and k[1] != versao]:
+                del _derivados[antiga]
+            with etapa(f'derivado {_nome(chave)}') as e:
+                pasta = pasta_derivado(caminho, versao, chave)
+                valor = ler_derivado(pasta, versao)
+                e.anotar(em_disco=valor is not None)
+                if valor is None and not BLOCOS:
+                    valor = _atualizar_do_disco(caminho, versao, chave)
+                    if valor is not None:
+                        valor = _persistir(pasta, versao, valor)
+                if valor is None:
+                    if BLOCOS and em_blocos is not None:
+                        valor = em_blocos(caminho)
+                    else:
+                        valor = construir(None if BLOCOS else carregar_dados(caminho))
+                    valor = _persistir(pasta, versao, valor)
+                _derivados[completa] = valor
+    return _derivados[completa]
+
+
+def _nome(chave):
+    return chave if isinstance(chave, str) else chave[0]
+
+
+# Pasta de uma estrutura derivada gravada; o nome depende da chave e da versão dos dados
+def pasta_derivado(caminho, versao, chave):
+    return os.path.join(pasta_cache(caminho), 'derivados', _hash((versao, chave)))
+
+
+# Apaga as estruturas derivadas gravadas para versões do CSV fora de `versoes` (as que ainda podem
+# ser lidas: a atual e as anteriores às quais só foram anexadas linhas)
+def _podar_derivados(pasta, versoes):
+    raiz = os.path.join(pasta, 'derivados')
+    if not os.path.isdir(raiz):
+        return
+    for nome in os.listdir(raiz):
+        meta = ler_meta(os.path.join(raiz, nome))
+        if meta is not None and meta['versao'][1:] not in versoes:
+            shutil.rmtree(os.path.join(raiz, nome), ignore_errors=True)
+
+
+# Descreve a estrutura em JSON; os vetores numéricos vão para `vetores` como (início, vetor).
+# Tipos sem representação aqui levantam TypeError e a estrutura só fica em memória.
+def _descrever(valor, vetores):
+    if isinstance(valor, pd.DataFrame):
+        indice = valor.index
+        if not isinstance(indice, pd.RangeIndex) or indice.start != 0 or indice.step != 1:
+            raise TypeError('índice não suportado')
+        return {'tipo': 'tabela', 'linhas': len(valor),
+                'colunas': [[coluna, _descrever(valor[coluna].array, vetores)] for coluna in valor.columns]}
+    if isinstance(valor, pd.Categorical):
+        return {'tipo': 'categorica', 'categorias': _descrever(valor.categories, vetores),
+                'ordenada': bool(valor.ordered), 'codigos': _descrever(valor.codes, vetores)}
+    if isinstance(valor, pd.Index):
+        return {'tipo': 'indice', 'dtype': str(valor.dtype), 'valores': valor.tolist()}
+    if isinstance(valor, pd.api.extensions.ExtensionArray):
+        valor = valor.to_numpy()
+    if isinstance(valor, np.ndarray):
+        if valor.dtype.kind not in 'biuf':
+            raise TypeError(f'vetor {valor.dtype} não suportado')
+        inicio = 0
+        if vetores:
+            anterior, vetor = vetores[-1]
+            inicio = -(-(anterior + vetor.nbytes) // ALINHAMENTO) * ALINHAMENTO
+        vetores.append((inicio, np.ascontiguousarray(valor)))
+        return {'tipo': 'vetor', 'dtype': valor.dtype.str, 'forma': list(valor.shape), 'inicio': inicio}
+    if isinstance(valor, dict):
+        if not all(isinstance(k, (str, int, float)) for k in valor):
+            raise TypeError('chave não suportada')
+        return {'tipo': 'dicionario', 'itens': [[k, _descrever(v, vetores)] for k, v in valor.items()]}
+    if isinstance(valor, (list, tuple)):
+        return {'tipo': type(valor).__name__, 'itens': [_descrever(v, vetores) for v in valor]}
+    if valor is None or isinstance(valor, (str, int, float)):
+        return {'tipo': 'valor', 'valor': valor}
+    raise TypeError(f'{type(valor).__name__} não suportado')
+
+
+# Refaz a estrutura descrita; os vetores são fatias (somente leitura) do arquivo mapeado
+def _montar(descricao, buffer):
+    tipo = descricao['tipo']
+    if tipo == 'tabela':
+        colunas = {nome: _montar(coluna, buffer) for nome, coluna in descricao['colunas']}
+        return pd.DataFrame(colunas, index=pd.RangeIndex(descricao['linhas']), copy=False)
+    if tipo == 'categorica':
+        dtype = pd.CategoricalDtype(_montar(descricao['categorias'], buffer), ordered=descricao['ordenada'])
+        return pd.Categorical.from_codes(_montar(descricao['codigos'], buffer), dtype=dtype, validate=False)
+    if tipo == 'indice':
+        return pd.Index(descricao['valores'], dtype=descricao['dtype'])
+    if tipo == 'vetor':
+        dtype = np.dtype(descricao['dtype'])
+        forma = tuple(descricao['forma'])
+        inicio = descricao['inicio']
+        return buffer[inicio:inicio + int(np.prod(forma)) * dtype.itemsize].view(dtype).reshape(forma)
+    if tipo == 'dicionario':
+        return {chave: _montar(valor, buffer) for chave, valor in descricao['itens']}
+    if tipo in ('list', 'tuple'):
+        itens = [_montar(item, buffer) for item in descricao['itens']]
+        return itens if tipo == 'list' else tuple(itens)
+    return descricao['valor']
+
+
+# Estrutura derivada gravada para esta versão dos dados, ou None
+def ler_derivado(pasta, versao):
+    meta = ler_meta(pasta)
+    if meta is None or meta['versao'] != list(versao):
+        return None
+    arquivo = os.path.join(pasta, 'dados.bin')
+    try:
+        if os.path.getsize(arquivo):
+            buffer = np.memmap(arquivo, dtype=np.uint8, mode='r').view(np.ndarray)
+        else:
+            buffer = np.empty(0, dtype=np.uint8)
+        return _montar(meta['estrutura'], buffer)
+    except (OSError, ValueError):
+        return None
+
+
+# Grava a estrutura (em uma pasta temporária, que depois é renomeada) e devolve a versão mapeada
+# do disco. Se outro processo gravou antes, usa a dele; se não der para gravar, fica a da memória.
+def _persistir(pasta, versao, valor):
+    vetores = []
+    try:
+        meta = {'versao': list(versao), 'estrutura': _descrever(valor, vetores)}
+    except TypeError:
+        return valor
+    temp = nome_temporario(pasta)
+    try:
+        os.makedirs(temp)
+        with open(os.path.join(temp, 'dados.bin'), 'wb') as f:
+            for inicio, vetor in vetores:
+                f.write(b'\0' * (inicio - f.tell()))
+                f.write(memoryview(vetor).cast('B'))
+        with open(os.path.join(temp, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(temp, pasta)
+    except OSError:
+        shutil.rmtree(temp, ignore_errors=True)
+    mapeado = ler_derivado(pasta, versao)
+    return valor if mapeado is None else mapeado
+
+
+# Funções que atualizam uma estrutura derivada quando linhas são anexadas aos dados:
+# atualizar(chave, valor, antigo, novo) recebe os DataFrames antes e depois (as primeiras
+# linhas de novo são as de antigo) e devolve o valor novo, ou None para refazê-lo do zero.
+_atualizadores = {}
+
+
+def atualizacao_incremental(nome, atualizar):
+    _atualizadores[nome] = atualizar
+
+
+def _migrar_derivados(caminho, atual, novo):
+    versao_antiga = (caminho,) + tuple(atual[0])
+    versao_nova = (caminho,) + tuple(novo[0])
+    for completa in [k for k in _derivados if k[0] == caminho and k[1] == versao_antiga]:
+        valor = _derivados.pop(completa)
+        chave = completa[2]
+        atualizar = _atualizadores.get(_nome(chave))
+        if atualizar is None:
+            continue
+        with etapa(f'atualizar {_nome(chave)}'):
+            valor = atualizar(chave, valor, atual[1], novo[1])
+        if valor is not None:
+            _derivados[(caminho, versao_nova, chave)] = _persistir(pasta_derivado(caminho, versao_nova, chave), versao_nova, valor)
+
+
+# Estrutura que não está gravada para a versão atual, mas sim para uma versão anterior da qual os
+# dados só ganharam linhas (anteriores no meta.json): é atualizada com as linhas novas em vez de
+# refeita, também por processos que não tinham a versão anterior carregada. None se não houver.
+def _atualizar_do_disco(caminho, versao, chave):
+    atualizar = _atualizadores.get(_nome(chave))
+    meta = ler_meta(pasta_cache(caminho))
+    if atualizar is None or meta is None or meta['versao'] != list(versao[1:]):
+        return None
+    for anterior in reversed(meta.get('anteriores', [])):
+        versao_antiga = (caminho,) + tuple(anterior['versao'])
+        valor = ler_derivado(pasta_derivado(caminho, versao_antiga, chave), versao_antiga)
+        if valor is not None:
+            df = carregar_dados(caminho)
+            with etapa(f'atualizar {_nome(chave)}'):
+                return atualizar(chave, valor, df.iloc[:anterior['linhas']], df)
+    return None
+
+
+# Menor tipo de código que comporta `n` categorias (o -1 das linhas vazias incluído)
+def _tipo_codigos(n):
+    return np.min_scalar_type(-max(n, 1))
+
+
+# Acrescenta as linhas novas ao fim do .bin de uma coluna (o que passar das `linhas` do meta.json
+# sobrou de um anexo interrompido e é descartado). Se os códigos de uma coluna categórica não
+# cabem mais no tipo dela, só essa coluna é regravada, em um arquivo novo.
+def _anexar_coluna(pasta, info, linhas, novas):
+    info = dict(info)
+    dtype = np.dtype(info['dtype'])
+    if 'categorias' in info:
+        valores = pd.Series(novas, copy=False).astype(object)
+        conhecidas = pd.Index(info['categorias'])
+        extras = pd.Index(valores.dropna().unique()).difference(conhecidas)
+        info['categorias'] = info['categorias'] + extras.tolist()
+        valores = pd.Index(info['categorias']).get_indexer(valores)
+        tipo = _tipo_codigos(len(info['categorias']))
+        if tipo.itemsize > dtype.itemsize:
+            antigo = os.path.join(pasta, info['arquivo'])
+            info['arquivo'] = f'{os.path.splitext(info["arquivo"])[0]}.{linhas}.bin'
+            np.fromfile(antigo, dtype=dtype, count=linhas).astype(tipo).tofile(os.path.join(pasta, info['arquivo']))
+            info['dtype'], dtype = tipo.str, tipo
+    else:
+        valores = np.asarray(novas)
+    with open(os.path.join(pasta, info['arquivo']), 'r+b') as f:
+        f.truncate(linhas * dtype.itemsize)
+        f.seek(0, os.SEEK_END)
+        f.write(np.ascontiguousarray(valores, dtype=dtype).tobytes())
+    return info
+
+
+# Acrescenta linhas (no formato do CSV) ao CSV e ao arquivo colunar sem ler nem regravar os dados
+# já existentes: os valores novos vão para o fim dos .bin de cada coluna e as categorias novas para
+# o fim das listas do meta.json. O meta.json publicado por último aponta o novo número de linhas e
+# guarda as últimas versões anteriores; quem tem uma delas carregada, ou gravada em derivados/,
+# só atualiza as estruturas derivadas (veja atualizacao_incremental). verificar(meta), se dado,
+# roda com a trava, sobre o meta que vai ser estendido, e recusa as linhas levantando uma exceção.
+def anexar(linhas, caminho=None, verificar=None):
+    caminho = caminho or CSV_PATH
+    pasta = pasta_cache(caminho)
+    with _lock, _trava(pasta):
+        meta = _colunar_atual(caminho, pasta)
+        if verificar is not None:
+            verificar(meta)
+        novas = tipar_colunas(linhas)
+        colunas = [_anexar_coluna(pasta, info, meta['linhas'], novas[info['nome']]) for info in meta['colunas']]
+        with open(caminho, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+        linhas.to_csv(caminho, mode='a', header=False, index=False)
+        anteriores = meta.get('anteriores', [])[-(MAX_ANTERIORES - 1):]
+        _publicar_meta(pasta, dict(
+            meta, versao=versao_origem(caminho), linhas=meta['linhas'] + len(linhas), colunas=colunas,
+            jogos=sorted(meta['jogos'] + [j for j in jogos_das_linhas(novas) if j not in meta['jogos']]),
+            anteriores=anteriores + [{'versao': meta['versao'], 'linhas': meta['linhas']}]))
+    return len(linhas)
+
+
+# Esquece as estruturas derivadas do processo; em_disco também apaga as gravadas do CSV
+def limpar_derivados(caminho=None, em_disco=False):
+    with _lock:
+        _derivados.clear()
+        if em_disco:
+            shutil.rmtree(os.path.join(pasta_cache(caminho), 'derivados'), ignore_errors=True)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from olimpiadas.blocos import agregar_df, juntar, tabela_agregada, tabela_em_blocos
+from olimpiadas.cache import memoizar
+from olimpiadas.cubo import SEM_MEDALHA, cubo_medalhas, rotulos
+from olimpiadas.dados import atualizacao_incremental, derivado
+
+# Tabelas de dimensão dos seletores das páginas. Os dados guardam só os códigos das categorias de
+# cada coluna; aqui ficam, uma vez por versão dos dados, os valores distintos (ordenados) de
+# temporada, esporte, país, NOC, ano e evento, os pares (NOC, País) e os valores com medalha.
+# Saem do cubo e da tabela de eventos, sem passar pelas linhas dos atletas.
+CHAVES_EVENTOS = ['Esporte', 'Event']
+
+
+# Combinações esporte × evento presentes nos dados
+def eventos_por_esporte():
+    return derivado('eventos_por_esporte', lambda df: agregar_df(df, CHAVES_EVENTOS),
+                    em_blocos=lambda caminho: tabela_em_blocos('eventos_por_esporte', caminho))
+
+
+def atualizar_eventos(chave, tabela, antigo, novo):
+    return juntar([tabela, agregar_df(novo.iloc[len(antigo):], CHAVES_EVENTOS)], CHAVES_EVENTOS)
+
+
+atualizacao_incremental('eventos_por_esporte', atualizar_eventos)
+tabela_agregada('eventos_por_esporte', CHAVES_EVENTOS)
+
+
+def construir_dimensoes(cubo, eventos):
+    contagem = cubo['contagem']
+    # linhas com medalha por esporte e por par (NOC, País)
+    com_medalha = contagem[..., :SEM_MEDALHA].sum(axis=-1, dtype=np.int64)
+    por_esporte = com_medalha.sum(axis=(0, 1, 3, 4))
+    por_par = com_medalha.sum(axis=(0, 1, 2, 4))
+    eventos = eventos.dropna().sort_values('Event', kind='stable').drop_duplicates('Event')
+    return {
+        'temporadas': cubo['temporadas'],
+        'esportes': cubo['esportes'],
+        'esportes_com_medalha': cubo['esportes'][por_esporte > 0],
+        'paises': cubo['paises'][np.unique(cubo['pais_do_par'])],
+        'paises_com_medalha': cubo['paises'][np.unique(cubo['pais_do_par'][por_par > 0])],
+        'nocs': cubo['nocs'][np.unique(cubo['noc_do_par'])],
+        'anos': cubo['anos'],
+        'pares': pd.DataFrame({
+            'País': rotulos(cubo['pais_do_par'], cubo['paises']),
+            'NOC': rotulos(cubo['noc_do_par'], cubo['nocs']),
+        }),
+        'eventos': pd.Index(eventos['Event'].astype(object)),
+        'esporte_do_evento': cubo['esportes'].get_indexer(eventos['Esporte'].astype(object)),
+    }
+
+
+def dimensoes():
+    return derivado('dimensoes', lambda _: construir_dimensoes(cubo_medalhas(), eventos_por_esporte()))
+
+
+# Opções (ordenadas) de um seletor: 'esportes', 'paises', 'anos', 'esportes_com_medalha', ...
+# A lista é compartilhada entre sessões e não deve ser alterada.
+@memoizar
+def opcoes(dimensao):
+    return dimensoes()[dimensao].tolist()
+
+
+# Pares (País, NOC) dos dados, no lugar de df[['País', 'NOC']].drop_duplicates()
+def paises_e_nocs():
+    return dimensoes()['pares']
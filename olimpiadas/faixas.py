@@ -0,0 +1,81 @@
+import numpy as np
+
+from olimpiadas.blocos import pesos, tabela_agregada, tabela_em_blocos
+from olimpiadas.cache import memoizar
+from olimpiadas.cubo import reduzir, valores_filtro
+from olimpiadas.dados import atualizacao_incremental, derivado
+
+# Faixas etárias de 5 anos, fechadas à direita: (10, 15], (15, 20], ..., (65, 70]
+BORDAS = np.arange(10, 75, 5)
+ROTULOS = [f'{a} a {b}' for a, b in zip(BORDAS[:-1], BORDAS[1:])]
+# Medalhas na ordem das barras empilhadas
+MEDALHAS = ['Bronze', 'Silver', 'Gold']
+EIXOS = ('Season', 'Gênero', 'Esporte')
+# Colunas da tabela agregada usada no modo em blocos (só linhas com medalha)
+CHAVES = list(EIXOS) + ['Idade', 'Medalha']
+
+
+# Contagens temporada × gênero × esporte × faixa etária × medalha das linhas com medalha e
+# idade dentro das faixas, em uma passada (bincount)
+def _contar(df, forma):
+    codigos = [df[coluna].cat.codes.to_numpy() for coluna in EIXOS]
+    # posição da idade nas bordas; fora das faixas (ou sem idade) fica fora de 0..11
+    faixa = np.searchsorted(BORDAS, df['Idade'].to_numpy(), side='left') - 1
+    categorias = df['Medalha'].cat.categories
+    tabela = np.array([MEDALHAS.index(c) if c in MEDALHAS else -1 for c in categorias] + [-1])
+    medalha = tabela[df['Medalha'].cat.codes.to_numpy()]
+
+    validos = (faixa >= 0) & (faixa < len(ROTULOS)) & (medalha >= 0)
+    for c in codigos:
+        validos &= c >= 0
+    indice = np.ravel_multi_index([c[validos] for c in codigos] + [faixa[validos], medalha[validos]], forma)
+    peso = pesos(df)
+    peso = None if peso is None else peso[validos]
+    return np.bincount(indice, weights=peso, minlength=int(np.prod(forma))).astype(np.int64).reshape(forma)
+
+
+def _forma(df):
+    return tuple(len(df[c].cat.categories) for c in EIXOS) + (len(ROTULOS), len(MEDALHAS))
+
+
+def construir_faixas(df):
+    return {
+        'contagem': _contar(df, _forma(df)),
+        'temporadas': df['Season'].cat.categories,
+        'generos': df['Gênero'].cat.categories,
+        'esportes': df['Esporte'].cat.categories,
+    }
+
+
+# Soma só as linhas anexadas (dados.anexar), levando as contagens antigas para as posições das
+# categorias novas
+def atualizar_faixas(chave, faixas, antigo, novo):
+    forma = _forma(novo)
+    contagem = _contar(novo.iloc[len(antigo):], forma)
+    mapas = [novo[c].cat.categories.get_indexer(faixas[k]) for c, k in zip(EIXOS, ('temporadas', 'generos', 'esportes'))]
+    contagem[np.ix_(*mapas)] += faixas['contagem']
+    return {
+        'contagem': contagem,
+        'temporadas': novo['Season'].cat.categories,
+        'generos': novo['Gênero'].cat.categories,
+        'esportes': novo['Esporte'].cat.categories,
+    }
+
+
+def faixas_etarias():
+    return derivado('faixas_etarias', construir_faixas,
+                    em_blocos=lambda caminho: construir_faixas(tabela_em_blocos('faixas_etarias', caminho)))
+
+
+atualizacao_incremental('faixas_etarias', atualizar_faixas)
+tabela_agregada('faixas_etarias', CHAVES, filtrar=lambda df: df['Medalha'].notna())
+
+
+# Contagens faixa etária × medalha (12 × 3) do recorte
+@memoizar
+def medalhas_por_faixa(season, gender, sport='Todos'):
+    faixas = faixas_etarias()
+    temporada, genero, esporte = valores_filtro(season, gender, sport)
+    contagem = reduzir(faixas['contagem'], faixas['temporadas'], temporada)
+    contagem = reduzir(contagem, faixas['generos'], genero)
+    return reduzir(contagem, faixas['esportes'], esporte)
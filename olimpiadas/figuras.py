@@ -0,0 +1,95 @@
+import json
+import os
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from olimpiadas import loja
+from olimpiadas.cache import CacheLRU, resultados
+from olimpiadas.codificacao import codificar
+from olimpiadas.dados import versao_dados
+from olimpiadas.tempos import etapa
+
+# Orçamento de memória do cache de figuras, em MB (variável de ambiente OLIMPIADAS_FIGURAS_MB)
+LIMITE_MB = float(os.environ.get('OLIMPIADAS_FIGURAS_MB', 128))
+
+# JSON das figuras prontas, por página, gráfico e filtros; compartilhado entre as sessões
+figuras = CacheLRU(int(LIMITE_MB * 1024 * 1024))
+
+
+# Sufixo dos títulos com os filtros ativos, na ordem usada em todas as páginas
+def titulo(base, season='Ambas', gender='Ambos', sport='Todos'):
+    if season != 'Ambas':
+        base += f' - Jogos de {season}'
+    if sport not in ('Todos', []):
+        base += f' - {sport}'
+    if gender != 'Ambos':
+        base += f' - {gender}'
+    return base
+
+
+# listas viram tuplas na chave; a ordem é mantida porque aparece nos títulos
+def _congelar(valor):
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+
+def chave_figura(pagina, grafico, filtros):
+    return (pagina, grafico, tuple(sorted((k, _congelar(v)) for k, v in filtros.items())))
+
+
+# JSON da figura para a combinação de filtros, guardado no cache de figuras do processo; só chama
+# construir(**filtros) na primeira vez, e nem isso se o lote já deixou a figura pronta na loja em disco.
+# A figura sai na codificação compacta (veja codificacao.py): buffers binários, quadros sem o que
+# não muda entre eles e orjson.
+def figura_json(pagina, grafico, construir, **filtros):
+    chave = chave_figura(pagina, grafico, filtros)
+    versao = versao_dados()
+
+    def calcular():
+        spec = loja.ler_figura(chave, versao)
+        if spec is not None:
+            return spec
+        with etapa('construir'):
+            figura = construir(**filtros)
+        with etapa('serializar') as e:
+            spec = codificar(figura)
+            e.anotar(bytes=len(spec))
+        if loja.GRAVAR:
+            loja.gravar_figura(chave, spec, versao)
+        return spec
+
+    with etapa(f'figura {pagina}/{grafico}'):
+        return figuras.obter(chave, calcular, versao)
+
+
+# Tabela de uma página para os filtros, do cache de resultados, da loja ou de construir(**filtros).
+# O resultado é compartilhado entre sessões e não deve ser alterado.
+def tabela_pronta(pagina, nome, construir, **filtros):
+    chave = chave_figura(pagina, nome, filtros)
+    versao = versao_dados()
+
+    def calcular():
+        tabela = loja.ler_tabela(chave, versao)
+        if tabela is None:
+            tabela = construir(**filtros)
+            if loja.GRAVAR:
+                loja.gravar_tabela(chave, tabela, versao)
+        return tabela
+
+    with etapa(f'tabela {pagina}/{nome}') as e:
+        return e.anotar(resultados.obter(('tabela',) + chave, calcular, versao))
+
+
+# Envia o JSON guardado para o navegador sem reconstruir nem revalidar a figura no plotly
+def mostrar_figura(spec):
+    with etapa('enviar figura') as e:
+        e.anotar(bytes=len(spec))
+        st.plotly_chart(go.Figure(json.loads(spec), _validate=False))
+
+
+# Monta e guarda as figuras de uma lista de combinações de filtros antes de alguém pedir
+def preaquecer(pagina, grafico, construir, combinacoes):
+    for filtros in combinacoes:
+        figura_json(pagina, grafico, construir, **filtros)
@@ -0,0 +1,92 @@
+import numpy as np
+
+from olimpiadas.dados import GENEROS, TEMPORADAS, atualizacao_incremental, derivado
+
+
+# valores distintos da coluna e o código de cada linha
+def _valores(serie):
+    if hasattr(serie, 'cat'):
+        return serie.cat.categories.tolist(), serie.cat.codes.to_numpy()
+    valores, codigos = np.unique(serie.to_numpy(), return_inverse=True)
+    return valores.tolist(), codigos
+
+
+# Um bitmap (1 bit por linha, em palavras de 64 bits) para cada valor distinto da coluna.
+# tabela identifica o DataFrame no cache ("atletas" é o carregado por dados.carregar_dados).
+def bitmaps(df, coluna, tabela='atletas'):
+    def construir(_):
+        valores, codigos = _valores(df[coluna])
+        # completa com zeros até um múltiplo de 64 bits
+        tamanho = -(-len(df) // 64) * 64
+        mapa = {}
+        for codigo, valor in enumerate(valores):
+            bits = np.zeros(tamanho, dtype=bool)
+            bits[:len(df)] = codigos == codigo
+            mapa[valor] = np.packbits(bits).view(np.uint64)
+        return mapa
+    return derivado(('bitmaps', tabela, coluna), construir)
+
+
+# Estende os bitmaps dos atletas com as linhas anexadas (dados.anexar); os de outras tabelas
+# são refeitos quando pedidos
+def atualizar_bitmaps(chave, mapa, antigo, novo):
+    _, tabela, coluna = chave
+    if tabela != 'atletas':
+        return None
+    palavras = -(-len(novo) // 64)
+    estendido = {}
+    for valor, bits in mapa.items():
+        estendido[valor] = np.zeros(palavras, dtype=np.uint64)
+        estendido[valor][:len(bits)] = bits
+    valores, codigos = _valores(novo[coluna].iloc[len(antigo):])
+    for codigo, valor in enumerate(valores):
+        linhas = len(antigo) + np.flatnonzero(codigos == codigo)
+        if len(linhas) == 0:
+            continue
+        bits = estendido.setdefault(valor, np.zeros(palavras, dtype=np.uint64)).view(np.uint8)
+        # mesma ordem de bits do np.packbits: a primeira linha de cada byte é o bit mais alto
+        np.bitwise_or.at(bits, linhas // 8, (128 >> (linhas % 8)).astype(np.uint8))
+    return estendido
+
+
+atualizacao_incremental('bitmaps', atualizar_bitmaps)
+
+
+# Posições das linhas que atendem a todos os filtros (E entre colunas, OU entre valores).
+# Cada filtro é um valor, uma lista de valores ou None para não filtrar a coluna.
+def selecionar(df, tabela='atletas', **filtros):
+    palavras = -(-len(df) // 64)
+    resultado = None
+    for coluna, valores in filtros.items():
+        if valores is None:
+            continue
+        if not isinstance(valores, (list, tuple, set)):
+            valores = [valores]
+        mapa = bitmaps(df, coluna, tabela)
+        coluna_ok = np.zeros(palavras, dtype=np.uint64)
+        for valor in valores:
+            if valor in mapa:
+                coluna_ok |= mapa[valor]
+        resultado = coluna_ok if resultado is None else resultado & coluna_ok
+    if resultado is None:
+        return np.arange(len(df))
+    bits = np.unpackbits(resultado.view(np.uint8), count=len(df))
+    return np.flatnonzero(bits)
+
+
+# Filtros dos seletores das páginas ("Ambas", "Ambos", "Todos" e listas vazias não filtram)
+def filtros_pagina(season='Ambas', gender='Ambos', sport='Todos', country=None, year=None):
+    return {
+        'Season': TEMPORADAS.get(season),
+        'Gênero': GENEROS.get(gender),
+        'Esporte': None if sport in ('Todos', []) else sport,
+        'País': country or None,
+        'Ano': year or None,
+    }
+
+
+# Materializa só as linhas selecionadas; sem filtro devolve o próprio DataFrame (somente leitura)
+def recortar(df, linhas):
+    if len(linhas) == len(df):
+        return df
+    return df.take(linhas)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from olimpiadas.blocos import pesos, tabela_agregada, tabela_em_blocos
+from olimpiadas.dados import atualizacao_incremental, derivado
+
+COLUNAS = ['ID', 'Nome', 'Gênero', 'NOC', 'País', 'Ano', 'Season', 'Esporte']
+
+
+# Medalhas acumuladas de cada atleta ao fim de cada participação (ID, Ano, temporada,
+# esporte, país), calculadas com uma ordenação e somas acumuladas por ID.
+# Também aceita a tabela agregada do modo em blocos (cada linha vale "linhas" medalhas).
+def construir_historico(df):
+    medalha = df['Medalha']
+    com_medalha = medalha.notna().to_numpy()
+    historico = df.loc[com_medalha, COLUNAS].reset_index(drop=True)
+    medalha = medalha[com_medalha].to_numpy()
+    peso = pesos(df)
+    peso = np.int16(1) if peso is None else peso[com_medalha].astype(np.int16)
+
+    # Jogos de Inverno acontecem antes dos de Verão no mesmo ano
+    inverno_primeiro = (historico['Season'] != 'Winter').to_numpy()
+    ordem = np.lexsort((
+        historico['País'].cat.codes.to_numpy(),
+        historico['Esporte'].cat.codes.to_numpy(),
+        inverno_primeiro,
+        historico['Ano'].to_numpy(),
+        historico['ID'].to_numpy(),
+    ))
+    historico = historico.take(ordem).reset_index(drop=True)
+    medalha = medalha[ordem]
+    peso = peso if np.ndim(peso) == 0 else peso[ordem]
+
+    contagens = pd.DataFrame({
+        'Bronze': (medalha == 'Bronze').astype(np.int16) * peso,
+        'Silver': (medalha == 'Silver').astype(np.int16) * peso,
+        'Gold': (medalha == 'Gold').astype(np.int16) * peso,
+    })
+    contagens = contagens.groupby(historico['ID'].to_numpy(), sort=False).cumsum()
+    historico[['Bronze', 'Silver', 'Gold']] = contagens.astype(np.int16)
+    historico['Total Medal'] = (historico['Bronze'] * 1 + historico['Silver'] * 2 + historico['Gold'] * 3).astype(np.int16)
+
+    # o valor acumulado de cada participação é o da sua última linha
+    historico = historico.drop_duplicates(subset=['ID', 'Ano', 'Season', 'Esporte', 'País'], keep='last')
+    # categoria ordenada para que o max() por atleta funcione como na coluna de texto
+    historico['Esporte'] = historico['Esporte'].cat.as_ordered()
+    return historico.reset_index(drop=True)
+
+
+# Acrescenta as participações das linhas anexadas (dados.anexar só aceita Jogos posteriores aos
+# já carregados): as somas acumuladas de cada atleta continuam do seu último valor no histórico.
+def atualizar_historico(chave, historico, antigo, novo):
+    if len(historico) == 0:
+        return construir_historico(novo)
+    novas = construir_historico(novo.iloc[len(antigo):])
+    ids = historico['ID'].to_numpy()
+    novos_ids = novas['ID'].to_numpy()
+    ultima = np.searchsorted(ids, novos_ids, side='right') - 1
+    ja_tinha = (ultima >= 0) & (ids[ultima.clip(0)] == novos_ids)
+    for coluna in ('Bronze', 'Silver', 'Gold'):
+        anterior = np.where(ja_tinha, historico[coluna].to_numpy()[ultima.clip(0)], 0)
+        novas[coluna] = (novas[coluna].to_numpy() + anterior).astype(np.int16)
+    novas['Total Medal'] = (novas['Bronze'] * 1 + novas['Silver'] * 2 + novas['Gold'] * 3).astype(np.int16)
+
+    # categorias do histórico antigo passam a ser as dos dados novos
+    historico = historico.assign(**{
+        coluna: historico[coluna].cat.set_categories(novas[coluna].cat.categories)
+        for coluna in historico.columns if isinstance(historico[coluna].dtype, pd.CategoricalDtype)
+    })
+    # cada participação nova entra depois das linhas do mesmo atleta (o histórico é ordenado por ID)
+    ordem = np.insert(np.arange(len(historico)), ultima + 1, len(historico) + np.arange(len(novas)))
+    return pd.concat([historico, novas], ignore_index=True).take(ordem).reset_index(drop=True)
+
+
+# Tabela compartilhada entre as sessões; não deve ser alterada
+def historico_medalhas():
+    return derivado('historico_medalhas', construir_historico,
+                    em_blocos=lambda caminho: construir_historico(tabela_em_blocos('historico_medalhas', caminho)))
+
+
+atualizacao_incremental('historico_medalhas', atualizar_historico)
+tabela_agregada('historico_medalhas', COLUNAS + ['Medalha'], filtrar=lambda df: df['Medalha'].notna())
@@ -0,0 +1,128 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from olimpiadas import dados
+
+# Ingestão de Jogos novos sem refazer tudo:
+#   python -m olimpiadas.ingestao paris_2024.csv
+# O arquivo tem as mesmas colunas do CSV principal. As linhas são validadas e anexadas ao CSV e
+# ao fim do arquivo colunar, sem ler os dados existentes; o app atualiza o cubo, o histórico
+# acumulado e os bitmaps só com elas.
+
+# Colunas que não podem ficar vazias e valores aceitos nas colunas de domínio fixo
+OBRIGATORIAS = ['ID', 'Name', 'Sex', 'NOC', 'Year', 'Season', 'Sport', 'Event']
+DOMINIOS = {
+    'Sex': {'F', 'M'},
+    'Season': {'Summer', 'Winter'},
+    'Medal': {'Gold', 'Silver', 'Bronze'},
+}
+NUMERICAS = ['ID', 'Year', 'Age', 'Height', 'Weight']
+
+
+# Chave cronológica de uma edição: no mesmo ano, Inverno vem antes de Verão
+def ordem_jogos(ano, temporada):
+    return ano * 2 + (temporada != 'Winter')
+
+
+# Lista os problemas das linhas novas em relação ao CSV atual (vazia se estiver tudo certo).
+# Só são aceitos Jogos posteriores a todos os já carregados, para que as medalhas acumuladas
+# por atleta possam continuar de onde pararam. Os dados existentes não são lidos: os Jogos, as
+# categorias e os tipos das colunas vêm do meta.json do arquivo colunar.
+def validar(linhas, caminho=None):
+    caminho = caminho or dados.CSV_PATH
+    problemas = _problemas_colunas(linhas, caminho)
+    if problemas:
+        return problemas
+    _, meta = dados.construir_colunar(caminho)
+    return _problemas_meta(linhas, meta)
+
+
+# colunas do arquivo novo em relação às do CSV
+def _problemas_colunas(linhas, caminho):
+    esperadas = pd.read_csv(caminho, nrows=0).columns.tolist()
+    problemas = []
+    faltando = [c for c in esperadas if c not in linhas.columns]
+    sobrando = [c for c in linhas.columns if c not in esperadas]
+    if faltando:
+        problemas.append(f'colunas faltando: {faltando}')
+    if sobrando:
+        problemas.append(f'colunas desconhecidas: {sobrando}')
+    if problemas:
+        return problemas
+    if len(linhas) == 0:
+        return ['nenhuma linha para anexar']
+    return []
+
+
+# valores das linhas novas em relação ao meta.json dos dados atuais
+def _problemas_meta(linhas, meta):
+    problemas = []
+    colunas = {info['nome']: info for info in meta['colunas']}
+    for coluna in OBRIGATORIAS:
+        vazias = int(linhas[coluna].isna().sum())
+        if vazias:
+            problemas.append(f'{coluna}: {vazias} linhas vazias')
+    for coluna in NUMERICAS:
+        convertida = pd.to_numeric(linhas[coluna], errors='coerce')
+        invalidas = int((convertida.isna() & linhas[coluna].notna()).sum())
+        if invalidas:
+            problemas.append(f'{coluna}: {invalidas} valores não numéricos')
+        elif coluna in ('ID', 'Year') and (convertida.dropna() % 1 != 0).any():
+            problemas.append(f'{coluna}: valores não inteiros')
+        elif coluna in ('ID', 'Year'):
+            limite = np.iinfo(np.dtype(colunas[dados.COLUNAS.get(coluna, coluna)]['dtype']))
+            if ((convertida < limite.min) | (convertida > limite.max)).any():
+                problemas.append(f'{coluna}: valores fora do tipo {limite.dtype} da coluna')
+    for coluna, aceitos in DOMINIOS.items():
+        # mais as categorias que os dados já têm nessa coluna
+        aceitos = aceitos | set(colunas[dados.COLUNAS.get(coluna, coluna)].get('categorias', []))
+        invalidos = sorted(set(linhas[coluna].dropna()) - aceitos)
+        if invalidos:
+            problemas.append(f'{coluna}: valores inválidos {invalidos[:5]}')
+    if problemas:
+        return problemas
+
+    if meta['jogos']:
+        ultima = max(ordem_jogos(ano, temporada) for ano, temporada in meta['jogos'])
+        for ano, temporada in linhas[['Year', 'Season']].drop_duplicates().itertuples(index=False):
+            if ordem_jogos(int(ano), temporada) <= ultima:
+                problemas.append(f'Jogos de {temporada} {int(ano)} não são posteriores aos já carregados')
+    return problemas
+
+
+def _recusar(problemas):
+    if problemas:
+        raise ValueError('linhas recusadas:\n' + '\n'.join(problemas))
+
+
+# Valida e anexa um arquivo (ou DataFrame) com as linhas de um ou mais Jogos novos. A validação
+# contra os dados atuais roda dentro da trava do anexar: duas ingestões dos mesmos Jogos ao mesmo
+# tempo (ou uma ingestão e uma réplica do app) não passam as duas.
+def ingerir(arquivo, caminho=None):
+    caminho = caminho or dados.CSV_PATH
+    linhas = arquivo if isinstance(arquivo, pd.DataFrame) else pd.read_csv(arquivo)
+    _recusar(_problemas_colunas(linhas, caminho))
+    colunas = pd.read_csv(caminho, nrows=0).columns.tolist()
+    return dados.anexar(linhas[colunas], caminho, verificar=lambda meta: _recusar(_problemas_meta(linhas, meta)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Anexa os dados de Jogos novos ao CSV e ao cache colunar')
+    parser.add_argument('arquivos', nargs='+', help='CSVs com as mesmas colunas do principal')
+    parser.add_argument('--csv', default=dados.CSV_PATH)
+    args = parser.parse_args(argv)
+    for arquivo in args.arquivos:
+        try:
+            total = ingerir(arquivo, args.csv)
+        except ValueError as erro:
+            print(f'{arquivo}: {erro}', file=sys.stderr)
+            return 1
+        print(f'{arquivo}: {total} linhas anexadas a {args.csv}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import pickle
+import shutil
+
+from olimpiadas.codificacao import FORMATO
+from olimpiadas.dados import pasta_cache, versao_dados
+
+# Loja em disco com figuras (JSON) e tabelas (pickle) já prontas, gravadas pelo lote
+# (python -m olimpiadas.lote) e servidas pelo app antes de montar qualquer coisa.
+# Fica ao lado do arquivo colunar, em uma pasta por versão dos dados: dados anexados ou um CSV
+# trocado mudam a versão e as figuras antigas deixam de ser usadas; o mesmo vale para uma
+# codificação nova das figuras (codificacao.FORMATO).
+# O app só lê; quem grava é o processo que chamou gravar_na_loja() (o lote e seus processos).
+GRAVAR = False
+
+
+def gravar_na_loja(ligar=True):
+    global GRAVAR
+    GRAVAR = ligar
+
+
+def _hash(valor):
+    return hashlib.sha1(repr(valor).encode('utf-8')).hexdigest()[:16]
+
+
+def pasta_loja(versao=None):
+    versao = versao or versao_dados()
+    return os.path.join(pasta_cache(versao[0]), 'loja', _hash((versao, FORMATO)))
+
+
+# Apaga as pastas da loja de outras versões dos dados ou da codificação (nada mais as lê); só a
+# pasta da versão atual fica em disco
+def podar_loja(versao=None):
+    atual = pasta_loja(versao)
+    raiz = os.path.dirname(atual)
+    try:
+        nomes = os.listdir(raiz)
+    except OSError:
+        return
+    for nome in nomes:
+        if nome != os.path.basename(atual):
+            shutil.rmtree(os.path.join(raiz, nome), ignore_errors=True)
+
+
+# Arquivo de um item (chave como a de figuras.chave_figura) dentro da pasta da versão
+def arquivo_item(chave, extensao, versao=None):
+    return os.path.join(pasta_loja(versao), f'{chave[0]}-{chave[1]}-{_hash(chave)}.{extensao}')
+
+
+def _ler(arquivo, modo):
+    try:
+        with open(arquivo, modo, **({} if 'b' in modo else {'encoding': 'utf-8'})) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+# grava em um arquivo temporário e renomeia: quem lê nunca vê um item pela metade
+def _gravar(arquivo, conteudo):
+    os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+    temp = f'{arquivo}.{os.getpid()}.tmp'
+    with open(temp, 'wb') as f:
+        f.write(conteudo)
+    os.replace(temp, arquivo)
+
+
+# JSON da figura gravado pelo lote, ou None
+def ler_figura(chave, versao=None):
+    return _ler(arquivo_item(chave, 'json', versao), 'r')
+
+
+def gravar_figura(chave, spec, versao=None):
+    _gravar(arquivo_item(chave, 'json', versao), spec.encode('utf-8'))
+
+
+def ler_tabela(chave, versao=None):
+    conteudo = _ler(arquivo_item(chave, 'pkl', versao), 'rb')
+    return None if conteudo is None else pickle.loads(conteudo)
+
+
+def gravar_tabela(chave, tabela, versao=None):
+    _gravar(arquivo_item(chave, 'pkl', versao), pickle.dumps(tabela, protocol=pickle.HIGHEST_PROTOCOL))
@@ -0,0 +1,277 @@
+import argparse
+import html
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import plotly.io as pio
+import plotly.offline
+
+from olimpiadas import dados, loja
+from olimpiadas.dimensoes import opcoes
+from olimpiadas.figuras import chave_figura, figura_json, tabela_pronta
+from olimpiadas.paginas import historico, medalhas, participacao, perfil
+
+# Lote que deixa prontas na loja em disco (olimpiadas.loja) as figuras e tabelas das páginas para
+# cada temporada × gênero × esporte e para os países configurados, usando um processo por núcleo:
+#   python -m olimpiadas.lote
+#   python -m olimpiadas.lote --esportes Judo Natação --paises Brasil Japão
+#   python -m olimpiadas.lote --estatico espelho/   # também exporta um site estático (HTML)
+# O app serve da loja antes de montar qualquer figura; combinações fora do lote são montadas na hora.
+
+PAGINAS = {'medalhas': medalhas, 'participacao': participacao, 'historico': historico, 'perfil': perfil}
+TITULOS = {
+    'medalhas': 'Distribuição de Medalhas',
+    'participacao': 'Análise da Participação nos Jogos',
+    'historico': 'Histórico de medalhistas',
+    'perfil': 'Perfil dos atletas',
+}
+
+# Opções dos seletores das páginas
+TEMPORADAS = ('Ambas', 'Verão', 'Inverno')
+GENEROS = ('Ambos', 'Feminino', 'Masculino')
+EIXOS_Y = ('Altura', 'Idade')
+CONTAGENS = ('Por atleta', 'Por evento')
+# Sem --paises, os países com mais medalhas entram no lote
+PAISES_PADRAO = 10
+
+# As páginas não mostram os gráficos de recortes vazios; o lote também os pula
+VAZIOS = {
+    ('historico', 'linhas'): lambda f: len(historico.filter_data(f['season'], f['gender'], f['sport'], f['country'])) == 0,
+    ('historico', 'barras'): lambda f: len(historico.filter_data(f['season'], f['gender'], f['sport'], f['country'])) == 0,
+    ('participacao', 'barras'): lambda f: len(participacao.filter_part_df(**f)) == 0,
+    ('perfil', 'histograma'): lambda f: len(perfil.filter_data(f['season'], f['gender'], f['sport'])) == 0,
+    ('perfil', 'multiplos'): lambda f: len(perfil.filter_data(sport=f['sport'], country=f['country'], year=f['year'])) == 0,
+    ('perfil', 'boxplot'): lambda f: len(perfil.filter_data(sport=f['sport'], country=f['country'], year=f['year'])) == 0,
+}
+
+
+# Países com mais medalhas em todos os Jogos
+def paises_com_mais_medalhas(n=PAISES_PADRAO):
+    contagem = medalhas.get_medal_count('Ambas', 'Ambos', 'Todos')
+    return contagem.groupby('País', observed=True)['total_medals'].sum().nlargest(n).index.tolist()
+
+
+# Tarefas (página, tipo, nome, filtros) com os filtros exatamente como as páginas os passam para
+# figura_json e tabela_pronta. Os países entram com o esporte "Todos"; o primeiro país da lista
+# (o padrão do seletor do marimekko) entra em todos os recortes. Tarefas do mesmo recorte ficam
+# juntas, para aproveitarem os resultados intermediários do mesmo processo.
+def tarefas(esportes, paises):
+    primeiro_pais = opcoes('paises')[0]
+    lista = []
+    for season in TEMPORADAS:
+        for gender in GENEROS:
+            for sport in ['Todos'] + esportes:
+                recorte = dict(season=season, gender=gender, sport=sport)
+                outros = paises if sport == 'Todos' else []
+                for medals in CONTAGENS:
+                    lista += [
+                        ('medalhas', 'figura', 'mapa', dict(recorte, medals=medals)),
+                        ('medalhas', 'tabela', 'contagem', dict(recorte, medals=medals)),
+                    ]
+                lista += [
+                    ('medalhas', 'tabela', 'detalhes', recorte),
+                    ('participacao', 'figura', 'mapa', recorte),
+                    ('participacao', 'tabela', 'participacoes', recorte),
+                    ('perfil', 'figura', 'histograma', recorte),
+                ]
+                for pais in dict.fromkeys([primeiro_pais] + outros):
+                    for medals in CONTAGENS:
+                        lista.append(('medalhas', 'figura', 'marimekko', dict(recorte, country=pais, medals=medals)))
+                for selecao in [[]] + [[pais] for pais in outros]:
+                    lista.append(('participacao', 'figura', 'barras', dict(recorte, country=selecao)))
+                # seletores de múltipla escolha: nada escolhido ou só um esporte/país
+                escolhidos = [] if sport == 'Todos' else [sport]
+                for selecao in [[]] + ([[pais] for pais in outros] if not escolhidos else []):
+                    filtros = dict(season=season, gender=gender, sport=escolhidos, country=selecao, top=10)
+                    lista += [('historico', 'figura', 'linhas', filtros), ('historico', 'figura', 'barras', filtros)]
+
+    # a segunda parte do perfil não depende de temporada e gênero
+    for sport in [[]] + [[e] for e in esportes]:
+        for country in [[]] + ([[pais] for pais in paises] if not sport else []):
+            for yaxis in EIXOS_Y:
+                filtros = dict(sport=sport, country=country, year=[], yaxis=yaxis)
+                for facet_page in range(len(perfil.facet_pages(**filtros))):
+                    lista.append(('perfil', 'figura', 'multiplos', dict(filtros, facet_page=facet_page)))
+                lista.append(('perfil', 'figura', 'boxplot', dict(filtros, points=False)))
+    return [t for t in lista if not VAZIOS.get(t[::2], lambda f: False)(t[3])]
+
+
+def _iniciar(caminho):
+    dados.usar_csv(caminho)
+    loja.gravar_na_loja()
+
+
+# Monta uma tarefa (e grava o resultado na loja); devolve a tarefa, o tempo e o erro, se houver
+def renderizar(tarefa):
+    pagina, tipo, nome, filtros = tarefa
+    modulo = PAGINAS[pagina]
+    inicio = time.perf_counter()
+    try:
+        if tipo == 'figura':
+            figura_json(pagina, nome, modulo.FIGURAS[nome], **filtros)
+        else:
+            tabela_pronta(pagina, nome, modulo.TABELAS[nome], **filtros)
+    except Exception as erro:
+        return tarefa, time.perf_counter() - inicio, repr(erro)
+    return tarefa, time.perf_counter() - inicio, None
+
+
+# Índice da loja (o que o lote gravou), usado pela exportação estática
+def _arquivo_indice(versao):
+    return os.path.join(loja.pasta_loja(versao), 'indice.json')
+
+
+def ler_indice(versao=None):
+    try:
+        with open(_arquivo_indice(versao or dados.versao_dados()), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def _gravar_indice(versao, feitas):
+    itens = {item['arquivo']: item for item in ler_indice(versao)}
+    for pagina, tipo, nome, filtros in feitas:
+        extensao = 'json' if tipo == 'figura' else 'pkl'
+        arquivo = os.path.basename(loja.arquivo_item(chave_figura(pagina, nome, filtros), extensao, versao))
+        itens[arquivo] = {'pagina': pagina, 'tipo': tipo, 'nome': nome, 'filtros': filtros, 'arquivo': arquivo}
+    os.makedirs(loja.pasta_loja(versao), exist_ok=True)
+    with open(_arquivo_indice(versao), 'w', encoding='utf-8') as f:
+        json.dump(list(itens.values()), f, ensure_ascii=False)
+
+
+# Roda o lote: a primeira tarefa de cada página é montada aqui (o que também monta e grava as
+# estruturas derivadas, que os outros processos só mapeiam) e o resto vai para os processos.
+# Devolve as tarefas feitas e as que falharam, com o erro.
+def rodar(caminho, esportes=None, paises=None, processos=None, refazer=False):
+    dados.usar_csv(caminho)
+    loja.gravar_na_loja()
+    versao = dados.versao_dados(caminho)
+    if refazer:
+        shutil.rmtree(loja.pasta_loja(versao), ignore_errors=True)
+    loja.podar_loja(versao)
+    esportes = opcoes('esportes') if esportes is None else esportes
+    paises = paises_com_mais_medalhas() if paises is None else paises
+    lista = tarefas(esportes, paises)
+    primeiras = {}
+    for tarefa in lista:
+        primeiras.setdefault(tarefa[0], tarefa)
+    resultados = [renderizar(tarefa) for tarefa in primeiras.values()]
+
+    restantes = [t for t in lista if t not in primeiras.values()]
+    processos = processos or os.cpu_count() or 1
+    with ProcessPoolExecutor(processos, initializer=_iniciar, initargs=(caminho,)) as executor:
+        lote = max(1, len(restantes) // (processos * 8))
+        resultados += executor.map(renderizar, restantes, chunksize=lote)
+
+    feitas = [tarefa for tarefa, _, erro in resultados if erro is None]
+    falhas = [(tarefa, erro) for tarefa, _, erro in resultados if erro is not None]
+    _gravar_indice(versao, feitas)
+    return feitas, falhas
+
+
+def _descrever_filtros(filtros):
+    return ' | '.join(f'{k}: {", ".join(map(str, v)) or "Todos" if isinstance(v, list) else v}' for k, v in filtros.items())
+
+
+def _achatar(valor, caminho=()):
+    if isinstance(valor, dict):
+        for chave, item in valor.items():
+            yield from _achatar(item, caminho + (chave,))
+    elif isinstance(valor, (list, tuple)):
+        for i, item in enumerate(valor):
+            yield from _achatar(item, caminho + (i,))
+    else:
+        yield caminho, valor
+
+
+# O tema do Streamlit usa cores provisórias (#000001, #000002, ...) que o navegador troca pelas do
+# tema do app; no site estático elas viram as do tema padrão do plotly na mesma posição
+def _cores_estaticas():
+    if 'streamlit' not in pio.templates:
+        return {}
+    padrao = dict(_achatar(pio.templates['plotly'].to_plotly_json()))
+    cores = {}
+    for caminho, cor in _achatar(pio.templates['streamlit'].to_plotly_json()):
+        if isinstance(cor, str) and re.fullmatch(r'#0000\d\d', cor) and caminho in padrao:
+            cores.setdefault(cor, padrao[caminho])
+    return cores
+
+
+_PAGINA_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{titulo}</title>{cabecalho}</head>
+<body><h2>{titulo}</h2><p>{filtros}</p>{corpo}</body></html>
+"""
+
+
+# Site estático com tudo o que está na loja, para espelhos somente leitura (sem Python nem dados):
+# index.html com os links, um HTML por figura ou tabela e o plotly.min.js compartilhado
+def exportar_estatico(destino, caminho=None):
+    versao = dados.versao_dados(caminho)
+    os.makedirs(destino, exist_ok=True)
+    with open(os.path.join(destino, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+        f.write(plotly.offline.get_plotlyjs())
+
+    cores = _cores_estaticas()
+    links = {pagina: [] for pagina in PAGINAS}
+    for item in sorted(ler_indice(versao), key=lambda i: (i['pagina'], i['nome'], json.dumps(i['filtros']))):
+        chave = chave_figura(item['pagina'], item['nome'], item['filtros'])
+        titulo = html.escape(f'{TITULOS[item["pagina"]]} - {item["nome"]}')
+        if item['tipo'] == 'figura':
+            spec = loja.ler_figura(chave, versao)
+            if spec is None:
+                continue
+            spec = re.sub(r'#0000\d\d', lambda m: cores.get(m.group(), m.group()), spec)
+            cabecalho = '<script src="../plotly.min.js"></script>'
+            corpo = ('<div id="figura"></div><script>Plotly.newPlot("figura", '
+                     + spec.replace('</', '<\\/') + ');</script>')
+        else:
+            tabela = loja.ler_tabela(chave, versao)
+            if tabela is None:
+                continue
+            cabecalho = ''
+            corpo = pd.DataFrame(tabela).to_html()
+        nome = item['arquivo'].rsplit('.', 1)[0] + '.html'
+        os.makedirs(os.path.join(destino, item['pagina']), exist_ok=True)
+        with open(os.path.join(destino, item['pagina'], nome), 'w', encoding='utf-8') as f:
+            f.write(_PAGINA_HTML.format(titulo=titulo, cabecalho=cabecalho, corpo=corpo,
+                                        filtros=html.escape(_descrever_filtros(item['filtros']))))
+        links[item['pagina']].append(f'<li><a href="{item["pagina"]}/{nome}">{html.escape(item["nome"])}</a> '
+                                     f'{html.escape(_descrever_filtros(item["filtros"]))}</li>')
+
+    corpo = ''.join(f'<h3>{html.escape(TITULOS[pagina])}</h3><ul>{"".join(itens)}</ul>' for pagina, itens in links.items())
+    with open(os.path.join(destino, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(_PAGINA_HTML.format(titulo='Dados dos Jogos Olímpicos', cabecalho='', corpo=corpo, filtros=''))
+    return sum(len(itens) for itens in links.values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Deixa prontas na loja em disco as figuras e tabelas das páginas')
+    parser.add_argument('--csv', default=dados.CSV_PATH)
+    parser.add_argument('--esportes', nargs='*', help='esportes do lote (padrão: todos)')
+    parser.add_argument('--paises', nargs='*', help=f'países do lote (padrão: os {PAISES_PADRAO} com mais medalhas)')
+    parser.add_argument('--processos', type=int, help='processos em paralelo (padrão: um por núcleo)')
+    parser.add_argument('--refazer', action='store_true', help='apaga a loja desta versão dos dados antes')
+    parser.add_argument('--estatico', help='exporta a loja como site estático nesse diretório')
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    feitas, falhas = rodar(args.csv, args.esportes, args.paises, args.processos, args.refazer)
+    print(f'{len(feitas)} itens na loja {loja.pasta_loja(dados.versao_dados(args.csv))} '
+          f'em {time.perf_counter() - inicio:.1f} s')
+    # as combinações que falham aqui também falham na página; o lote só as relata
+    for (pagina, tipo, nome, filtros), erro in falhas:
+        print(f'FALHA {pagina}/{nome} {filtros}: {erro}')
+    if args.estatico:
+        print(f'{exportar_estatico(args.estatico, args.csv)} páginas estáticas em {args.estatico}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
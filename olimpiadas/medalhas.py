@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from olimpiadas.cache import memoizar
+from olimpiadas.cubo import SEM_MEDALHA, cubo_contagem, cubo_medalhas, por_pais, posicoes, recorte, reduzir, rotulos, valores_filtro
+
+
+# Medalhas por país e ano no recorte, tiradas do cubo em vez de filtrar e agrupar as linhas.
+# Países/anos com atletas mas sem medalhas aparecem com zero, como no groupby original.
+# medals escolhe entre uma medalha por atleta ou uma por medalha oficial (veja cubo.cubo_contagem).
+@memoizar
+def contagem_medalhas(season, gender, sport='Todos', medals='Por atleta'):
+    cubo = cubo_contagem(medals, gender)
+    soma = por_pais(recorte(season, gender, sport, medals), cubo)
+    paises, anos = np.nonzero(soma.any(axis=-1))
+    medalhas = soma[paises, anos]
+    return pd.DataFrame({
+        'País': rotulos(paises, cubo['paises']),
+        'Ano': cubo['anos'][anos],
+        'total_medals': medalhas[:, :SEM_MEDALHA].sum(axis=1),
+        'gold_medals': medalhas[:, 0],
+        'silver_medals': medalhas[:, 1],
+        'bronze_medals': medalhas[:, 2],
+    })
+
+
+# Quantidade de linhas por NOC, país, ano, esporte e gênero no recorte
+@memoizar
+def medalhas_detalhadas(season, gender, sport='Todos'):
+    cubo = cubo_medalhas()
+    temporada, genero, esporte = valores_filtro(season, gender, sport)
+    contagem = reduzir(cubo['contagem'], cubo['temporadas'], temporada).sum(axis=-1, dtype=np.int64)
+    generos = posicoes(cubo['generos'], genero)
+    esportes = posicoes(cubo['esportes'], esporte)
+    # eixos (NOC, País) × ano × esporte × gênero, na ordem de ordenação do groupby
+    contagem = contagem[np.ix_(generos, esportes)].transpose(2, 3, 1, 0)
+    pares, anos, e, g = np.nonzero(contagem)
+    return pd.DataFrame({
+        'NOC': rotulos(cubo['noc_do_par'][pares], cubo['nocs']),
+        'País': rotulos(cubo['pais_do_par'][pares], cubo['paises']),
+        'Ano': cubo['anos'][anos],
+        'Esporte': rotulos(esportes[e], cubo['esportes']),
+        'Gênero': rotulos(generos[g], cubo['generos']),
+        'count': contagem[pares, anos, e, g],
+    })
@@ -0,0 +1,42 @@
+import numpy as np
+
+from olimpiadas.blocos import agregar_df, juntar, tabela_agregada, tabela_em_blocos
+from olimpiadas.cache import memoizar
+from olimpiadas.dados import atualizacao_incremental, derivado
+from olimpiadas.filtros import filtros_pagina
+
+# Colunas com média por esporte e ano e as chaves da tabela de somas (filtros do perfil médio)
+MEDIDAS = ['Altura', 'Idade']
+CHAVES = ['Esporte', 'Ano', 'País']
+
+
+# Soma e quantidade de alturas e idades por esporte, ano e país; a média de qualquer recorte
+# sai dela sem passar pelas linhas dos atletas
+def somas_por_esporte():
+    return derivado('somas_por_esporte', lambda df: agregar_df(df, CHAVES, MEDIDAS),
+                    em_blocos=lambda caminho: tabela_em_blocos('somas_por_esporte', caminho))
+
+
+# Soma as linhas anexadas (dados.anexar) à tabela
+def atualizar_somas(chave, tabela, antigo, novo):
+    return juntar([tabela, agregar_df(novo.iloc[len(antigo):], CHAVES, MEDIDAS)], CHAVES)
+
+
+atualizacao_incremental('somas_por_esporte', atualizar_somas)
+tabela_agregada('somas_por_esporte', CHAVES, MEDIDAS)
+
+
+# Média da coluna por esporte e ano nos esportes, países e anos escolhidos (listas vazias não filtram)
+@memoizar
+def media_por_esporte(sport, country, year, coluna):
+    tabela = somas_por_esporte()
+    manter = tabela[f'{coluna}_n'].to_numpy() > 0
+    for chave, valores in filtros_pagina(sport=sport, country=country, year=year).items():
+        if valores is None:
+            continue
+        if not isinstance(valores, (list, tuple, set)):
+            valores = [valores]
+        manter &= tabela[chave].isin(valores).to_numpy()
+    somas = tabela[manter].groupby(['Esporte', 'Ano'], observed=True)[[f'{coluna}_soma', f'{coluna}_n']].sum()
+    media = somas[f'{coluna}_soma'] / somas[f'{coluna}_n']
+    return media.astype(np.float32).rename(coluna).reset_index()
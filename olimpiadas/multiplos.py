@@ -0,0 +1,75 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# Grade dos pequenos múltiplos: gráficos por linha, espaço entre eles (fração da figura) e altura de cada linha
+COLUNAS = 7
+ESPACAMENTO = 0.02
+ALTURA_LINHA = 150
+
+
+# Limites [início, fim) de cada grupo em um vetor de rótulos já ordenado por grupo
+def fatias_grupos(grupos):
+    if len(grupos) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    inicios = np.concatenate([[0], np.flatnonzero(grupos[1:] != grupos[:-1]) + 1])
+    return inicios, np.append(inicios[1:], len(grupos))
+
+
+# Figura de linhas com um gráfico por grupo (grupos contíguos nos vetores x e y), montada direto
+# como dicionário: os eixos copiam dois modelos (só mudam domínio e âncora) e a figura não passa
+# pela validação do plotly, que é o que mais pesa no facet_col do plotly express.
+def pequenos_multiplos(grupos, x, y, titulo, titulo_x, titulo_y, colunas=COLUNAS):
+    inicios, fins = fatias_grupos(grupos)
+    n = len(inicios)
+    linhas = max(1, -(-n // colunas))
+    largura = (1 - (colunas - 1) * ESPACAMENTO) / colunas
+    altura = (1 - (linhas - 1) * ESPACAMENTO) / linhas
+    modelo_x = {'matches': 'x', 'showticklabels': False, 'tickangle': 45}
+    modelo_y = {'matches': 'y', 'showticklabels': False}
+
+    dados = []
+    layout = {}
+    anotacoes = []
+    for i, (inicio, fim) in enumerate(zip(inicios, fins)):
+        nome = str(grupos[inicio])
+        # os grupos preenchem a grade de cima para baixo; o eixo 1 é o do canto inferior esquerdo
+        linha, coluna = divmod(i, colunas)
+        de_baixo = linhas - 1 - linha
+        numero = de_baixo * colunas + coluna + 1
+        sufixo = '' if numero == 1 else str(numero)
+        x0 = coluna * (largura + ESPACAMENTO)
+        y0 = de_baixo * (altura + ESPACAMENTO)
+
+        eixo_x = dict(modelo_x, anchor=f'y{sufixo}', domain=[x0, x0 + largura])
+        eixo_y = dict(modelo_y, anchor=f'x{sufixo}', domain=[y0, y0 + altura])
+        # marcas do eixo x no último gráfico de cada coluna e do eixo y na primeira coluna
+        if i + colunas >= n:
+            eixo_x.update(showticklabels=True, title={'text': titulo_x})
+        if coluna == 0:
+            eixo_y.update(showticklabels=True, title={'text': titulo_y})
+        if numero == 1:
+            eixo_x.pop('matches')
+            eixo_y.pop('matches')
+        layout[f'xaxis{sufixo}'] = eixo_x
+        layout[f'yaxis{sufixo}'] = eixo_y
+
+        dados.append({
+            'type': 'scatter', 'mode': 'lines', 'name': nome, 'x': x[inicio:fim], 'y': y[inicio:fim],
+            'xaxis': f'x{sufixo}', 'yaxis': f'y{sufixo}',
+            'hovertemplate': f'{nome}<br>{titulo_x}=%{{x}}<br>{titulo_y}=%{{y}}<extra></extra>',
+        })
+        anotacoes.append({'text': nome, 'x': x0 + largura / 2, 'y': y0 + altura, 'xref': 'paper', 'yref': 'paper',
+                          'xanchor': 'center', 'yanchor': 'bottom', 'showarrow': False})
+
+    # sem grupos, a figura fica só com o título
+    layout.setdefault('xaxis', {'visible': False, 'domain': [0, largura]})
+    layout.setdefault('yaxis', {'visible': False, 'domain': [0, altura]})
+    layout.update(
+        title={'text': titulo, 'y': 0.98, 'x': 0.5, 'xanchor': 'center', 'yanchor': 'top'},
+        annotations=anotacoes,
+        showlegend=False,
+        height=ALTURA_LINHA * linhas + 100,
+        width=1600,
+        margin={'l': 40, 'r': 40, 't': 80, 'b': 40},
+    )
+    return go.Figure({'data': dados, 'layout': layout}, _validate=False)
@@ -0,0 +1 @@
+# Preparação dos dados e construção das figuras de cada página, sem depender do Streamlit
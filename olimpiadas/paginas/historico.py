@@ -0,0 +1,104 @@
+import plotly.express as px
+
+from olimpiadas.cache import memoizar
+from olimpiadas.figuras import titulo
+from olimpiadas.filtros import filtros_pagina, selecionar
+from olimpiadas.historico import historico_medalhas
+from olimpiadas.ranking import linhas_dos_atletas, maiores_medalhistas, nomes_distintos
+from olimpiadas.tempos import cronometrar
+
+PAGINA = 'historico'
+
+
+# medalhas acumuladas por atleta e participação, calculadas uma vez por processo
+@cronometrar
+def load_data_grouped():
+    return historico_medalhas()
+
+# Função para filtrar os dados com base na temporada, gênero, esportes e países.
+# Devolve as posições das linhas selecionadas (via bitmaps), sem copiar o DataFrame
+@cronometrar
+def filter_data(season, gender, sport, country):
+    return selecionar(load_data_grouped(), tabela='historico', **filtros_pagina(season, gender, sport, country))
+
+# As preparações dos gráficos ficam no cache de resultados, chaveadas pelos filtros.
+# Os `top` maiores medalhistas (por ID) saem do índice de ranking, sem ordenar o recorte inteiro.
+@memoizar
+def line_chart_prep(season, gender, sport, country, top=10):
+    historico = load_data_grouped()
+    filtros = filtros_pagina(season, gender, sport, country)
+    melhores = historico['ID'].to_numpy()[maiores_medalhistas(top, **filtros)]
+    df_filtred = historico.take(linhas_dos_atletas(melhores, **filtros))
+    filtred_sorted_gruped = df_filtred.groupby(['Ano', 'ID'], observed=True).agg(
+        Nome=('Nome', 'first'), Bronze=('Bronze', 'max'), Silver=('Silver', 'max'), Gold=('Gold', 'max'),
+        Esporte=('Esporte', 'max')).reset_index()
+    filtred_sorted_gruped['Total Medal'] = (filtred_sorted_gruped['Bronze'] * 1) + (filtred_sorted_gruped['Silver'] * 2) + (filtred_sorted_gruped['Gold'] * 3)
+    filtred_sorted_gruped['Nome'] = nomes_distintos(filtred_sorted_gruped['Nome'].astype(str), filtred_sorted_gruped['ID'])
+    filtred_sorted_gruped = filtred_sorted_gruped.sort_values(by='Total Medal', ascending=False)
+    return filtred_sorted_gruped[['Ano', 'Nome', 'Bronze', 'Silver', 'Gold', 'Total Medal', 'Esporte']]
+
+@cronometrar
+def plot_line_chart_athlete_medals(df, season, gender, sport, top=10):
+
+    title = titulo(f'Histórico dos top {top} medalhistas', season, gender, sport)
+    fig = px.line(df, x='Ano', y='Total Medal', color='Nome',
+            title=title,
+            labels={'Total Medal': 'Medalhas'},
+            custom_data=['Bronze', 'Silver', 'Gold','Esporte'],
+            markers=True,)
+
+    fig.update_traces(hovertemplate='<b>%{x}</b><br>Bronze: %{customdata[0]}<br>Prata: %{customdata[1]}<br>Ouro: %{customdata[2]}<br>Sport: %{customdata[3]}<br>Total Medals: %{y}')
+    fig.update_layout(title_x=0.4,plot_bgcolor='white', paper_bgcolor='white',
+            height=600)
+    min_year = int(df['Ano'].min())
+    max_year = int(df['Ano'].max())
+    x_tick_values = list(range(min_year, max_year + 1, 4))
+    y_tick_values = list(range(0, int(df['Total Medal'].max()) + 4, int((df['Total Medal'].max()/5+1))))
+    fig.update_xaxes(tickvals=x_tick_values,gridcolor='lightgrey')
+    fig.update_yaxes(tickvals=y_tick_values,gridcolor='lightgrey')
+    return fig
+
+@memoizar
+def bar_chart_prep(season, gender, sport, country, top=10):
+    historico = load_data_grouped()
+    # a linha mais recente de cada atleta no recorte já tem o máximo das medalhas acumuladas
+    melhores = maiores_medalhistas(top, **filtros_pagina(season, gender, sport, country))
+    filtred_sorted_gruped = historico.take(melhores)[['ID', 'Nome', 'Bronze', 'Silver', 'Gold', 'Total Medal']].reset_index(drop=True)
+    filtred_sorted_gruped['Nome'] = nomes_distintos(filtred_sorted_gruped['Nome'].astype(str), filtred_sorted_gruped['ID'])
+    filtred_sorted_gruped['Quantidade Bronze'] = filtred_sorted_gruped['Bronze'] * 1
+    filtred_sorted_gruped['Quantidade Prata'] = filtred_sorted_gruped['Silver'] * 2
+    filtred_sorted_gruped['Quantidade Ouro'] = filtred_sorted_gruped['Gold'] * 3
+
+    # do menor para o maior, como no gráfico original
+    return filtred_sorted_gruped.drop(columns='ID').iloc[::-1]
+
+@cronometrar
+def plot_bar_chart_athlete_medals(df, season, gender, sport):
+    tick_values_y = list(range(0, int(df['Total Medal'].max()) + 5, int((df['Total Medal'].max()/5+1))))
+    title = titulo('Maiores medalhistas da história', season, gender, sport)
+    fig = px.bar(df, x='Nome', y=['Quantidade Bronze', 'Quantidade Prata', 'Quantidade Ouro'],
+                    title=title,
+                    labels={'Nome': 'Atleta', 'value': 'Medalhas'},
+                    color_discrete_sequence=['#cd7f32', '#c0c0c0', '#ffd700'],
+                    barmode='stack',
+                    custom_data=['Bronze', 'Silver', 'Gold'])
+    fig.update_layout(title_x=0.4,plot_bgcolor='white', 
+                      paper_bgcolor='white',
+                      legend_title_text='Medal',
+                      xaxis=dict(showgrid=True, gridcolor='lightgrey'),
+                      yaxis=dict(showgrid=True, gridcolor='lightgrey', tickvals=tick_values_y),
+                      height=600)
+    fig.update_traces(hovertemplate='<b>%{x}</b><br>Bronze: %{customdata[0]}<br>Prata: %{customdata[1]}<br>Ouro: %{customdata[2]}')
+    fig.update_xaxes(tickangle=90)
+    fig.update_traces(showlegend=True)
+
+    return fig
+
+# Figuras da página a partir dos filtros (usadas pelo cache de figuras)
+def build_line_chart(season, gender, sport, country, top=10):
+    return plot_line_chart_athlete_medals(line_chart_prep(season, gender, sport, country, top), season, gender, sport, top)
+
+def build_bar_chart(season, gender, sport, country, top=10):
+    return plot_bar_chart_athlete_medals(bar_chart_prep(season, gender, sport, country, top), season, gender, sport)
+
+FIGURAS = {'linhas': build_line_chart, 'barras': build_bar_chart}
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from olimpiadas.cache import memoizar
+from olimpiadas.dados import carregar_dados
+from olimpiadas.dimensoes import paises_e_nocs
+from olimpiadas.figuras import titulo
+from olimpiadas.filtros import filtros_pagina, selecionar
+from olimpiadas.medalhas import contagem_medalhas, medalhas_detalhadas
+from olimpiadas.proporcoes import TIPOS, linhas_paises, proporcoes_medalhas
+from olimpiadas.tempos import cronometrar
+
+PAGINA = 'medalhas'
+
+
+# Função para filtrar os dados com base na temporada, gênero, esporte e país.
+# Devolve as posições das linhas selecionadas (via bitmaps), sem copiar o DataFrame
+@cronometrar
+def filter_data(season, gender, sport='Todos', country=None):
+    return selecionar(carregar_dados(), **filtros_pagina(season, gender, sport, country))
+
+# Função para contar as medalhas por país e ano (lidas do cubo de medalhas).
+# medals: 'Por atleta' conta cada atleta medalhista; 'Por evento', cada medalha oficial (equipes contam uma vez)
+@memoizar
+def get_medal_count(season, gender, sport='Todos', medals='Por atleta'):
+    return contagem_medalhas(season, gender, sport, medals)[['País', 'Ano', 'total_medals']]
+
+# Função para calcular a quantidade de medalhas por esporte e ano para cada país
+@cronometrar
+def get_detailed_medal_info(season, gender, sport='Todos'):
+    return medalhas_detalhadas(season, gender, sport)
+
+# Mesclar medal_count com todos os países para garantir que todos estejam presentes no mapa
+@memoizar
+def get_medal_count_all(season, gender, sport='Todos', medals='Por atleta'):
+    all_countries = paises_e_nocs()
+    medal_count_all = pd.merge(all_countries, get_medal_count(season, gender, sport, medals), on="País", how="left").fillna(0)
+    return medal_count_all.sort_values(by='Ano')
+
+# Título dos gráficos indicando quando as medalhas são as oficiais dos eventos
+def medal_title(base, medals='Por atleta'):
+    return base if medals == 'Por atleta' else f'{base} (medalhas por evento)'
+
+# Cores e textos de cada tipo de medalha no marimekko (na ordem de TIPOS, de baixo para cima)
+CORES_MEDALHAS = {'Bronze': '#cd7f32', 'Prata': '#c0c0c0', 'Ouro': '#ffd700'}
+PLURAIS = {'Bronze': 'Bronzes', 'Prata': 'Pratas', 'Ouro': 'Ouros'}
+# Espaço vertical entre os gráficos dos países comparados (fração da figura)
+ESPACO_PAISES = 0.06
+
+# posições x das barras (uma por ano) e o espaço entre elas
+def bar_positions(n_years, total_medals):
+    bar_width = 1 / max(n_years, 1)  # Adjust bar width to fit the number of years
+    if n_years < 20 or total_medals < 10:
+        padding = n_years/30  # Padding between bars
+    else:
+        padding = 0.1
+    return np.arange(n_years) * (bar_width + padding), bar_width, padding
+
+# barras empilhadas de um país (bronze, prata e ouro), lidas das proporções de todos os países
+def marimekko_traces(proporcoes, linha, years, x, sufixo='', showlegend=True):
+    traces = []
+    for i, medal in enumerate(TIPOS):
+        traces.append({
+            'type': 'bar', 'x': x, 'y': proporcoes['proporcoes'][linha, years, i],
+            'width': proporcoes['larguras'][linha, years], 'marker': {'color': CORES_MEDALHAS[medal]},
+            'name': medal, 'legendgroup': medal, 'showlegend': showlegend,
+            'customdata': proporcoes['medalhas'][linha, years, i], 'xaxis': f'x{sufixo}', 'yaxis': f'y{sufixo}',
+            'hovertemplate': f'Year: %{{x}}<br>Medalhas de {medal}: %{{customdata}}<br>Proporção de {PLURAIS[medal]}: %{{y:.2f}}<extra></extra>',
+        })
+    # total de medalhas do ano sobre a última barra (a de ouro)
+    total = proporcoes['total'][linha, years]
+    traces[-1].update(
+        text=np.where(total > 0, total.astype(object), ''),
+        textposition='outside',
+        textfont={'size': 12},  # Set consistent text size
+        hovertemplate='Year: %{x}<br>Medalhas de Ouro: %{customdata:.0f}<br>Proporção de Ouros: %{y:.2f}<extra></extra>',
+    )
+    return traces
+
+# cria o mekko chart de um país ou, com uma lista, um gráfico por país (um embaixo do outro, nos
+# mesmos anos) para comparar os países. As proporções de todos os países saem de uma passada só
+# (proporcoes_medalhas); a figura é montada direto como dicionário, sem a validação do plotly.
+@cronometrar
+def plot_marimekko(proporcoes, country, season='Ambas', gender='Ambos', sport='Todos', medals='Por atleta'):
+    countries = [country] if isinstance(country, str) else list(country)
+    linhas = linhas_paises(proporcoes, countries)
+    encontradas = linhas[linhas >= 0]
+    # anos em que os países têm atletas no recorte
+    years = np.flatnonzero(proporcoes['presente'][encontradas].any(axis=0))
+    unique_years = proporcoes['anos'][years].tolist()
+    x, bar_width, padding = bar_positions(len(years), proporcoes['total'][encontradas].sum() / len(countries))
+
+    n = len(countries)
+    altura = (1 - (n - 1) * ESPACO_PAISES) / n
+    data = []
+    layout = {}
+    annotations = []
+    for i, (name, linha) in enumerate(zip(countries, linhas)):
+        sufixo = '' if i == 0 else str(i + 1)
+        y0 = 1 - (i + 1) * altura - i * ESPACO_PAISES
+        layout[f'xaxis{sufixo}'] = {
+            'anchor': f'y{sufixo}',
+            'tickmode': 'array',
+            'tickvals': x,
+            'ticktext': unique_years,
+            'showgrid': False,  # Hide vertical grid lines
+            'range': [-0.5 * padding, len(years) * (bar_width + padding) - 0.5 * padding],  # Set x-axis range to fit all bars
+        }
+        layout[f'yaxis{sufixo}'] = {
+            'anchor': f'x{sufixo}',
+            'domain': [y0, y0 + altura],
+            'title': {'text': 'Proporção de Medalhas'},
+            'tickformat': '.0%',
+            'gridcolor': 'lightgray',
+            'range': [0, 1.1],  # Set horizontal grid lines to light gray
+        }
+        if n > 1:
+            annotations.append({'text': name, 'x': 0.5, 'y': y0 + altura, 'xref': 'paper', 'yref': 'paper',
+                                'xanchor': 'center', 'yanchor': 'bottom', 'showarrow': False})
+        if linha >= 0:
+            data += marimekko_traces(proporcoes, linha, years, x, sufixo, showlegend=i == 0)
+    layout[f'xaxis{"" if n == 1 else n}']['title'] = {'text': 'Ano'}
+    # create title
+    title = titulo(medal_title(f'Proporção de Medalhas - {", ".join(countries)}', medals), season, gender, sport)
+    # Update layout for the Marimekko chart
+    layout.update(
+        title={'text': title, 'x': 0.4},
+        barmode='stack',
+        annotations=annotations,
+        paper_bgcolor='rgba(0,0,0,0)',  # Entire figure background
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=max(600, 300 * n),
+    )
+    return go.Figure({'data': data, 'layout': layout}, _validate=False)
+
+# cria o mapa de medalhas por país
+@cronometrar
+def plot_medal_map(medal_count_all, season='Ambas', gender='Ambos', sport='Todos', medals='Por atleta'):
+    # criar o título
+    title = titulo(medal_title('Total de Medalhas por País', medals), season, gender, sport)
+    # Criar o gráfico cloropleth
+    fig = px.choropleth(medal_count_all, 
+                        locations="NOC",
+                        color="total_medals",
+                        hover_name="País",
+                        hover_data=['total_medals'],
+                        title=title,
+                        animation_frame='Ano',
+                        color_continuous_scale=px.colors.sequential.Blues)  # Escolha uma escala de cores adequada
+
+    # Atualizar o layout para definir a cor dos países sem medalhas
+    fig.update_traces(marker=dict(line=dict(color='rgb(255,255,255)', width=1)))  # Borda branca
+    fig.update_traces(marker_line_color='gray', marker_line_width=0.5)  # Borda cinza
+    fig.update_traces(marker_opacity=0.8)  # Opacidade dos países com medalhas
+    fig.update_layout(title_x=0.4, 
+                height=800)
+    return fig
+
+# Figuras da página a partir dos filtros (usadas pelo cache de figuras)
+def build_medal_map(season, gender, sport='Todos', medals='Por atleta'):
+    return plot_medal_map(get_medal_count_all(season, gender, sport, medals), season, gender, sport, medals)
+
+def build_marimekko(season, gender, sport, country, medals='Por atleta'):
+    return plot_marimekko(proporcoes_medalhas(season, gender, sport, medals), country, season, gender, sport, medals)
+
+FIGURAS = {'mapa': build_medal_map, 'marimekko': build_marimekko}
+TABELAS = {'contagem': get_medal_count, 'detalhes': get_detailed_medal_info}
@@ -0,0 +1,81 @@
+import plotly.express as px
+
+from olimpiadas.cache import memoizar
+from olimpiadas.figuras import titulo
+from olimpiadas.participacao import participacao_df, participacoes_por_pais
+from olimpiadas.tempos import cronometrar
+
+PAGINA = 'participacao'
+
+
+# Participação por ano e NOC, lida da matriz de participação pré-calculada para o recorte
+@cronometrar
+def create_part_df(season, gender, sport='Todos'):
+    return participacao_df(season, gender, sport)
+
+@cronometrar
+def plot_participation_bar(df, season='Ambas', gender='Ambos', sport='Todos'):
+    # Count the number of participants per year per NOC
+    participation_count_df = df.groupby(['Ano', 'País'], observed=True).size().reset_index(name='Count')
+    title = titulo('Participação Olímpica por Ano e País', season, gender, sport)
+    # Create the stacked bar chart
+    fig = px.bar(participation_count_df, x='Ano', y='Count', color='País', title=title, 
+                labels={'Count': 'Número de Países Participantes'}, 
+                barmode='stack', 
+                #color_discrete_sequence=px.colors.qualitative.Dark24
+                )
+        # Update layout for the Marimekko chart
+    fig.update_layout(
+            barmode='stack',
+            xaxis=dict(
+                title='Ano',
+                tickmode='array',
+                tickvals=df['Ano'],
+                showgrid=False,  # Hide vertical grid lines
+                ),
+            yaxis=dict(
+                gridcolor='lightgray',
+            ),
+            paper_bgcolor='rgba(0,0,0,0)',  # Entire figure background
+            plot_bgcolor='rgba(0,0,0,0)',
+            title_x=0.4,
+            height=600
+        )
+    # Show the figure
+    return fig
+
+@cronometrar
+def plot_participation_map(df, season='Ambas', gender='Ambos', sport='Todos'):
+    df = df.assign(Participated=df['Participated'].map({1: 'Sim', 0: 'Não'}))
+    df = df.rename({'Participated': 'Participação'}, axis=1)
+    df = df.sort_values(by='Ano')
+    title = titulo('Países Participantes das Olimpíadas', season, gender, sport)
+    fig = px.choropleth(df, 
+                        locations="NOC",
+                        color="Participação",
+                        hover_name="País",
+                        title=title,
+                        animation_frame='Ano',
+                        color_discrete_map={'Sim': 'red', 'Não': 'grey'}
+                        )  # Escolha uma escala de cores adequada
+    fig.update_layout(title_x=0.4,
+                      height=800)
+    return fig
+
+# Participação restrita aos países escolhidos (lista vazia mantém todos)
+@memoizar
+def filter_part_df(season, gender, sport, country):
+    part_df = create_part_df(season, gender, sport)
+    if country != []:
+        return part_df[part_df['País'].isin(country)]
+    return part_df
+
+# Figuras da página a partir dos filtros (usadas pelo cache de figuras)
+def build_participation_map(season, gender, sport='Todos'):
+    return plot_participation_map(create_part_df(season, gender, sport), season, gender, sport)
+
+def build_participation_bar(season, gender, sport, country):
+    return plot_participation_bar(filter_part_df(season, gender, sport, country), season, gender, sport)
+
+FIGURAS = {'mapa': build_participation_map, 'barras': build_participation_bar}
+TABELAS = {'participacoes': participacoes_por_pais}
@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from olimpiadas.cache import memoizar
+from olimpiadas.dados import carregar_dados
+from olimpiadas.faixas import MEDALHAS, ROTULOS, medalhas_por_faixa
+from olimpiadas.medias import media_por_esporte
+from olimpiadas.figuras import titulo
+from olimpiadas.filtros import filtros_pagina, recortar, selecionar
+from olimpiadas.multiplos import fatias_grupos, pequenos_multiplos
+from olimpiadas.quartis import resumo_caixas
+from olimpiadas.tempos import cronometrar
+
+PAGINA = 'perfil'
+# Esportes por página nos pequenos múltiplos (5 linhas de 7)
+ESPORTES_POR_PAGINA = 35
+# nomes das medalhas nos gráficos
+NOMES_MEDALHAS = {'Bronze': 'Bronze', 'Silver': 'Prata', 'Gold': 'Ouro'}
+
+
+# Função para filtrar os dados com base na temporada, gênero, esporte, país e ano.
+# Devolve as posições das linhas selecionadas (via bitmaps), sem copiar o DataFrame
+@cronometrar
+def filter_data(season='Ambas', gender='Ambos', sport='Todos', country=None, year=None):
+    return selecionar(carregar_dados(), **filtros_pagina(season, gender, sport, country, year))
+
+# Linhas usadas no perfil médio por esporte (países, esportes e anos escolhidos)
+@cronometrar
+def profile_data(sport, country, year):
+    return recortar(carregar_dados(), filter_data(sport=sport, country=country, year=year))
+
+# média da altura/idade por esporte e ano, tirada da tabela de somas por esporte, ano e país
+@memoizar
+def mean_by_sport(sport, country, year, yaxis):
+    average_sport = media_por_esporte(sport, country, year, yaxis)
+    if yaxis == 'Altura':
+        average_sport = average_sport.assign(Altura=average_sport['Altura'] / 100)
+    return average_sport
+
+# Páginas dos pequenos múltiplos: "Todos" e grupos de ESPORTES_POR_PAGINA esportes
+def facet_pages(sport, country, year, yaxis):
+    esportes = mean_by_sport(sport, country, year, yaxis)['Esporte'].unique().tolist()
+    paginas = ['Todos']
+    for i in range(0, len(esportes), ESPORTES_POR_PAGINA) if len(esportes) > ESPORTES_POR_PAGINA else []:
+        grupo = esportes[i:i + ESPORTES_POR_PAGINA]
+        paginas.append(f'{grupo[0]} a {grupo[-1]}')
+    return paginas
+
+# Um gráfico de linha por esporte (facet_page > 0 mostra só os esportes daquela página)
+@cronometrar
+def plot_in_mult(df, yaxis, facet_page=0):
+    esportes = df['Esporte'].to_numpy()
+    inicios, fins = fatias_grupos(esportes)
+    if facet_page:
+        primeiro = (facet_page - 1) * ESPORTES_POR_PAGINA
+        ultimo = min(facet_page * ESPORTES_POR_PAGINA, len(inicios)) - 1
+        df = df.iloc[inicios[primeiro]:fins[ultimo]]
+        esportes = esportes[inicios[primeiro]:fins[ultimo]]
+    return pequenos_multiplos(esportes, df['Ano'].to_numpy(), df[yaxis].to_numpy(),
+                              f'{yaxis} média dos medalhistas por esporte', 'Ano', yaxis)
+
+@cronometrar
+def boxplot_sports(df, yaxis):
+    dados_box = df[['Esporte', 'Nome', yaxis]].dropna(subset=yaxis)
+    if yaxis == 'Altura':
+        dados_box['Altura'] = dados_box['Altura'] / 100
+    fig2 = px.box(dados_box, x='Esporte', y=str(yaxis), title=f'Boxplot da {yaxis} por Esporte', hover_data=['Nome'])
+    fig2.update_layout(xaxis={'categoryorder': 'category ascending'}, xaxis_tickangle=90,
+    height=1000,
+    title_x=0.4)
+    return fig2
+
+# Quartis, bigodes e uma amostra dos pontos fora deles por esporte, no cache de resultados
+# chaveados pelos filtros (o boxplot resumido não envia as linhas para o navegador)
+@memoizar
+def sport_quartiles(sport, country, year, yaxis):
+    df = profile_data(sport, country, year)
+    valores = df[yaxis].to_numpy()
+    if yaxis == 'Altura':
+        valores = valores / 100
+    resumo = resumo_caixas(df['Esporte'].cat.codes.to_numpy(), valores)
+    esportes = df['Esporte'].cat.categories
+    resumo['Esporte'] = esportes[resumo['grupos']].to_numpy()
+    resumo['Esporte_outliers'] = esportes[resumo['grupo_outliers']].to_numpy()
+    resumo['Nome_outliers'] = df['Nome'].to_numpy()[resumo['outliers']]
+    resumo['valor_outliers'] = valores[resumo['outliers']].astype(np.float64)
+    return resumo
+
+@cronometrar
+def boxplot_sports_summary(resumo, yaxis):
+    # primeira cor do tema ativo, a mesma que o px.box usaria (o tema do streamlit troca as cores no navegador)
+    cor = (pio.templates[pio.templates.default].layout.colorway or px.colors.qualitative.Plotly)[0]
+    fig2 = go.Figure([
+        go.Box(x=resumo['Esporte'], q1=resumo['q1'], median=resumo['mediana'], q3=resumo['q3'],
+               lowerfence=resumo['inferior'], upperfence=resumo['superior'], marker_color=cor, name=yaxis),
+        go.Scatter(x=resumo['Esporte_outliers'], y=resumo['valor_outliers'], customdata=resumo['Nome_outliers'],
+                   mode='markers', marker_color=cor, name=yaxis,
+                   hovertemplate=f'Esporte=%{{x}}<br>{yaxis}=%{{y}}<br>Nome=%{{customdata}}<extra></extra>'),
+    ])
+    fig2.update_layout(title=f'Boxplot da {yaxis} por Esporte', xaxis={'categoryorder': 'category ascending', 'title': 'Esporte'},
+    yaxis_title=yaxis, xaxis_tickangle=90, showlegend=False,
+    height=1000,
+    title_x=0.4)
+    return fig2
+
+# Barras empilhadas a partir das contagens faixa etária × medalha (só as faixas com medalhas)
+@cronometrar
+def histogram_medals(contagem, season='Ambas', gender='Ambos', sport='Todos'):
+    faixas = np.flatnonzero(contagem.sum(axis=1))
+    dados_idade_medalha = pd.DataFrame({
+        'Idade_group': np.repeat(np.array(ROTULOS)[faixas], len(MEDALHAS)),
+        'Medalha': np.tile([NOMES_MEDALHAS[m] for m in MEDALHAS], len(faixas)),
+        'count': contagem[faixas].ravel(),
+    })
+    title = titulo('Medalhas por Faixa Etária', season, gender, sport)
+    fig = px.bar(dados_idade_medalha, x='Idade_group', y='count', color='Medalha', barmode='stack',
+                        title=title,
+                        category_orders={'Idade_group': [ROTULOS[f] for f in faixas], 'Medalha': ['Bronze', 'Prata', 'Ouro']},
+                        color_discrete_map={'Bronze': '#cd7f32', 'Prata': '#c0c0c0', 'Ouro': '#ffd700'})
+
+    fig.update_layout(
+            title=title,
+            barmode='stack',
+            xaxis=dict(
+                title='Faixa Etária',
+                tickmode='array',
+                showgrid=False,  # Hide vertical grid lines
+            ),
+            yaxis=dict(
+                title='Quantidade',
+                gridcolor='lightgray',
+            ),
+            paper_bgcolor='rgba(0,0,0,0)',  # Entire figure background
+            plot_bgcolor='rgba(0,0,0,0)',
+            title_x=0.4,
+            height=600
+        )
+    return fig
+
+# Figuras da página a partir dos filtros (usadas pelo cache de figuras)
+def build_histogram(season, gender, sport='Todos'):
+    return histogram_medals(medalhas_por_faixa(season, gender, sport), season, gender, sport)
+
+def build_small_multiples(sport, country, year, yaxis, facet_page=0):
+    return plot_in_mult(mean_by_sport(sport, country, year, yaxis), yaxis, facet_page)
+
+# points=True envia todas as linhas e deixa o navegador calcular as caixas (bem mais pesado)
+def build_boxplot(sport, country, year, yaxis, points=False):
+    if points:
+        return boxplot_sports(profile_data(sport, country, year), yaxis)
+    return boxplot_sports_summary(sport_quartiles(sport, country, year, yaxis), yaxis)
+
+FIGURAS = {'histograma': build_histogram, 'multiplos': build_small_multiples, 'boxplot': build_boxplot}
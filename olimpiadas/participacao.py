@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from olimpiadas.cache import memoizar
+from olimpiadas.cubo import cubo_medalhas, recorte, rotulos
+
+
+# Presença (NOC, País) × ano no recorte (houve ao menos um atleta, com ou sem medalha)
+# e a matriz NOC × ano de participação derivada dela, guardadas por recorte
+@memoizar
+def matriz_participacao(season, gender, sport='Todos'):
+    cubo = cubo_medalhas()
+    presenca = recorte(season, gender, sport).any(axis=-1)
+
+    # um NOC participou de um ano se qualquer um dos seus pares participou
+    por_noc = np.zeros((len(cubo['nocs']), len(cubo['anos'])), dtype=bool)
+    np.logical_or.at(por_noc, cubo['noc_do_par'], presenca)
+    return presenca, por_noc
+
+
+# Linhas (Ano, NOC, Participated, País) de quem participou, no formato que as páginas usam.
+# O resultado é compartilhado entre sessões e não deve ser alterado.
+@memoizar
+def participacao_df(season, gender, sport='Todos'):
+    cubo = cubo_medalhas()
+    presenca, por_noc = matriz_participacao(season, gender, sport)
+    # pares que aparecem no recorte, repetidos em cada ano em que o NOC participou
+    pares = np.flatnonzero(presenca.any(axis=1))
+    linhas, colunas = np.nonzero(por_noc[cubo['noc_do_par'][pares]])
+    pares = pares[linhas]
+    return pd.DataFrame({
+        'Ano': cubo['anos'][colunas],
+        'NOC': rotulos(cubo['noc_do_par'][pares], cubo['nocs']),
+        'Participated': np.ones(len(pares), dtype=np.int8),
+        'País': rotulos(cubo['pais_do_par'][pares], cubo['paises']),
+    })
+
+
+# Número de participações por país no recorte, do maior para o menor
+@memoizar
+def participacoes_por_pais(season, gender, sport='Todos'):
+    cubo = cubo_medalhas()
+    presenca, por_noc = matriz_participacao(season, gender, sport)
+    pares = np.flatnonzero(presenca.any(axis=1))
+    anos_por_par = por_noc[cubo['noc_do_par'][pares]].sum(axis=1)
+    contagem = np.bincount(cubo['pais_do_par'][pares], weights=anos_por_par, minlength=len(cubo['paises']))
+    presentes = np.flatnonzero(np.bincount(cubo['pais_do_par'][pares], minlength=len(cubo['paises'])))
+    sum_df = pd.DataFrame({
+        'País': cubo['paises'][presentes],
+        'Participações': contagem[presentes].astype(int),
+    })
+    sum_df = sum_df.sort_values(by='Participações', ascending=False, kind='stable').reset_index(drop=True)
+    sum_df.index += 1
+    return sum_df
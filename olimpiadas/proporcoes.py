@@ -0,0 +1,36 @@
+import numpy as np
+
+from olimpiadas.cache import memoizar
+from olimpiadas.cubo import MEDALHAS, cubo_contagem, por_pais, recorte
+
+# Tipos de medalha do marimekko, de baixo para cima, e a posição de cada um no eixo de medalhas do cubo
+TIPOS = ['Bronze', 'Prata', 'Ouro']
+_NO_CUBO = [MEDALHAS.index(m) for m in ('Bronze', 'Silver', 'Gold')]
+
+
+# Proporções de medalhas por país × ano × tipo (TIPOS) para o recorte, de todos os países de uma
+# vez, tiradas do cubo. "presente" marca os anos em que o país tem atletas no recorte (os anos do
+# eixo x do país); a largura de cada ano é a fração das medalhas do país naquele ano.
+# Anos sem medalhas ficam com proporção e largura zero. medals escolhe a contagem (cubo.cubo_contagem).
+# Compartilhado entre sessões; não alterar.
+@memoizar
+def proporcoes_medalhas(season, gender, sport='Todos', medals='Por atleta'):
+    cubo = cubo_contagem(medals, gender)
+    soma = por_pais(recorte(season, gender, sport, medals), cubo)
+    medalhas = soma[..., _NO_CUBO]
+    total = medalhas.sum(axis=-1)
+    total_pais = total.sum(axis=-1, keepdims=True)
+    return {
+        'paises': cubo['paises'],
+        'anos': cubo['anos'],
+        'presente': soma.any(axis=-1),
+        'medalhas': medalhas,
+        'total': total,
+        'proporcoes': np.divide(medalhas, total[..., None], out=np.zeros(medalhas.shape), where=total[..., None] > 0),
+        'larguras': np.divide(total, total_pais, out=np.zeros(total.shape), where=total_pais > 0),
+    }
+
+
+# Linha de cada país nos vetores de proporcoes_medalhas (-1 para países fora dos dados)
+def linhas_paises(proporcoes, paises):
+    return proporcoes['paises'].get_indexer(paises)
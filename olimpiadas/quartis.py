@@ -0,0 +1,49 @@
+import numpy as np
+
+# Pontos fora dos bigodes guardados por grupo; acima disso fica uma amostra espaçada
+# (inclui sempre o menor e o maior)
+LIMITE_OUTLIERS = 50
+
+
+# Percentil p de cada grupo já ordenado, com a mesma interpolação do plotly (quartilemethod="linear")
+def _percentil(valores, inicios, contagens, p):
+    posicao = np.clip(p * contagens - 0.5, 0, contagens - 1)
+    baixo = np.floor(posicao).astype(np.int64)
+    fracao = posicao - baixo
+    alto = np.minimum(baixo + 1, contagens - 1)
+    return valores[inicios + baixo] * (1 - fracao) + valores[inicios + alto] * fracao
+
+
+# Resumo de caixa por grupo (código >= 0) como o px.box calcula no navegador: quartis, bigodes até
+# o dado mais distante dentro de 1,5 × IQR e as linhas dos pontos fora deles (até `limite` por grupo).
+def resumo_caixas(codigos, valores, limite=LIMITE_OUTLIERS):
+    validos = np.flatnonzero((codigos >= 0) & ~np.isnan(valores))
+    ordem = validos[np.lexsort((valores[validos], codigos[validos]))]
+    grupo, ordenados = codigos[ordem], valores[ordem].astype(np.float64)
+    grupos, inicios, contagens = np.unique(grupo, return_index=True, return_counts=True)
+
+    q1 = _percentil(ordenados, inicios, contagens, 0.25)
+    mediana = _percentil(ordenados, inicios, contagens, 0.5)
+    q3 = _percentil(ordenados, inicios, contagens, 0.75)
+    # posição de cada linha ordenada no vetor de grupos
+    g = np.repeat(np.arange(len(grupos)), contagens)
+    dentro = (ordenados >= (2.5 * q1 - 1.5 * q3)[g]) & (ordenados <= (2.5 * q3 - 1.5 * q1)[g])
+    inferior = np.minimum(q1, np.minimum.reduceat(np.where(dentro, ordenados, np.inf), inicios))
+    superior = np.maximum(q3, np.maximum.reduceat(np.where(dentro, ordenados, -np.inf), inicios))
+
+    fora = np.flatnonzero((ordenados < inferior[g]) | (ordenados > superior[g]))
+    por_grupo = np.bincount(g[fora], minlength=len(grupos))
+    if (por_grupo > limite).any():
+        partes = np.split(fora, np.cumsum(por_grupo)[:-1])
+        fora = np.concatenate([p if len(p) <= limite else p[np.linspace(0, len(p) - 1, limite).round().astype(np.int64)]
+                               for p in partes])
+    return {
+        'grupos': grupos,
+        'q1': q1,
+        'mediana': mediana,
+        'q3': q3,
+        'inferior': inferior,
+        'superior': superior,
+        'outliers': ordem[fora],
+        'grupo_outliers': grupo[fora],
+    }
@@ -0,0 +1,118 @@
+import heapq
+import itertools
+
+import numpy as np
+
+from olimpiadas.dados import derivado
+from olimpiadas.historico import historico_medalhas
+
+# Colunas que os filtros do histórico podem fixar; cada combinação delas é um nível do índice
+DIMENSOES = ['Season', 'Gênero', 'Esporte', 'País']
+
+
+# Código de célula das linhas para as colunas do nível (0 = valor ausente)
+def _celulas(historico, nivel):
+    celula = np.zeros(len(historico), dtype=np.int64)
+    for coluna in nivel:
+        serie = historico[coluna]
+        celula = celula * (len(serie.cat.categories) + 1) + serie.cat.codes.to_numpy().astype(np.int64) + 1
+    return celula
+
+
+# Índice de um nível: para cada célula (ex.: Verão x Feminino x Judo x Brasil), a última linha
+# de cada atleta (ID) na célula, ordenada do maior para o menor Total Medal.
+# As contagens do histórico são acumuladas, então a última linha de um atleta tem o máximo de
+# todas as colunas de medalhas; o máximo em várias células é o maior entre elas.
+def construir_indice(historico, nivel):
+    celula = _celulas(historico, nivel)
+    ids = historico['ID'].to_numpy()
+    ordem = np.lexsort((np.arange(len(historico)), ids, celula))
+    ultima = np.ones(len(ordem), dtype=bool)
+    ultima[:-1] = (celula[ordem][1:] != celula[ordem][:-1]) | (ids[ordem][1:] != ids[ordem][:-1])
+    linhas = ordem[ultima]
+
+    total = historico['Total Medal'].to_numpy()
+    linhas = linhas[np.lexsort((ids[linhas], -total[linhas], celula[linhas]))]
+    chaves, inicios = np.unique(celula[linhas], return_index=True)
+    return {
+        'chaves': chaves,
+        'inicios': inicios,
+        'fins': np.append(inicios[1:], len(linhas)),
+        'linhas': linhas,
+        'negativo_total': -total[linhas],
+        'ids': ids[linhas],
+    }
+
+
+def indice_ranking(nivel):
+    return derivado(('ranking', nivel), lambda _: construir_indice(historico_medalhas(), nivel))
+
+
+# códigos das categorias escolhidas em uma coluna (valores que não existem são ignorados)
+def _codigos(serie, valores):
+    if not isinstance(valores, (list, tuple, set)):
+        valores = [valores]
+    categorias = serie.cat.categories
+    return [categorias.get_loc(v) for v in valores if v in categorias]
+
+
+# Linhas (no histórico) dos `k` atletas com mais medalhas no recorte, da maior para a menor
+# pontuação; cada linha é a participação mais recente do atleta dentro dos filtros.
+# Junta as listas já ordenadas das células escolhidas com um heap e para nos k primeiros.
+def maiores_medalhistas(k=10, **filtros):
+    historico = historico_medalhas()
+    nivel = tuple(c for c in DIMENSOES if filtros.get(c) is not None)
+    indice = indice_ranking(nivel)
+
+    escolhas = []
+    for coluna in nivel:
+        serie = historico[coluna]
+        escolhas.append([(c + 1, len(serie.cat.categories) + 1) for c in _codigos(serie, filtros[coluna])])
+    fatias = []
+    for combinacao in itertools.product(*escolhas):
+        chave = 0
+        for codigo, base in combinacao:
+            chave = chave * base + codigo
+        i = np.searchsorted(indice['chaves'], chave)
+        if i < len(indice['chaves']) and indice['chaves'][i] == chave:
+            fatias.append(slice(indice['inicios'][i], indice['fins'][i]))
+
+    if len(fatias) == 1:
+        return indice['linhas'][fatias[0]][:k]
+    listas = [zip(indice['negativo_total'][f], indice['ids'][f], indice['linhas'][f]) for f in fatias]
+    vistos = set()
+    escolhidas = []
+    for _, atleta, linha in heapq.merge(*listas):
+        if atleta in vistos:
+            continue
+        vistos.add(atleta)
+        escolhidas.append(linha)
+        if len(escolhidas) == k:
+            break
+    return np.array(escolhidas, dtype=np.int64)
+
+
+# Linhas do histórico dos atletas (IDs) que atendem aos filtros. O histórico é ordenado por ID,
+# então só as linhas desses atletas são verificadas.
+def linhas_dos_atletas(ids, **filtros):
+    historico = historico_medalhas()
+    todos = historico['ID'].to_numpy()
+    ids = np.asarray(ids)
+    inicios = np.searchsorted(todos, ids, side='left')
+    fins = np.searchsorted(todos, ids, side='right')
+    linhas = np.concatenate([np.arange(a, b) for a, b in zip(inicios, fins)] or [np.empty(0, dtype=np.int64)])
+    manter = np.ones(len(linhas), dtype=bool)
+    for coluna in DIMENSOES:
+        if filtros.get(coluna) is None:
+            continue
+        codigos = historico[coluna].cat.codes.to_numpy()[linhas]
+        manter &= np.isin(codigos, _codigos(historico[coluna], filtros[coluna]))
+    return linhas[manter]
+
+
+# Nomes para os gráficos: atletas diferentes com o mesmo nome recebem o ID entre parênteses
+def nomes_distintos(nomes, ids):
+    atletas = {}
+    for nome, atleta in zip(nomes, ids):
+        atletas.setdefault(nome, set()).add(atleta)
+    return [f'{nome} ({atleta})' if len(atletas[nome]) > 1 else nome for nome, atleta in zip(nomes, ids)]
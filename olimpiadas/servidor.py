@@ -0,0 +1,21 @@
+import os
+import sys
+
+from olimpiadas.aquecimento import iniciar_aquecimento
+
+# Sobe o app com o aquecimento já em andamento, antes da primeira sessão:
+#   python -m olimpiadas.servidor [opções do streamlit run, ex.: --server.port 8502]
+# O servidor roda no mesmo processo, então as páginas usam os dados e caches aquecidos.
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    iniciar_aquecimento()
+    from streamlit.web import cli
+    sys.argv = ['streamlit', 'run', MAIN] + list(argv)
+    return cli.main(prog_name='streamlit')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
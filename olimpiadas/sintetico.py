@@ -0,0 +1,416 @@
+import argparse
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+from olimpiadas import dados
+
+# Gerador de dados sintéticos com o mesmo esquema de athlete_events_pt.csv, para testes de carga:
+#   python -m olimpiadas.sintetico --linhas 5000000 --saida atletas_5m.csv
+#   python -m olimpiadas.sintetico --linhas 5000000 --saida atletas_5m.csv --formato ambos
+# Os Jogos são gerados um de cada vez e gravados em blocos, então a memória não cresce com o
+# número de linhas. A mesma semente gera sempre o mesmo arquivo.
+
+COLUNAS_CSV = ['ID', 'Name', 'Sex', 'Age', 'Height', 'Weight', 'NOC', 'País', 'Year',
+               'Season', 'Sport', 'Event', 'Medal', 'City']
+
+# Esportes: (nome, primeiro ano, provas individuais, provas por equipe como (nome, atletas))
+ESPORTES_VERAO = [
+    ('Athletics', 1896, 24, [('4 x 100 metres Relay', 4), ('4 x 400 metres Relay', 4)]),
+    ('Swimming', 1896, 16, [('4 x 100 metres Freestyle Relay', 4), ('4 x 100 metres Medley Relay', 4)]),
+    ('Gymnastics', 1896, 8, [('Team All-Around', 6)]),
+    ('Wrestling', 1896, 10, []),
+    ('Cycling', 1896, 8, [('Team Pursuit', 4)]),
+    ('Fencing', 1896, 6, [('Foil, Team', 4), ('Sabre, Team', 4)]),
+    ('Shooting', 1896, 10, []),
+    ('Tennis', 1896, 2, [('Doubles', 2)]),
+    ('Weightlifting', 1896, 8, []),
+    ('Rowing', 1900, 4, [('Coxless Fours', 4), ('Coxed Eights', 9)]),
+    ('Sailing', 1900, 6, [('Two Person Keelboat', 2)]),
+    ('Football', 1900, 0, [('Football', 18)]),
+    ('Equestrianism', 1900, 3, [('Jumping, Team', 4)]),
+    ('Boxing', 1904, 10, []),
+    ('Diving', 1904, 4, [('Synchronized Platform', 2)]),
+    ('Water Polo', 1900, 0, [('Water Polo', 13)]),
+    ('Hockey', 1908, 0, [('Hockey', 16)]),
+    ('Canoeing', 1936, 6, [('Kayak Fours, 1,000 metres', 4)]),
+    ('Basketball', 1936, 0, [('Basketball', 12)]),
+    ('Volleyball', 1964, 0, [('Volleyball', 12)]),
+    ('Judo', 1964, 8, []),
+    ('Handball', 1972, 0, [('Handball', 14)]),
+    ('Archery', 1972, 2, [('Team', 3)]),
+    ('Table Tennis', 1988, 2, [('Team', 3)]),
+    ('Badminton', 1992, 3, [('Doubles', 2)]),
+    ('Taekwondo', 2000, 4, []),
+    ('Triathlon', 2000, 1, []),
+    ('Rugby Sevens', 2016, 0, [('Rugby Sevens', 12)]),
+]
+ESPORTES_INVERNO = [
+    ('Cross Country Skiing', 1924, 6, [('4 x 10 kilometres Relay', 4)]),
+    ('Speed Skating', 1924, 6, [('Team Pursuit', 3)]),
+    ('Figure Skating', 1924, 2, [('Pairs', 2)]),
+    ('Ice Hockey', 1924, 0, [('Ice Hockey', 22)]),
+    ('Bobsleigh', 1924, 0, [('Two', 2), ('Four', 4)]),
+    ('Ski Jumping', 1924, 2, [('Large Hill, Team', 4)]),
+    ('Nordic Combined', 1924, 2, [('Team', 4)]),
+    ('Alpine Skiing', 1936, 5, []),
+    ('Biathlon', 1960, 4, [('4 x 7.5 kilometres Relay', 4)]),
+    ('Luge', 1964, 2, [('Doubles', 2)]),
+    ('Curling', 1998, 0, [('Curling', 5)]),
+    ('Snowboarding', 1998, 4, []),
+]
+
+# Esportes de luta dão duas medalhas de bronze por prova
+DOIS_BRONZES = {'Boxing', 'Judo', 'Wrestling', 'Taekwondo'}
+
+# Desvios de idade e altura (cm) em relação à média geral, por esporte
+IDADE_EXTRA = {'Shooting': 8, 'Equestrianism': 9, 'Sailing': 5, 'Curling': 7, 'Gymnastics': -5,
+               'Swimming': -3, 'Diving': -3, 'Figure Skating': -3}
+ALTURA_EXTRA = {'Basketball': 16, 'Volleyball': 13, 'Rowing': 8, 'Handball': 8, 'Water Polo': 7,
+                'Gymnastics': -12, 'Diving': -6, 'Weightlifting': -6, 'Figure Skating': -8}
+
+# Provas femininas passam a existir a partir destes anos (ou do primeiro ano do esporte)
+ANO_FEMININO_INDIVIDUAL = 1928
+ANO_FEMININO_EQUIPE = 1976
+
+# (NOC, País, primeiro ano, último ano); vários NOCs podem apontar para o mesmo país
+NOCS = [
+    ('USA', 'Estados Unidos', 1896, None), ('GBR', 'Reino Unido', 1896, None),
+    ('FRA', 'França', 1896, None), ('GER', 'Alemanha', 1896, 1936),
+    ('FRG', 'Alemanha', 1968, 1988), ('GDR', 'Alemanha', 1968, 1988),
+    ('GER', 'Alemanha', 1992, None), ('ITA', 'Itália', 1896, None),
+    ('SWE', 'Suécia', 1896, None), ('URS', 'Rússia', 1952, 1988), ('EUN', 'Rússia', 1992, 1992),
+    ('RUS', 'Rússia', 1994, None), ('CAN', 'Canadá', 1900, None), ('AUS', 'Austrália', 1896, None),
+    ('HUN', 'Hungria', 1896, None), ('JPN', 'Japão', 1912, None), ('NED', 'Holanda', 1900, None),
+    ('NOR', 'Noruega', 1900, None), ('FIN', 'Finlândia', 1908, None), ('SUI', 'Suíça', 1896, None),
+    ('CHN', 'China', 1984, None), ('KOR', 'Coreia do Sul', 1948, None), ('POL', 'Polônia', 1924, None),
+    ('TCH', 'República Tcheca', 1920, 1992), ('CZE', 'República Tcheca', 1994, None),
+    ('ESP', 'Espanha', 1900, None), ('AUT', 'Áustria', 1896, None), ('BEL', 'Bélgica', 1900, None),
+    ('DEN', 'Dinamarca', 1896, None), ('BRA', 'Brasil', 1920, None), ('ARG', 'Argentina', 1900, None),
+    ('ROU', 'Romênia', 1924, None), ('BUL', 'Bulgária', 1924, None), ('CUB', 'Cuba', 1900, None),
+    ('NZL', 'Nova Zelândia', 1908, None), ('MEX', 'México', 1924, None), ('GRE', 'Grécia', 1896, None),
+    ('KEN', 'Quênia', 1956, None), ('JAM', 'Jamaica', 1948, None), ('ETH', 'Etiópia', 1956, None),
+    ('IND', 'Índia', 1900, None), ('RSA', 'África do Sul', 1904, None), ('TUR', 'Turquia', 1908, None),
+    ('UKR', 'Ucrânia', 1994, None), ('IRL', 'Irlanda', 1924, None), ('POR', 'Portugal', 1912, None),
+    ('EGY', 'Egito', 1912, None), ('NGR', 'Nigéria', 1952, None), ('COL', 'Colômbia', 1932, None),
+    ('CHI', 'Chile', 1896, None),
+]
+
+# Sedes conhecidas; Jogos extras (depois destes) recebem cidades sintéticas
+SEDES_VERAO = {
+    1896: 'Athina', 1900: 'Paris', 1904: 'St. Louis', 1908: 'London', 1912: 'Stockholm',
+    1920: 'Antwerpen', 1924: 'Paris', 1928: 'Amsterdam', 1932: 'Los Angeles', 1936: 'Berlin',
+    1948: 'London', 1952: 'Helsinki', 1956: 'Melbourne', 1960: 'Roma', 1964: 'Tokyo',
+    1968: 'Mexico City', 1972: 'Munich', 1976: 'Montreal', 1980: 'Moskva', 1984: 'Los Angeles',
+    1988: 'Seoul', 1992: 'Barcelona', 1996: 'Atlanta', 2000: 'Sydney', 2004: 'Athina',
+    2008: 'Beijing', 2012: 'London', 2016: 'Rio de Janeiro',
+}
+SEDES_INVERNO = {
+    1924: 'Chamonix', 1928: 'Sankt Moritz', 1932: 'Lake Placid', 1936: 'Garmisch-Partenkirchen',
+    1948: 'Sankt Moritz', 1952: 'Oslo', 1956: "Cortina d'Ampezzo", 1960: 'Squaw Valley',
+    1964: 'Innsbruck', 1968: 'Grenoble', 1972: 'Sapporo', 1976: 'Innsbruck', 1980: 'Lake Placid',
+    1984: 'Sarajevo', 1988: 'Calgary', 1992: 'Albertville', 1994: 'Lillehammer', 1998: 'Nagano',
+    2002: 'Salt Lake City', 2006: 'Torino', 2010: 'Vancouver', 2014: 'Sochi',
+}
+
+NOMES_M = ['Adam', 'Alexander', 'Andrea', 'Anton', 'Carlos', 'Chen', 'Daniel', 'David', 'Dmitry',
+           'Erik', 'Felipe', 'Gustav', 'Hans', 'Hiroshi', 'Ivan', 'Jan', 'João', 'José', 'Karl',
+           'Kenji', 'Lars', 'Li', 'Luca', 'Marco', 'Mohamed', 'Nikolai', 'Olav', 'Pablo', 'Paul',
+           'Pedro', 'Pierre', 'Rafael', 'Sergei', 'Stefan', 'Thomas', 'Viktor', 'Wang', 'William']
+NOMES_F = ['Aiko', 'Alice', 'Ana', 'Anna', 'Beatriz', 'Carla', 'Elena', 'Emma', 'Eva', 'Fatima',
+           'Giulia', 'Hanna', 'Ingrid', 'Irina', 'Julia', 'Karin', 'Laura', 'Li', 'Maria', 'Marie',
+           'Marta', 'Mei', 'Natalia', 'Olga', 'Paula', 'Sara', 'Sofia', 'Svetlana', 'Yuki', 'Zhang']
+SOBRENOMES = ['Andersen', 'Bauer', 'Becker', 'Costa', 'Dubois', 'Fernandes', 'Fischer', 'García',
+              'Hansen', 'Ivanov', 'Johansson', 'Kim', 'Kovacs', 'Kowalski', 'Lee', 'Lopez', 'Martin',
+              'Meyer', 'Moreau', 'Müller', 'Nagy', 'Nielsen', 'Novak', 'Olsen', 'Park', 'Petrov',
+              'Rossi', 'Santos', 'Schmidt', 'Silva', 'Smith', 'Suzuki', 'Tanaka', 'Wang', 'Weber',
+              'Williams', 'Yamamoto', 'Zhang']
+
+
+# Edições (ano, temporada, cidade) em ordem cronológica, com Inverno antes de Verão no mesmo ano.
+# extras acrescenta essa quantidade de Jogos de cada temporada depois dos reais.
+def edicoes(extras=0):
+    verao = dict(SEDES_VERAO)
+    inverno = dict(SEDES_INVERNO)
+    for i in range(extras):
+        verao[max(SEDES_VERAO) + 4 * (i + 1)] = f'Cidade de Verão {i + 1}'
+        inverno[max(SEDES_INVERNO) + 4 * (i + 1)] = f'Cidade de Inverno {i + 1}'
+    lista = [(ano, 'Summer', cidade) for ano, cidade in verao.items()]
+    lista += [(ano, 'Winter', cidade) for ano, cidade in inverno.items()]
+    return sorted(lista, key=lambda e: (e[0], e[1] == 'Summer'))
+
+
+# Provas (temporada, esporte, nome, gênero, primeiro ano, atletas por equipe; 1 = individual)
+def catalogo():
+    provas = []
+    for temporada, esportes in (('Summer', ESPORTES_VERAO), ('Winter', ESPORTES_INVERNO)):
+        for esporte, inicio, individuais, equipes in esportes:
+            for genero, rotulo in (('M', "Men's"), ('F', "Women's")):
+                inicio_individual = inicio if genero == 'M' else max(inicio, ANO_FEMININO_INDIVIDUAL)
+                inicio_equipe = inicio if genero == 'M' else max(inicio, ANO_FEMININO_EQUIPE)
+                for i in range(individuais):
+                    provas.append((temporada, esporte, f'{esporte} {rotulo} Event {i + 1}', genero,
+                                   inicio_individual + 4 * (i // 4), 1))
+                for nome, atletas in equipes:
+                    provas.append((temporada, esporte, f'{esporte} {rotulo} {nome}', genero, inicio_equipe, atletas))
+    return provas
+
+
+# NOCs (código, país, início, fim, peso). Os pesos seguem uma lei de Zipf, então poucos países
+# concentram atletas e medalhas. extras acrescenta NOCs sintéticos a partir de 1960.
+def lista_nocs(extras=0):
+    nocs = list(NOCS)
+    for i in range(extras):
+        nocs.append((f'X{i:02d}' if i < 100 else f'X{i}', f'País Sintético {i + 1}', 1960, None))
+    return [(noc, pais, inicio, fim, 1 / (posicao + 1) ** 0.9)
+            for posicao, (noc, pais, inicio, fim) in enumerate(nocs)]
+
+
+# Valores possíveis de cada coluna categórica, para codificar o arquivo colunar em uma passada
+def dominios(extras_jogos=0, extras_nocs=0):
+    nocs = lista_nocs(extras_nocs)
+    provas = catalogo()
+    jogos = edicoes(extras_jogos)
+    nomes = {f'{n} {s}' for n in NOMES_M + NOMES_F for s in SOBRENOMES}
+    return {
+        'Name': sorted(nomes),
+        'Sex': ['F', 'M'],
+        'NOC': sorted({n[0] for n in nocs}),
+        'País': sorted({n[1] for n in nocs}),
+        'Season': ['Summer', 'Winter'],
+        'Sport': sorted({p[1] for p in provas}),
+        'Event': sorted({p[2] for p in provas}),
+        'Medal': ['Bronze', 'Gold', 'Silver'],
+        'City': sorted({j[2] for j in jogos}),
+    }
+
+
+def _fracao(ano):
+    return min(max((ano - 1896) / 120, 0), 1.2)
+
+
+class Gerador:
+    def __init__(self, semente=0, extras_jogos=0, extras_nocs=0):
+        self.rng = np.random.default_rng(semente)
+        self.edicoes = edicoes(extras_jogos)
+        self.provas = catalogo()
+        self.nocs = lista_nocs(extras_nocs)
+        self.proximo_id = 1
+        # vaga (NOC, esporte, gênero, posição) -> atleta atual; a vaga troca de atleta ao fim da
+        # carreira, então só os atletas em atividade ficam em memória
+        self.vagas = {}
+
+    # peso relativo das edições: os Jogos crescem com o tempo e os de Inverno são bem menores
+    def _pesos_edicoes(self):
+        pesos = np.array([(1 + 9 * _fracao(ano)) * (1 if temporada == 'Summer' else 0.15)
+                          for ano, temporada, _ in self.edicoes])
+        return pesos / pesos.sum()
+
+    # NOCs presentes na edição: os mais fortes primeiro; no Inverno participam bem menos países
+    def _participantes(self, ano, temporada):
+        ativos = [n for n in self.nocs if n[2] <= ano and (n[3] is None or ano <= n[3])]
+        fracao = 0.15 + 0.85 * min(_fracao(ano), 1) if temporada == 'Summer' else 0.1 + 0.4 * min(_fracao(ano), 1)
+        quantidade = min(len(ativos), max(3, int(np.ceil(len(ativos) * fracao))))
+        return ativos[:quantidade]
+
+    def _novo_atleta(self, esporte, genero, ano, edicao):
+        rng = self.rng
+        nomes = NOMES_M if genero == 'M' else NOMES_F
+        idade = int(np.clip(rng.normal(24.5 + IDADE_EXTRA.get(esporte, 0), 4.5), 12, 65))
+        altura = rng.normal(178 if genero == 'M' else 166, 7) + ALTURA_EXTRA.get(esporte, 0)
+        peso = rng.normal(23 if genero == 'M' else 21, 2.2) * (altura / 100) ** 2
+        # dados faltantes são mais comuns nos Jogos antigos
+        falta_idade = 0.25 if ano < 1920 else 0.08 if ano < 1950 else 0.01
+        falta_altura = 0.85 if ano < 1950 else 0.5 if ano < 1970 else 0.15 if ano < 1990 else 0.04
+        atleta = {
+            'id': self.proximo_id,
+            'nome': f'{nomes[rng.integers(len(nomes))]} {SOBRENOMES[rng.integers(len(SOBRENOMES))]}',
+            'nascimento': None if rng.random() < falta_idade else ano - idade,
+            'altura': None if rng.random() < falta_altura else float(round(altura)),
+            'peso': None if rng.random() < falta_altura + 0.02 else float(round(peso)),
+            'fim': edicao + int(rng.geometric(0.55)),
+        }
+        self.proximo_id += 1
+        return atleta
+
+    def _atleta(self, noc, esporte, genero, posicao, ano, edicao):
+        chave = (noc, esporte, genero, posicao)
+        atleta = self.vagas.get(chave)
+        if atleta is None or edicao >= atleta['fim']:
+            atleta = self.vagas[chave] = self._novo_atleta(esporte, genero, ano, edicao)
+        return atleta
+
+    # Linhas de uma edição em listas por coluna (na ordem de COLUNAS_CSV)
+    def _edicao(self, indice, ano, temporada, cidade, linhas_alvo):
+        rng = self.rng
+        provas = [p for p in self.provas if p[0] == temporada and p[4] <= ano]
+        participantes = self._participantes(ano, temporada)
+        pesos = np.array([n[4] for n in participantes])
+        probabilidade = pesos / pesos.sum()
+        forca = pesos ** 1.5
+        por_prova = linhas_alvo / max(len(provas), 1)
+        colunas = {c: [] for c in COLUNAS_CSV}
+
+        for _, esporte, prova, genero, _, atletas in provas:
+            if atletas == 1:
+                # individual: cada NOC manda um ou mais atletas, sorteados pelo peso do país
+                inscricoes = max(3, int(round(por_prova)))
+                escolhidos = rng.choice(len(participantes), size=inscricoes, p=probabilidade)
+                contagem = {}
+                equipes = []
+                for n in escolhidos:
+                    posicao = contagem.get(n, 0)
+                    contagem[n] = posicao + 1
+                    equipes.append((n, [posicao]))
+            else:
+                # equipe: um time por NOC, todos os membros recebem a mesma medalha
+                times = min(len(participantes), max(2, int(round(por_prova / atletas))))
+                escolhidos = rng.choice(len(participantes), size=times, replace=False, p=probabilidade)
+                equipes = [(n, range(atletas)) for n in escolhidos]
+
+            medalhas = ['Gold', 'Silver', 'Bronze', 'Bronze'] if esporte in DOIS_BRONZES else ['Gold', 'Silver', 'Bronze']
+            medalhas = medalhas[:len(equipes)]
+            chances = np.array([forca[n] for n, _ in equipes])
+            podio = rng.choice(len(equipes), size=len(medalhas), replace=False, p=chances / chances.sum())
+            medalha_de = dict(zip(podio.tolist(), medalhas))
+
+            for i, (n, posicoes) in enumerate(equipes):
+                noc, pais = participantes[n][0], participantes[n][1]
+                medalha = medalha_de.get(i)
+                for posicao in posicoes:
+                    atleta = self._atleta(noc, esporte, genero, posicao, ano, indice)
+                    colunas['ID'].append(atleta['id'])
+                    colunas['Name'].append(atleta['nome'])
+                    colunas['Sex'].append(genero)
+                    colunas['Age'].append(np.nan if atleta['nascimento'] is None else float(ano - atleta['nascimento']))
+                    colunas['Height'].append(np.nan if atleta['altura'] is None else atleta['altura'])
+                    colunas['Weight'].append(np.nan if atleta['peso'] is None else atleta['peso'])
+                    colunas['NOC'].append(noc)
+                    colunas['País'].append(pais)
+                    colunas['Year'].append(ano)
+                    colunas['Season'].append(temporada)
+                    colunas['Sport'].append(esporte)
+                    colunas['Event'].append(prova)
+                    colunas['Medal'].append(medalha)
+                    colunas['City'].append(cidade)
+        return colunas
+
+    # Gera aproximadamente `linhas` linhas, uma edição de cada vez, em blocos de até `bloco` linhas
+    def blocos(self, linhas, bloco=200_000):
+        pesos = self._pesos_edicoes()
+        atual = {c: [] for c in COLUNAS_CSV}
+        for indice, ((ano, temporada, cidade), peso) in enumerate(zip(self.edicoes, pesos)):
+            colunas = self._edicao(indice, ano, temporada, cidade, linhas * peso)
+            for c in COLUNAS_CSV:
+                atual[c].extend(colunas[c])
+            while len(atual['ID']) >= bloco:
+                yield pd.DataFrame({c: v[:bloco] for c, v in atual.items()})
+                atual = {c: v[bloco:] for c, v in atual.items()}
+        if atual['ID']:
+            yield pd.DataFrame(atual)
+
+
+# Grava o formato colunar de dados.salvar_colunar (um .bin por coluna e meta.json) em blocos.
+# Os códigos das categorias saem dos domínios conhecidos de antemão; as categorias que não
+# aparecem nos dados são removidas no fim, como faria o astype('category') do CSV.
+class EscritorColunar:
+    def __init__(self, pasta, dominios):
+        self.pasta = pasta
+        self.temp = dados.nome_temporario(os.path.join(pasta, 'brutos'))
+        os.makedirs(self.temp)
+        self.dominios = dominios
+        self.indices = {c: {v: i for i, v in enumerate(d)} for c, d in dominios.items()}
+        self.usados = {c: np.zeros(len(d), dtype=bool) for c, d in dominios.items()}
+        self.linhas = 0
+        self.jogos = set()
+        self.brutos = {c: open(os.path.join(self.temp, f'{i}.raw'), 'wb') for i, c in enumerate(COLUNAS_CSV)}
+
+    def _dtype(self, coluna):
+        if coluna in self.dominios:
+            return np.dtype('int32')
+        return np.dtype(dados.TIPOS.get(dados.COLUNAS.get(coluna, coluna), 'float32'))
+
+    def adicionar(self, bloco):
+        for coluna in COLUNAS_CSV:
+            valores = bloco[coluna]
+            if coluna in self.dominios:
+                indice = self.indices[coluna]
+                codigos = np.fromiter((indice.get(v, -1) for v in valores), dtype=np.int32, count=len(valores))
+                self.usados[coluna][codigos[codigos >= 0]] = True
+            else:
+                codigos = valores.to_numpy(dtype=self._dtype(coluna))
+            codigos.tofile(self.brutos[coluna])
+        self.jogos.update(map(tuple, dados.jogos_das_linhas(bloco[['Year', 'Season']].rename(columns=dados.COLUNAS))))
+        self.linhas += len(bloco)
+
+    def fechar(self, versao=None):
+        temp, nome = dados.nova_pasta_colunas(self.pasta, versao)
+        meta = {'formato': dados.FORMATO_COLUNAR, 'versao': versao, 'linhas': self.linhas,
+                'jogos': [list(j) for j in sorted(self.jogos)], 'colunas': []}
+        for i, coluna in enumerate(COLUNAS_CSV):
+            self.brutos[coluna].close()
+            bruto = os.path.join(self.temp, f'{i}.raw')
+            info = {'nome': dados.COLUNAS.get(coluna, coluna), 'arquivo': f'colunas/{nome}/{i}.bin'}
+            origem = np.memmap(bruto, dtype=self._dtype(coluna), mode='r') if self.linhas else np.empty(0, self._dtype(coluna))
+            if coluna in self.dominios:
+                usados = self.usados[coluna]
+                info['categorias'] = [v for v, u in zip(self.dominios[coluna], usados) if u]
+                dtype = np.int8 if len(info['categorias']) < 128 else np.int16 if len(info['categorias']) < 32768 else np.int32
+                novo = np.append(np.cumsum(usados) - 1, -1).astype(dtype)
+            else:
+                dtype = origem.dtype
+            with open(os.path.join(temp, f'{i}.bin'), 'wb') as destino:
+                for inicio in range(0, self.linhas, 1_000_000):
+                    parte = origem[inicio:inicio + 1_000_000]
+                    (novo[parte] if coluna in self.dominios else np.asarray(parte, dtype=dtype)).tofile(destino)
+            del origem
+            os.remove(bruto)
+            info['dtype'] = np.dtype(dtype).str
+            meta['colunas'].append(info)
+        shutil.rmtree(self.temp, ignore_errors=True)
+        dados.publicar_colunar(self.pasta, temp, nome, meta)
+
+
+# Gera o conjunto e grava em CSV ("csv"), só no formato colunar em `saida` ("colunar") ou nos dois
+# ("ambos": o colunar vai para o cache do CSV, e o app carrega sem ler o CSV). Devolve as linhas.
+def gerar(saida, linhas, semente=0, formato='csv', extras_jogos=0, extras_nocs=0, bloco=200_000):
+    gerador = Gerador(semente, extras_jogos, extras_nocs)
+    escritor = None
+    if formato in ('colunar', 'ambos'):
+        pasta = saida if formato == 'colunar' else dados.pasta_cache(saida)
+        escritor = EscritorColunar(pasta, dominios(extras_jogos, extras_nocs))
+    temp = saida + '.tmp'
+    total = 0
+    for i, parte in enumerate(gerador.blocos(linhas, bloco)):
+        if formato != 'colunar':
+            parte.to_csv(temp, index=False, mode='w' if i == 0 else 'a', header=i == 0)
+        if escritor is not None:
+            escritor.adicionar(parte)
+        total += len(parte)
+    if formato != 'colunar':
+        os.replace(temp, saida)
+    if escritor is not None:
+        escritor.fechar(dados.versao_origem(saida) if formato == 'ambos' else None)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gera dados sintéticos no esquema de athlete_events_pt.csv')
+    parser.add_argument('--linhas', type=int, required=True, help='quantidade aproximada de linhas')
+    parser.add_argument('--saida', required=True, help='arquivo CSV (ou pasta, com --formato colunar)')
+    parser.add_argument('--formato', choices=['csv', 'colunar', 'ambos'], default='csv')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--jogos-extras', type=int, default=0, help='Jogos de cada temporada depois de 2016')
+    parser.add_argument('--nocs-extras', type=int, default=0, help='NOCs sintéticos além dos reais')
+    parser.add_argument('--bloco', type=int, default=200_000, help='linhas por bloco gravado')
+    args = parser.parse_args(argv)
+    total = gerar(args.saida, args.linhas, args.semente, args.formato, args.jogos_extras, args.nocs_extras, args.bloco)
+    print(f'{total} linhas gravadas em {args.saida}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import numpy as np
+import streamlit as st
+
+from olimpiadas.cache import resultados
+from olimpiadas.dados import versao_dados
+from olimpiadas.figuras import chave_figura, tabela_pronta
+from olimpiadas.tempos import etapa
+
+# Linhas mostradas por página nas tabelas paginadas
+LINHAS_POR_PAGINA = 50
+
+
+# Ordem das linhas da tabela pronta (veja figuras.tabela_pronta) depois de ordenações estáveis em
+# sequência, [(coluna, decrescente), ...]; calculada uma vez por tabela e ordenação e guardada no
+# cache de resultados, então reordenar não copia nem reordena a tabela a cada execução da página
+def ordem_tabela(pagina, nome, construir, ordenacoes, **filtros):
+    tabela = tabela_pronta(pagina, nome, construir, **filtros)
+
+    def calcular():
+        ordem = np.arange(len(tabela))
+        for coluna, decrescente in ordenacoes:
+            valores = tabela[coluna].to_numpy()[ordem]
+            ordem = ordem[np.argsort(-valores if decrescente else valores, kind='stable')]
+        return ordem
+
+    chave = ('ordem',) + chave_figura(pagina, nome, filtros) + (tuple(ordenacoes),)
+    with etapa(f'ordem {pagina}/{nome}') as e:
+        return e.anotar(resultados.obter(chave, calcular, versao_dados()))
+
+
+# Mostra uma página da tabela na ordem dada, com o seletor de páginas; só as linhas visíveis são
+# copiadas, formatadas (formatar recebe e devolve o DataFrame da janela) e enviadas ao navegador.
+# O índice é a posição da linha na ordem (a partir de 1).
+def mostrar_tabela(tabela, ordem, chave, formatar=None, linhas=LINHAS_POR_PAGINA):
+    total = len(ordem)
+    paginas = max(1, -(-total // linhas))
+    pagina = 1
+    if paginas > 1:
+        pagina = st.number_input(f'Página (de {paginas})', min_value=1, max_value=paginas, value=1, key=chave)
+    inicio = (pagina - 1) * linhas
+    with etapa('mostrar tabela') as e:
+        janela = tabela.take(ordem[inicio:inicio + linhas])
+        janela.index = np.arange(inicio + 1, inicio + len(janela) + 1)
+        if formatar is not None:
+            janela = formatar(janela)
+        st.dataframe(janela)
+        e.anotar(janela)
+    st.caption(f'Linhas {min(inicio + 1, total)} a {inicio + len(janela)} de {total}')
@@ -0,0 +1,104 @@
+import functools
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+# Medição de tempo por etapa de cada execução das páginas (variável de ambiente OLIMPIADAS_TEMPOS=1).
+# Cada execução vira um registro com as etapas (nome, nível, início, duração, linhas), mostrado
+# no painel da barra lateral e gravado como uma linha JSON em OLIMPIADAS_TEMPOS_LOG.
+# Desligado, o decorador devolve a própria função e etapa() devolve um objeto vazio.
+ATIVO = os.environ.get('OLIMPIADAS_TEMPOS', '') not in ('', '0')
+LOG = os.environ.get('OLIMPIADAS_TEMPOS_LOG', 'tempos.jsonl')
+
+# as páginas de cada sessão rodam em threads próprias, então o registro atual é por thread
+_local = threading.local()
+_lock_log = threading.Lock()
+
+
+class _EtapaVazia:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        return False
+
+    def anotar(self, valor=None, **info):
+        return valor
+
+
+_VAZIA = _EtapaVazia()
+
+
+class _Etapa:
+    def __init__(self, registro, nome):
+        self.registro = registro
+        self.item = {'etapa': nome, 'nivel': registro['nivel']}
+
+    def __enter__(self):
+        self.registro['nivel'] += 1
+        self.registro['etapas'].append(self.item)
+        self.inicio = time.perf_counter()
+        self.item['inicio_ms'] = (self.inicio - self.registro['inicio']) * 1000
+        return self
+
+    def __exit__(self, *erro):
+        self.item['ms'] = (time.perf_counter() - self.inicio) * 1000
+        self.registro['nivel'] -= 1
+        return False
+
+    # guarda a quantidade de linhas do resultado (se tiver) e informações extras da etapa
+    def anotar(self, valor=None, **info):
+        if hasattr(valor, 'shape'):
+            self.item['linhas'] = int(valor.shape[0])
+        self.item.update(info)
+        return valor
+
+
+# Etapa nomeada dentro da execução atual; fora de uma página medida não registra nada
+def etapa(nome):
+    registro = getattr(_local, 'registro', None) if ATIVO else None
+    if registro is None:
+        return _VAZIA
+    return _Etapa(registro, nome)
+
+
+# Decorador que mede cada chamada da função como uma etapa com o nome dela
+def cronometrar(funcao):
+    if not ATIVO:
+        return funcao
+
+    @functools.wraps(funcao)
+    def medida(*args, **kwargs):
+        with etapa(funcao.__name__) as e:
+            return e.anotar(funcao(*args, **kwargs))
+    return medida
+
+
+# Começa o registro de uma execução da página
+def iniciar_tempos(pagina):
+    if ATIVO:
+        _local.registro = {'pagina': pagina, 'quando': time.time(), 'inicio': time.perf_counter(),
+                           'nivel': 0, 'etapas': []}
+
+
+# Fecha o registro da execução: mostra as etapas na barra lateral e grava a linha no log
+def painel_tempos():
+    registro = getattr(_local, 'registro', None) if ATIVO else None
+    if registro is None:
+        return
+    _local.registro = None
+    total_ms = (time.perf_counter() - registro['inicio']) * 1000
+    saida = {'pagina': registro['pagina'], 'quando': registro['quando'], 'total_ms': total_ms,
+             'etapas': registro['etapas']}
+    with _lock_log:
+        with open(LOG, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(saida, ensure_ascii=False) + '\n')
+
+    with st.sidebar.expander(f'Tempos desta execução: {total_ms:.0f} ms'):
+        tabela = pd.DataFrame(registro['etapas'], columns=['etapa', 'nivel', 'ms', 'linhas'])
+        tabela['etapa'] = [' ' * n + e for n, e in zip(tabela['nivel'], tabela['etapa'])]
+        st.dataframe(tabela.drop(columns='nivel').round({'ms': 1}), hide_index=True)
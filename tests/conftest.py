@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from olimpiadas import dados, sintetico
+
+# Linhas do CSV sintético compartilhado pelos testes de equivalência
+LINHAS = 20000
+
+
+# Cache colunar, estruturas derivadas e CSV padrão do processo isolados numa pasta
+def isolar(monkeypatch, pasta):
+    monkeypatch.chdir(pasta)
+    monkeypatch.setattr(dados, 'CACHE_DIR', str(pasta / 'cache'))
+    monkeypatch.setattr(dados, '_cache', {})
+    monkeypatch.setattr(dados, '_derivados', {})
+    monkeypatch.setattr(dados, 'CSV_PATH', dados.CSV_PATH)
+    monkeypatch.setattr(dados, 'BLOCOS', 0)
+
+
+@pytest.fixture
+def isolado(tmp_path, monkeypatch):
+    isolar(monkeypatch, tmp_path)
+    return tmp_path
+
+
+# CSV sintético usado como CSV padrão pelos testes do módulo; devolve as linhas como o pandas lê
+# (a base das implementações originais das páginas)
+@pytest.fixture(scope='module')
+def atletas(tmp_path_factory):
+    pasta = tmp_path_factory.mktemp('atletas')
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        isolar(monkeypatch, pasta)
+        caminho = str(pasta / 'atletas.csv')
+        sintetico.gerar(caminho, LINHAS, semente=11)
+        dados.usar_csv(caminho)
+        yield pd.read_csv(caminho)
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from olimpiadas.cubo import CHAVES_EVENTO
+from olimpiadas.medalhas import contagem_medalhas
+from olimpiadas.participacao import participacao_df
+
+# Os agregados das páginas saem do cubo de medalhas, da matriz de participação e do cubo de
+# eventos; aqui são comparados com o filtro e o groupby das páginas originais sobre o CSV lido
+# pelo pandas, em todas as temporadas e gêneros e em esportes individuais, por equipe e de Inverno.
+TEMPORADAS = ['Ambas', 'Verão', 'Inverno']
+GENEROS = ['Ambos', 'Feminino', 'Masculino']
+ESPORTES = ['Todos', 'Judo', 'Football', 'Ice Hockey']
+
+recortes = pytest.mark.parametrize('season, gender, sport', [
+    (season, gender, sport) for season in TEMPORADAS for gender in GENEROS for sport in ESPORTES])
+
+
+# filter_data das páginas originais
+def filtrar(df, season, gender, sport):
+    df = df.rename(columns={'Sex': 'Gênero', 'Sport': 'Esporte', 'Medal': 'Medalha', 'Year': 'Ano'})
+    if season != 'Ambas':
+        df = df[df['Season'] == {'Verão': 'Summer', 'Inverno': 'Winter'}[season]]
+    if gender != 'Ambos':
+        df = df[df['Gênero'] == {'Feminino': 'F', 'Masculino': 'M'}[gender]]
+    if sport != 'Todos':
+        df = df[df['Esporte'] == sport]
+    return df
+
+
+# get_medal_count das páginas originais
+def contar(df):
+    return df.groupby(['País', 'Ano']).agg(
+        total_medals=('Medalha', 'count'),
+        gold_medals=('Medalha', lambda x: (x == 'Gold').sum()),
+        silver_medals=('Medalha', lambda x: (x == 'Silver').sum()),
+        bronze_medals=('Medalha', lambda x: (x == 'Bronze').sum()),
+    ).reset_index()
+
+
+def comparar(valor, esperado, chaves):
+    valor = valor.astype({'País': str}).sort_values(chaves).reset_index(drop=True)
+    esperado = esperado.astype({'País': str}).sort_values(chaves).reset_index(drop=True)
+    pd.testing.assert_frame_equal(valor[list(esperado.columns)], esperado, check_dtype=False)
+
+
+@recortes
+def test_contagem_medalhas_por_atleta(atletas, season, gender, sport):
+    esperado = contar(filtrar(atletas, season, gender, sport))
+    comparar(contagem_medalhas(season, gender, sport), esperado, ['País', 'Ano'])
+
+
+# Por evento: cada medalha oficial (Jogos, evento, NOC, medalha) conta uma vez; filtrando um gênero,
+# conta para o gênero de quem a recebeu. As linhas sem medalha continuam contando a participação.
+@recortes
+def test_contagem_medalhas_por_evento(atletas, season, gender, sport):
+    df = filtrar(atletas, season, gender, sport)
+    chaves = CHAVES_EVENTO + ['Gênero'] if gender != 'Ambos' else CHAVES_EVENTO
+    medalhas = df[df['Medalha'].notna()].drop_duplicates(subset=chaves)
+    esperado = contar(pd.concat([df[df['Medalha'].isna()], medalhas]))
+    comparar(contagem_medalhas(season, gender, sport, 'Por evento'), esperado, ['País', 'Ano'])
+
+
+# create_part_df da página original: cada par (NOC, País) do recorte em cada ano em que o NOC
+# teve atletas no recorte
+@recortes
+def test_participacao_df(atletas, season, gender, sport):
+    df = filtrar(atletas, season, gender, sport)
+    presencas = df[['Ano', 'NOC']].drop_duplicates()
+    esperado = presencas.merge(df[['País', 'NOC']].drop_duplicates(), on='NOC', how='left')
+    esperado.insert(2, 'Participated', 1)
+    comparar(participacao_df(season, gender, sport).astype({'NOC': str}), esperado, ['Ano', 'NOC', 'País'])
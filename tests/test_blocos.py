@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from olimpiadas import blocos, dados
+from olimpiadas.cubo import cubo_eventos, cubo_medalhas
+from olimpiadas.faixas import faixas_etarias
+from olimpiadas.filtros import bitmaps
+from olimpiadas.historico import historico_medalhas
+from olimpiadas.medias import CHAVES, somas_por_esporte
+from olimpiadas.ranking import DIMENSOES
+
+
+# Estruturas montadas no modo em blocos e com os dados carregados; os bitmaps do histórico
+# só com os valores presentes (as categorias sem linhas não entram nas tabelas agregadas)
+def estruturas():
+    historico = historico_medalhas()
+    mapas = {}
+    for coluna in DIMENSOES + ['Ano']:
+        mapa = bitmaps(historico, coluna, 'historico')
+        mapas[coluna] = {valor: bits for valor, bits in mapa.items() if bits.any()}
+    return {
+        'cubo_medalhas': cubo_medalhas(),
+        'cubo_eventos': cubo_eventos(),
+        'cubo_eventos_genero': cubo_eventos(por_genero=True),
+        'historico_medalhas': historico,
+        'bitmaps': mapas,
+        'somas_por_esporte': somas_por_esporte().sort_values(CHAVES).reset_index(drop=True),
+        'faixas_etarias': faixas_etarias(),
+    }
+
+
+def comparar(valor, esperado, caminho=''):
+    if isinstance(esperado, pd.DataFrame):
+        colunas = [c for c in esperado.columns if isinstance(esperado[c].dtype, pd.CategoricalDtype)]
+        pd.testing.assert_frame_equal(valor.astype({c: str for c in colunas}), esperado.astype({c: str for c in colunas}),
+                                      check_dtype=False, obj=caminho)
+    elif isinstance(esperado, dict):
+        assert valor.keys() == esperado.keys(), caminho
+        for chave in esperado:
+            comparar(valor[chave], esperado[chave], f'{caminho}/{chave}')
+    else:
+        assert np.array_equal(np.asarray(valor), np.asarray(esperado)), caminho
+
+
+# Blocos pequenos, que não dividem o CSV em partes iguais: as parciais são juntadas às acumuladas
+# várias vezes e as combinações se repetem entre blocos
+@pytest.mark.parametrize('linhas', [997, 7000])
+def test_blocos_igual_aos_dados_carregados(atletas, tmp_path, monkeypatch, linhas):
+    esperado = estruturas()
+
+    monkeypatch.setattr(dados, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(dados, '_derivados', {})
+    monkeypatch.setattr(dados, '_cache', {})
+    monkeypatch.setattr(blocos, '_lidas', {})
+    monkeypatch.setattr(dados, 'BLOCOS', linhas)
+    comparar(estruturas(), esperado)
+    # tudo saiu das tabelas agregadas: os dados não foram carregados
+    assert dados._cache == {}
@@ -0,0 +1,68 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from olimpiadas import consultas
+
+
+@pytest.fixture(scope='module')
+def servico(atletas):
+    consultas.preparar()
+    http = consultas.servidor(porta=0)
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{http.server_address[1]}'
+    http.shutdown()
+    http.server_close()
+
+
+# status e corpo JSON de um pedido
+def pedir(servico, caminho):
+    try:
+        with urllib.request.urlopen(f'{servico}/{caminho}') as resposta:
+            return resposta.status, json.loads(resposta.read())
+    except urllib.error.HTTPError as erro:
+        return erro.code, json.loads(erro.read())
+
+
+def test_consulta_valida(servico):
+    status, corpo = pedir(servico, 'medalhas?season=Ver%C3%A3o&sport=Judo&country=Brasil')
+    assert status == 200
+    esperado = consultas.medalhas(season='Verão', sport='Judo', country=['Brasil'])
+    assert [linha['total_medals'] for linha in corpo['linhas']] == esperado['total_medals'].tolist()
+    assert {linha['País'] for linha in corpo['linhas']} == {'Brasil'}
+
+
+@pytest.mark.parametrize('caminho, mensagem', [
+    ('medalhas?sport=Xadrez', "sport desconhecido: 'Xadrez'"),
+    ('medalhistas?sport=Judo&sport=Quadribol', "sport desconhecido: 'Quadribol'"),
+    ('medias?sport=Todos', "sport desconhecido: 'Todos'"),
+    ('participacao?country=Atl%C3%A2ntida', "country desconhecido: 'Atlântida'"),
+    ('medalhas?season=Summer', 'season deve ser um de'),
+    ('medalhas?top=3', 'parâmetro desconhecido'),
+    ('medalhistas?top=x', 'invalid literal'),
+])
+def test_parametros_invalidos(servico, caminho, mensagem):
+    status, corpo = pedir(servico, caminho)
+    assert status == 400
+    assert mensagem in corpo['erro']
+
+
+def test_consulta_desconhecida(servico):
+    status, corpo = pedir(servico, 'nada')
+    assert status == 404
+    assert 'nada' in corpo['erro']
+
+
+# uma falha ao calcular responde 500 sem o texto da exceção (que vai para o stderr do servidor)
+def test_erro_interno_sem_detalhes(servico, monkeypatch, capsys):
+    def falhar(**filtros):
+        raise RuntimeError('/caminho/secreto.csv')
+
+    monkeypatch.setitem(consultas.CONSULTAS, 'medalhas', (falhar, consultas.CONSULTAS['medalhas'][1]))
+    status, corpo = pedir(servico, 'medalhas?sport=Swimming')
+    assert status == 500
+    assert corpo == {'erro': 'erro interno ao calcular a consulta'}
+    assert 'secreto' in capsys.readouterr().err
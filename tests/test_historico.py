@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from olimpiadas.filtros import filtros_pagina
+from olimpiadas.historico import historico_medalhas
+from olimpiadas.paginas.historico import bar_chart_prep, line_chart_prep
+from olimpiadas.ranking import maiores_medalhistas
+
+MEDALHAS = ['Bronze', 'Silver', 'Gold', 'Total Medal']
+
+# Filtros da página (temporada, gênero, esportes, países), incluindo vários esportes com vários
+# países, em que o ranking junta várias células do índice
+RECORTES = [
+    ('Ambas', 'Ambos', [], []),
+    ('Verão', 'Feminino', ['Swimming'], []),
+    ('Inverno', 'Masculino', [], ['Noruega', 'Alemanha']),
+    ('Ambas', 'Ambos', ['Athletics', 'Swimming', 'Judo'], []),
+    ('Ambas', 'Ambos', ['Athletics', 'Swimming', 'Judo'], ['Estados Unidos', 'Rússia', 'Brasil']),
+    ('Verão', 'Ambos', ['Football', 'Handball'], ['Alemanha', 'França']),
+    ('Ambas', 'Feminino', [], ['China', 'Japão', 'Coreia do Sul']),
+    ('Inverno', 'Ambos', ['Curling'], ['Brasil']),
+]
+
+
+# load_data_grouped da página original: medalhas acumuladas por atleta em ordem cronológica
+# (Inverno antes de Verão no mesmo ano)
+def acumuladas(df):
+    df = df.rename(columns={'Sex': 'Gênero', 'Sport': 'Esporte'}).dropna(subset=['Medal'])
+    df = df.assign(inverno=df['Season'] != 'Winter').sort_values(['ID', 'Year', 'inverno'], kind='stable')
+    for medalha in ('Bronze', 'Silver', 'Gold'):
+        df[medalha] = (df['Medal'] == medalha).groupby(df['ID']).cumsum()
+    df['Total Medal'] = df['Bronze'] * 1 + df['Silver'] * 2 + df['Gold'] * 3
+    return df
+
+
+def filtrar(df, season, gender, sport, country):
+    if season != 'Ambas':
+        df = df[df['Season'] == {'Verão': 'Summer', 'Inverno': 'Winter'}[season]]
+    if gender != 'Ambos':
+        df = df[df['Gênero'] == {'Feminino': 'F', 'Masculino': 'M'}[gender]]
+    if sport:
+        df = df[df['Esporte'].isin(sport)]
+    if country:
+        df = df[df['País'].isin(country)]
+    return df
+
+
+# maior acumulado de cada atleta no recorte, do maior para o menor Total Medal (empates por ID)
+def maiores(df, top):
+    por_atleta = df.groupby('ID')[MEDALHAS].max().reset_index()
+    return por_atleta.sort_values(['Total Medal', 'ID'], ascending=[False, True]).head(top)
+
+
+@pytest.fixture(scope='module')
+def base(atletas):
+    return acumuladas(atletas)
+
+
+@pytest.mark.parametrize('top', [1, 10])
+@pytest.mark.parametrize('season, gender, sport, country', RECORTES)
+def test_maiores_medalhistas(base, season, gender, sport, country, top):
+    esperado = maiores(filtrar(base, season, gender, sport, country), top)
+    linhas = maiores_medalhistas(top, **filtros_pagina(season, gender, sport, country))
+    escolhidas = historico_medalhas().take(linhas)
+    assert escolhidas['ID'].tolist() == esperado['ID'].tolist()
+    # a linha escolhida (a mais recente do atleta no recorte) tem o máximo acumulado no recorte
+    assert escolhidas[MEDALHAS].to_numpy().tolist() == esperado[MEDALHAS].to_numpy().tolist()
+
+    barras = bar_chart_prep(season, gender, sport, country, top)
+    assert barras[MEDALHAS].to_numpy().tolist() == esperado[MEDALHAS].to_numpy()[::-1].tolist()
+
+
+# line_chart_prep da página original: o máximo por ano de cada um dos maiores medalhistas, só nas
+# linhas do recorte
+@pytest.mark.parametrize('season, gender, sport, country', RECORTES)
+def test_line_chart_prep(base, season, gender, sport, country):
+    recorte = filtrar(base, season, gender, sport, country)
+    melhores = maiores(recorte, 10)['ID']
+    esperado = recorte[recorte['ID'].isin(melhores)].groupby(['Year', 'ID'])[['Bronze', 'Silver', 'Gold']].max()
+    esperado['Total Medal'] = esperado['Bronze'] * 1 + esperado['Silver'] * 2 + esperado['Gold'] * 3
+
+    linhas = line_chart_prep(season, gender, sport, country)
+    assert len(linhas) == len(esperado)
+    valor = pd.DataFrame(linhas[['Ano'] + MEDALHAS].to_numpy(dtype=np.int64)).sort_values([0, 1, 2, 3, 4])
+    esperado = pd.DataFrame(esperado.reset_index()[['Year'] + MEDALHAS].to_numpy(dtype=np.int64)).sort_values([0, 1, 2, 3, 4])
+    assert valor.to_numpy().tolist() == esperado.to_numpy().tolist()
@@ -0,0 +1,113 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from olimpiadas import dados, sintetico
+from olimpiadas.cubo import cubo_eventos, cubo_medalhas
+from olimpiadas.faixas import faixas_etarias
+from olimpiadas.historico import historico_medalhas
+from olimpiadas.ingestao import ingerir, ordem_jogos, validar
+from olimpiadas.medias import CHAVES, somas_por_esporte
+
+
+# Estruturas derivadas que têm atualização incremental (as somas na ordem das chaves, que a
+# atualização não mantém)
+def estruturas():
+    return {
+        'cubo_medalhas': cubo_medalhas(),
+        'cubo_eventos': cubo_eventos(),
+        'cubo_eventos_genero': cubo_eventos(por_genero=True),
+        'historico_medalhas': historico_medalhas(),
+        'somas_por_esporte': somas_por_esporte().sort_values(CHAVES).reset_index(drop=True),
+        'faixas_etarias': faixas_etarias(),
+    }
+
+
+def comparar(valor, esperado):
+    if isinstance(esperado, pd.DataFrame):
+        pd.testing.assert_frame_equal(valor, esperado, check_categorical=False)
+    elif isinstance(esperado, dict):
+        assert valor.keys() == esperado.keys()
+        for chave in esperado:
+            comparar(valor[chave], esperado[chave])
+    else:
+        assert np.array_equal(np.asarray(valor), np.asarray(esperado))
+
+
+@pytest.fixture
+def dados_isolados(isolado):
+    sintetico.gerar('todos.csv', 3000, semente=7)
+    todos = pd.read_csv('todos.csv')
+    ordem = [ordem_jogos(a, t) for a, t in todos[['Year', 'Season']].itertuples(index=False)]
+    ultimos = np.array(ordem) == max(ordem)
+    todos[~ultimos].to_csv('base.csv', index=False)
+    pd.concat([todos[~ultimos], todos[ultimos]]).to_csv('completo.csv', index=False)
+    return todos[ultimos]
+
+
+# Anexar os últimos Jogos dá os mesmos dados e estruturas que montar tudo do CSV completo, sem
+# regravar os arquivos das colunas; com frio=True o processo não tinha a versão anterior carregada
+# e as estruturas saem das gravadas em disco para ela
+@pytest.mark.parametrize('frio', [False, True])
+def test_anexar_igual_a_montar_do_zero(dados_isolados, monkeypatch, frio):
+    dados.usar_csv('base.csv')
+    dados.carregar_dados()
+    estruturas()
+    pasta, meta = dados.construir_colunar()
+    arquivos = {info['arquivo']: os.stat(os.path.join(pasta, info['arquivo'])).st_ino for info in meta['colunas']}
+
+    assert validar(dados_isolados) == []
+    ingerir(dados_isolados)
+    assert validar(dados_isolados) != []
+    atualizadas = []
+    if frio:
+        dados._cache.clear()
+        dados.limpar_derivados()
+        atualizar = dados._atualizar_do_disco
+        monkeypatch.setattr(dados, '_atualizar_do_disco',
+                            lambda *args: atualizadas.append(args[-1]) or atualizar(*args))
+    df = dados.carregar_dados()
+    anexadas = estruturas()
+    assert len(atualizadas) == (len(anexadas) if frio else 0)
+    _, meta = dados.construir_colunar()
+    for info in meta['colunas']:
+        if info['arquivo'] in arquivos:
+            assert os.stat(os.path.join(pasta, info['arquivo'])).st_ino == arquivos[info['arquivo']]
+
+    dados.usar_csv('completo.csv')
+    esperado = dados.carregar_dados()
+    assert list(df.columns) == list(esperado.columns)
+    for coluna in esperado.columns:
+        if isinstance(esperado[coluna].dtype, pd.CategoricalDtype):
+            assert list(df[coluna].cat.categories) == list(esperado[coluna].cat.categories)
+            assert np.array_equal(df[coluna].cat.codes, esperado[coluna].cat.codes)
+        else:
+            assert np.array_equal(df[coluna].to_numpy(), esperado[coluna].to_numpy(), equal_nan=True)
+    comparar(anexadas, estruturas())
+
+
+# Duas ingestões dos mesmos Jogos ao mesmo tempo: a validação roda dentro da trava, então só uma
+# anexa e a outra é recusada (as contagens não dobram)
+def test_segunda_ingestao_dos_mesmos_jogos_recusada(dados_isolados):
+    dados.usar_csv('base.csv')
+    antes = len(dados.carregar_dados())
+    barreira = threading.Barrier(2)
+
+    def ingerir_junto():
+        barreira.wait()
+        try:
+            return ingerir(dados_isolados)
+        except ValueError as erro:
+            return erro
+
+    with ThreadPoolExecutor(2) as executor:
+        resultados = list(executor.map(lambda _: ingerir_junto(), range(2)))
+    assert sorted(isinstance(r, ValueError) for r in resultados) == [False, True]
+    assert 'não são posteriores' in str(next(r for r in resultados if isinstance(r, ValueError)))
+    assert len(dados.carregar_dados()) == antes + len(dados_isolados)
+    with pytest.raises(ValueError, match='não são posteriores'):
+        ingerir(dados_isolados)